@@ -22,25 +22,60 @@ DEMO_USERS = [
 ]
 
 
-def ensure_demo_users():
+def ensure_demo_user(demo_user):
     """
-    Create or update fixed demo users for guest login.
+    Create or repair one demo user and return "created", "updated"
+    or "unchanged".
+
+    The password is only hashed again when the stored hash does not
+    match the configured password, and rows are only written when
+    something differs.
     """
-    for demo_user in DEMO_USERS:
-        user, _ = User.objects.get_or_create(
-            username=demo_user["username"],
-            defaults={"email": demo_user["email"]},
-        )
+    user, created = User.objects.get_or_create(
+        username=demo_user["username"],
+        defaults={"email": demo_user["email"]},
+    )
 
+    changed_fields = []
+    if user.email != demo_user["email"]:
         user.email = demo_user["email"]
+        changed_fields.append("email")
+    if created or not user.check_password(demo_user["password"]):
         user.set_password(demo_user["password"])
-        user.save()
+        changed_fields.append("password")
+    if changed_fields:
+        user.save(update_fields=changed_fields)
 
-        profile, _ = Profile.objects.get_or_create(user=user)
+    profile, profile_created = Profile.objects.get_or_create(
+        user=user,
+        defaults={"role": demo_user["role"]},
+    )
+    if profile.role != demo_user["role"]:
         profile.role = demo_user["role"]
-        profile.save()
+        profile.save(update_fields=["role"])
+        changed_fields.append("role")
+
+    _, token_created = Token.objects.get_or_create(user=user)
+
+    if created:
+        return "created"
+    if changed_fields or profile_created or token_created:
+        return "updated"
+    return "unchanged"
+
+
+def ensure_demo_users():
+    """
+    Create or repair the fixed demo users for guest login.
+
+    Runs as a release step through the ensure_demo_users management
+    command, not on every login. Returns the result per username.
+    """
+    return {
+        demo_user["username"]: ensure_demo_user(demo_user)
+        for demo_user in DEMO_USERS
+    }
 
-        Token.objects.get_or_create(user=user)
 
 def register_user_with_profile(user, role):
     """
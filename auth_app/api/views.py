@@ -11,7 +11,6 @@ from .serializers import LoginSerializer, RegistrationSerializer
 from .services import (
     register_user_with_profile,
     login_user_and_get_token,
-    ensure_demo_users,
 )
 
 User = get_user_model()
@@ -52,8 +51,7 @@ class LoginView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
-        ensure_demo_users()
-
+        # Demo users are provisioned by the ensure_demo_users release step.
         serializer = LoginSerializer(data=request.data)
         serializer.is_valid(raise_exception=True)
 
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from auth_app.api.services import ensure_demo_users
+
+
+class Command(BaseCommand):
+    help = (
+        "Create or repair the demo users for guest login. Safe to run on "
+        "every deploy: passwords are only hashed again when they changed."
+    )
+
+    def handle(self, *args, **options):
+        results = ensure_demo_users()
+        for username, result in results.items():
+            self.stdout.write(f"{username}: {result}")
+        self.stdout.write(self.style.SUCCESS(f"Checked {len(results)} demo users."))
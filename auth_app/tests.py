@@ -1,3 +1,86 @@
-from django.test import TestCase
+from io import StringIO
 
-# Create your tests here.
+import pytest
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from auth_app.api.services import DEMO_USERS, ensure_demo_users
+from profiles_app.models import Profile
+
+
+@pytest.fixture
+def api_client():
+    return APIClient()
+
+
+def _demo_login(api_client, demo_user, password=None):
+    return api_client.post(
+        "/api/login/",
+        {"username": demo_user["username"], "password": password or demo_user["password"]},
+        format="json",
+    )
+
+
+@pytest.mark.django_db
+def test_ensure_demo_users_command_is_idempotent():
+    out = StringIO()
+    call_command("ensure_demo_users", stdout=out)
+    assert "DemoBusiness: created" in out.getvalue()
+    hashes = dict(User.objects.values_list("username", "password"))
+
+    out = StringIO()
+    call_command("ensure_demo_users", stdout=out)
+
+    assert "DemoBusiness: unchanged" in out.getvalue()
+    assert "DemoCustomer: unchanged" in out.getvalue()
+    assert dict(User.objects.values_list("username", "password")) == hashes
+    for demo_user in DEMO_USERS:
+        assert User.objects.get(username=demo_user["username"]).profile.role == demo_user["role"]
+
+
+@pytest.mark.django_db
+def test_ensure_demo_users_repairs_changed_password_and_role():
+    ensure_demo_users()
+    user = User.objects.get(username="DemoBusiness")
+    user.set_password("something-else")
+    user.save()
+    Profile.objects.filter(user=user).update(role=Profile.ROLE_CUSTOMER)
+
+    assert ensure_demo_users() == {"DemoBusiness": "updated", "DemoCustomer": "unchanged"}
+    user.refresh_from_db()
+    assert user.check_password("asdasd24")
+    assert user.profile.role == Profile.ROLE_BUSINESS
+
+
+@pytest.mark.django_db
+def test_demo_login_does_not_write(api_client, django_assert_num_queries):
+    ensure_demo_users()
+
+    # User lookup and token lookup.
+    with django_assert_num_queries(2):
+        res = _demo_login(api_client, DEMO_USERS[1])
+
+    assert res.status_code == 200
+    assert res.json()["username"] == "DemoCustomer"
+
+
+@pytest.mark.django_db
+def test_demo_login_does_not_provision_demo_users(api_client):
+    res = _demo_login(api_client, DEMO_USERS[0])
+
+    assert res.status_code == 400
+    assert not User.objects.exists()
+
+
+@pytest.mark.django_db
+def test_demo_login_with_wrong_password_fails_without_writes(
+    api_client, django_assert_num_queries
+):
+    ensure_demo_users()
+
+    # Only the user lookup of authenticate().
+    with django_assert_num_queries(1):
+        res = _demo_login(api_client, DEMO_USERS[0], password="wrong-password")
+
+    assert res.status_code == 400
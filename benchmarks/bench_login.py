@@ -0,0 +1,107 @@
+"""
+Micro-benchmark for the login endpoint.
+
+Creates a throwaway test database with the demo users and measures
+POST /api/login/ for a demo user, once with the previous LoginView
+(ensure_demo_users() re-hashing both demo passwords on every request)
+and once with the current view, which leaves provisioning to the
+ensure_demo_users management command.
+
+Run from the project root:
+
+    python benchmarks/bench_login.py
+"""
+
+import os
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connection  # noqa: E402
+from django.test.utils import CaptureQueriesContext  # noqa: E402
+from rest_framework.authtoken.models import Token  # noqa: E402
+from rest_framework.test import APIRequestFactory  # noqa: E402
+
+from auth_app.api.services import DEMO_USERS, User, ensure_demo_users  # noqa: E402
+from auth_app.api.views import LoginView  # noqa: E402
+from profiles_app.models import Profile  # noqa: E402
+
+REPEAT = 3
+NUMBER = 5
+
+
+def legacy_ensure_demo_users():
+    """
+    The previous provisioning, which always hashed and saved both demo users.
+    """
+    for demo_user in DEMO_USERS:
+        user, _ = User.objects.get_or_create(
+            username=demo_user["username"],
+            defaults={"email": demo_user["email"]},
+        )
+
+        user.email = demo_user["email"]
+        user.set_password(demo_user["password"])
+        user.save()
+
+        profile, _ = Profile.objects.get_or_create(user=user)
+        profile.role = demo_user["role"]
+        profile.save()
+
+        Token.objects.get_or_create(user=user)
+
+
+class LegacyLoginView(LoginView):
+    def post(self, request):
+        legacy_ensure_demo_users()
+        return super().post(request)
+
+
+def measure(view, request_factory):
+    """
+    Return the best time per login in milliseconds and the query count.
+    """
+    demo_user = DEMO_USERS[1]
+
+    def run():
+        request = request_factory.post(
+            "/api/login/",
+            {"username": demo_user["username"], "password": demo_user["password"]},
+            format="json",
+        )
+        response = view(request)
+        assert response.status_code == 200, response.data
+
+    with CaptureQueriesContext(connection) as queries:
+        run()
+
+    best = min(timeit.repeat(run, repeat=REPEAT, number=NUMBER))
+    return best / NUMBER * 1000, len(queries)
+
+
+def main():
+    old_name = connection.creation.create_test_db(verbosity=0)
+    try:
+        ensure_demo_users()
+        request_factory = APIRequestFactory()
+
+        before, before_queries = measure(LegacyLoginView.as_view(), request_factory)
+        after, after_queries = measure(LoginView.as_view(), request_factory)
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+
+    print(f"logins per run: {NUMBER}, best of {REPEAT} runs")
+    print(f"before: {before:8.1f} ms per login, {before_queries} queries")
+    print(f"after:  {after:8.1f} ms per login, {after_queries} queries")
+    print(f"saved:  {before - after:8.1f} ms per login ({(1 - after / before):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,106 @@
+"""
+Micro-benchmark for offer list serialization.
+
+Serializes an in-memory page of offers with three details each and
+prints the cost per offer row, once with the previous
+OfferDetailLinkSerializer.get_url (one build_absolute_uri call per
+detail) and once with the current implementation.
+
+Run from the project root:
+
+    python benchmarks/bench_offer_serialization.py
+"""
+
+import os
+import sys
+import timeit
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "core.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+
+from offers_app.api.serializers import (  # noqa: E402
+    OfferDetailLinkSerializer,
+    OfferReadSerializer,
+)
+from offers_app.models import Offer, OfferDetail  # noqa: E402
+
+PAGE_SIZE = 100
+REPEAT = 5
+NUMBER = 20
+
+
+class LegacyOfferDetailLinkSerializer(OfferDetailLinkSerializer):
+    def get_url(self, obj):
+        request = self.context.get("request")
+        if request:
+            return request.build_absolute_uri(f"/api/offerdetails/{obj.id}/")
+        return f"/api/offerdetails/{obj.id}/"
+
+
+class LegacyOfferReadSerializer(OfferReadSerializer):
+    details = LegacyOfferDetailLinkSerializer(many=True, read_only=True)
+
+
+def build_page():
+    """
+    Return unsaved offers with owner and prefetched details in memory.
+    """
+    now = datetime.now(timezone.utc)
+    user = User(id=1, username="bench", first_name="Bench", last_name="User")
+    offers = []
+    for offer_id in range(1, PAGE_SIZE + 1):
+        offer = Offer(
+            id=offer_id,
+            user=user,
+            title=f"Offer {offer_id}",
+            description="Benchmark offer",
+            created_at=now,
+            updated_at=now,
+            min_price=100,
+            min_delivery_time=3,
+        )
+        details = [
+            OfferDetail(id=offer_id * 3 + index, offer=offer, offer_type=offer_type)
+            for index, offer_type in enumerate(("basic", "standard", "premium"))
+        ]
+        offer._prefetched_objects_cache = {"details": details}
+        offers.append(offer)
+    return offers
+
+
+def measure(serializer_class, offers, request):
+    def run():
+        serializer_class(offers, many=True, context={"request": request}).data
+
+    best = min(timeit.repeat(run, repeat=REPEAT, number=NUMBER))
+    return best / NUMBER / len(offers) * 1_000_000
+
+
+def main():
+    offers = build_page()
+    request = RequestFactory().get("/api/offers/", HTTP_HOST="localhost")
+
+    legacy = LegacyOfferReadSerializer(offers, many=True, context={"request": request}).data
+    current = OfferReadSerializer(offers, many=True, context={"request": request}).data
+    assert legacy == current, "serializers must produce the same output"
+
+    before = measure(LegacyOfferReadSerializer, offers, request)
+    after = measure(OfferReadSerializer, offers, request)
+
+    print(f"offer rows per page: {PAGE_SIZE}, details per offer: 3")
+    print(f"before: {before:8.1f} us per offer row")
+    print(f"after:  {after:8.1f} us per offer row")
+    print(f"saved:  {before - after:8.1f} us per offer row ({(1 - after / before):.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,13 @@
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from rest_framework.test import APIClient
 from profiles_app.models import Profile
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
 @pytest.fixture
 def api_client():
     return APIClient()
@@ -0,0 +1,6 @@
+from django.contrib import admin
+
+from core.models import PlatformStats
+
+
+admin.site.register(PlatformStats)
@@ -0,0 +1,362 @@
+import base64
+import binascii
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator as DjangoPaginator
+from django.db.models import F, Q
+from rest_framework.exceptions import NotFound, ValidationError as RequestValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+def wants_cursor_pagination(request):
+    """
+    Return True when the client opted into cursor pagination.
+    """
+    params = request.query_params
+    return params.get("pagination") == "cursor" or "cursor" in params
+
+
+class CursorPaginationOptInMixin:
+    """
+    Use cursor_pagination_class instead of pagination_class
+    when the request asks for cursor pagination.
+    """
+
+    cursor_pagination_class = None
+
+    @property
+    def paginator(self):
+        """
+        Return the paginator instance for the current request.
+        """
+        if not hasattr(self, "_paginator"):
+            pagination_class = self.pagination_class
+            if self.cursor_pagination_class and self.wants_cursor_pagination():
+                pagination_class = self.cursor_pagination_class
+            self._paginator = pagination_class() if pagination_class else None
+        return self._paginator
+
+    def wants_cursor_pagination(self):
+        """
+        Return True when the request is paged with cursor_pagination_class.
+        """
+        return wants_cursor_pagination(self.request)
+
+
+class CachedCountPagination(PageNumberPagination):
+    """
+    Page number pagination that takes the total from get_count(),
+    so subclasses can serve it from a cache or counter instead of
+    running COUNT(*) for every page.
+    """
+
+    def get_count(self, queryset):
+        """
+        Return the total number of rows in the queryset.
+        """
+        return queryset.count()
+
+    def django_paginator_class(self, queryset, page_size):
+        """
+        Return a Django paginator whose count comes from get_count().
+        """
+        paginator = DjangoPaginator(queryset, page_size)
+        paginator.count = self.get_count(queryset)
+        return paginator
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination that seeks past the last row instead of using OFFSET.
+
+    The ordering is read from the queryset, so it follows OrderingFilter,
+    and the primary key is appended as tie-breaker. Every page is fetched
+    with one indexed range query and no COUNT. Orderings by anything but
+    model fields, e.g. a search rank, are rejected with a 400, because
+    their values are not stable between requests.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    ordering = ("-pk",)
+    invalid_cursor_message = "Invalid cursor."
+    invalid_ordering_message = (
+        "Cursor pagination only supports ordering by fields, "
+        "use an explicit ordering or page numbers."
+    )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return one page of rows positioned after the requested cursor.
+        """
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.model = queryset.model
+        self.keys = self.get_keys(queryset)
+
+        cursor = self.decode_cursor(request)
+        reverse = bool(cursor and cursor["reverse"])
+        if cursor is not None:
+            condition = self.get_position_filter(cursor["position"], reverse)
+            queryset = self.apply_position(queryset, condition)
+
+        rows = list(queryset.order_by(*self.get_order_by(reverse))[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if reverse:
+            rows.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = cursor is not None
+
+        self.page = rows
+        return rows
+
+    def get_paginated_response(self, data):
+        """
+        Return the page with next and previous cursor links.
+        """
+        return Response(
+            {
+                "next": self.get_next_link(),
+                "previous": self.get_previous_link(),
+                "results": data,
+            }
+        )
+
+    def get_next_link(self):
+        if not (self.has_next and self.page):
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not (self.has_previous and self.page):
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_page_size(self, request):
+        """
+        Return the requested page size capped at max_page_size.
+        """
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, TypeError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def apply_position(self, queryset, condition):
+        """
+        Restrict the queryset to rows after the cursor position.
+        """
+        return queryset.filter(condition)
+
+    def get_keys(self, queryset):
+        """
+        Return (name, descending, nullable) tuples for the sort keys.
+        """
+        order_by = queryset.query.order_by or self.model._meta.ordering or self.ordering
+        if not all(isinstance(term, str) for term in order_by):
+            raise RequestValidationError({"ordering": [self.invalid_ordering_message]})
+
+        pk_name = self.model._meta.pk.name
+        keys = []
+        for term in order_by:
+            descending = term.startswith("-")
+            name = term.lstrip("-")
+            if name == "?":
+                continue
+            if name in ("pk", pk_name):
+                break
+            if not self.is_field(name):
+                raise RequestValidationError({"ordering": [self.invalid_ordering_message]})
+            keys.append((name, descending, self.is_nullable(name)))
+
+        tie_breaker_descending = keys[0][1] if keys else True
+        keys.append((pk_name, tie_breaker_descending, False))
+        return keys
+
+    def is_field(self, name):
+        """
+        Return True if the ordering key is a model field or a field lookup
+        across relations, not an annotation.
+        """
+        model = self.model
+        for part in name.split("__"):
+            if model is None:
+                return False
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return False
+            model = field.related_model
+        return True
+
+    def is_nullable(self, name):
+        """
+        Return True if the ordering key can contain NULL values.
+        """
+        model = self.model
+        parts = name.split("__")
+        for index, part in enumerate(parts):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return False
+            if field.null or (field.is_relation and not field.concrete):
+                return True
+            if index < len(parts) - 1:
+                model = field.related_model
+        return False
+
+    def get_order_by(self, reverse):
+        """
+        Return order_by() arguments for forward or backward traversal.
+        """
+        terms = []
+        for name, descending, nullable in self.keys:
+            if reverse:
+                descending = not descending
+            if nullable:
+                expression = F(name).desc if descending else F(name).asc
+                nulls = {"nulls_first": True} if reverse else {"nulls_last": True}
+                terms.append(expression(**nulls))
+            else:
+                terms.append(f"-{name}" if descending else name)
+        return terms
+
+    def get_position_filter(self, position, reverse):
+        """
+        Build the lexicographic "comes after" condition for the sort keys.
+
+        NULL values are sorted last when moving forward and first when
+        moving backward. The condition starts with a range on the first
+        key, so the database can seek into the index instead of reading
+        it from the start.
+        """
+        return self.get_seek_filter(position, reverse) & self.get_after_filter(
+            position, reverse
+        )
+
+    def get_seek_filter(self, position, reverse):
+        """
+        Return the range of the first sort key that holds every row after
+        the cursor. It is implied by the full condition and only there to
+        give the database an index range to start from.
+        """
+        (name, descending, nullable), value = self.keys[0], position[0]
+        if reverse:
+            descending = not descending
+
+        if value is None:
+            # Forward, only NULLs follow; backward, every value may follow.
+            return Q() if reverse else Q(**{f"{name}__isnull": True})
+
+        seek = Q(**{f"{name}__{'lte' if descending else 'gte'}": value})
+        if nullable and not reverse:
+            seek |= Q(**{f"{name}__isnull": True})
+        return seek
+
+    def get_after_filter(self, position, reverse):
+        """
+        Return the rows that come strictly after the cursor position.
+        """
+        terms = []
+        equal = Q()
+        for (name, descending, nullable), value in zip(self.keys, position):
+            if reverse:
+                descending = not descending
+            operator = "lt" if descending else "gt"
+
+            if value is None:
+                after = Q(**{f"{name}__isnull": False}) if reverse else None
+                same = Q(**{f"{name}__isnull": True})
+            else:
+                after = Q(**{f"{name}__{operator}": value})
+                if nullable and not reverse:
+                    after |= Q(**{f"{name}__isnull": True})
+                same = Q(**{name: value})
+
+            if after is not None:
+                terms.append(equal & after)
+            equal &= same
+        return reduce(or_, terms)
+
+    def get_signature(self):
+        return [f"-{name}" if descending else name for name, descending, _ in self.keys]
+
+    def encode_cursor(self, obj, reverse):
+        """
+        Return the page URL for a cursor positioned at the given row.
+        """
+        payload = {
+            "o": self.get_signature(),
+            "p": [self.encode_value(self.get_value(obj, name)) for name, _, _ in self.keys],
+        }
+        if reverse:
+            payload["r"] = 1
+        raw = json.dumps(payload, separators=(",", ":")).encode()
+        token = base64.urlsafe_b64encode(raw).decode().rstrip("=")
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, token)
+
+    def decode_cursor(self, request):
+        """
+        Return the decoded cursor from the request or None on the first page.
+        """
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+            payload = json.loads(raw)
+            values = payload["p"]
+            if payload["o"] != self.get_signature() or len(values) != len(self.keys):
+                raise ValueError
+            position = [
+                self.decode_value(name, value)
+                for (name, _, _), value in zip(self.keys, values)
+            ]
+        except (binascii.Error, KeyError, TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+        return {"position": position, "reverse": bool(payload.get("r"))}
+
+    def get_value(self, obj, name):
+        for part in name.split("__"):
+            obj = getattr(obj, part, None)
+            if obj is None:
+                return None
+        return obj
+
+    def encode_value(self, value):
+        if isinstance(value, (datetime, date)):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    def decode_value(self, name, value):
+        if value is None:
+            return None
+        model = self.model
+        field = None
+        for part in name.split("__"):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return value
+            model = field.related_model
+        return field.to_python(value)
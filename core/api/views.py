@@ -1,11 +1,8 @@
-from django.db.models import Avg
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from offers_app.models import Offer
-from profiles_app.models import Profile
-from reviews_app.models import Review
+from core.stats import get_platform_stats
 
 
 class BaseInfoView(APIView):
@@ -18,23 +15,6 @@ class BaseInfoView(APIView):
     def get(self, request):
         """
         Return review count, average rating, business profile count,
-        and offer count.
+        and offer count from the maintained platform stats.
         """
-        review_count = Review.objects.count()
-        avg = Review.objects.aggregate(avg=Avg("rating"))["avg"]
-        average_rating = round(float(avg), 1) if avg is not None else 0.0
-
-        business_profile_count = Profile.objects.filter(
-            role=Profile.ROLE_BUSINESS
-        ).count()
-
-        offer_count = Offer.objects.count()
-
-        return Response(
-            {
-                "review_count": review_count,
-                "average_rating": average_rating,
-                "business_profile_count": business_profile_count,
-                "offer_count": offer_count,
-            }
-        )
\ No newline at end of file
+        return Response(get_platform_stats())
@@ -2,6 +2,9 @@
 ASGI config for core project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+The order event stream (/api/orders/events/) is an async view that keeps
+the connection open, so it is served through this entry point; the
+Procfile runs it with Gunicorn and Uvicorn workers.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
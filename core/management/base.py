@@ -0,0 +1,223 @@
+import csv
+import json
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class RowError(Exception):
+    """
+    Raised when a single import row cannot be imported.
+    """
+
+
+class ImportCommand(BaseCommand):
+    """
+    Base command for streaming JSONL or CSV imports.
+
+    Rows are read one at a time, turned into unsaved objects by
+    build_row() and handed to write_batch() in batches. Subclasses set
+    item_name, implement both hooks and may override parse_csv_row() to
+    reshape flat CSV columns. write_batch() returns the number of rows it
+    actually wrote; the rest of the batch is reported with skipped_label.
+    """
+
+    item_name = "rows"
+    skipped_label = None
+    default_batch_size = 500
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help=f"JSONL or CSV file to import {self.item_name} from.")
+        parser.add_argument(
+            "--format",
+            choices=["jsonl", "csv"],
+            help="File format. Defaults to the file extension.",
+        )
+        parser.add_argument("--batch-size", type=int, default=self.default_batch_size)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Validate all rows without writing to the database.",
+        )
+
+    def handle(self, *args, **options):
+        path = Path(options["path"])
+        if not path.exists():
+            raise CommandError(f"File not found: {path}")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        file_format = options["format"] or path.suffix.lstrip(".").lower()
+        if file_format not in ("jsonl", "csv"):
+            raise CommandError("Unknown file format, use --format jsonl or csv.")
+
+        self.users = {}
+        self.dry_run = options["dry_run"]
+        batch_size = options["batch_size"]
+
+        self.imported = self.skipped = self.failed = 0
+        self.started = time.monotonic()
+        batch = []
+
+        with path.open(newline="", encoding="utf-8") as handle:
+            for line_number, raw in self.read_rows(handle, file_format):
+                try:
+                    batch.append(self.build_row(self.parse_row(raw)))
+                except RowError as exc:
+                    self.failed += 1
+                    self.stderr.write(f"Row {line_number}: {exc}")
+                    continue
+
+                if len(batch) >= batch_size:
+                    self.flush(batch)
+                    batch = []
+                    self.report()
+
+        if batch:
+            self.flush(batch)
+
+        self.report(final=True)
+
+    def read_rows(self, handle, file_format):
+        """
+        Yield (line number, raw row) pairs without loading the whole file.
+        """
+        if file_format == "csv":
+            reader = csv.DictReader(handle)
+            for row in reader:
+                yield reader.line_num, row
+            return
+
+        for line_number, line in enumerate(handle, start=1):
+            if line.strip():
+                yield line_number, line
+
+    def parse_row(self, raw):
+        """
+        Return the row as a dict, passing CSV rows through parse_csv_row().
+        """
+        if isinstance(raw, dict):
+            return self.parse_csv_row(raw)
+        try:
+            data = json.loads(raw)
+        except json.JSONDecodeError as exc:
+            raise RowError(f"Invalid JSON: {exc}")
+        if not isinstance(data, dict):
+            raise RowError("Expected a JSON object.")
+        return data
+
+    def parse_csv_row(self, row):
+        """
+        Return a CSV row in the same shape as a JSONL row.
+        """
+        return row
+
+    def build_row(self, data):
+        """
+        Validate one parsed row and return what write_batch() expects.
+        """
+        raise NotImplementedError("subclasses of ImportCommand must provide build_row()")
+
+    def write_batch(self, batch):
+        """
+        Write a batch and return the number of written rows.
+        """
+        raise NotImplementedError("subclasses of ImportCommand must provide write_batch()")
+
+    def flush(self, batch):
+        """
+        Write a batch unless this is a dry run and update the counters.
+        """
+        written = len(batch) if self.dry_run else self.write_batch(batch)
+        self.imported += written
+        self.skipped += len(batch) - written
+
+    def report(self, final=False):
+        """
+        Write progress with the current import rate.
+        """
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        rate = (self.imported + self.skipped + self.failed) / elapsed
+        verb = "Validated" if self.dry_run else "Imported"
+        counts = [f"{verb} {self.imported} {self.item_name}"]
+        if self.skipped_label:
+            counts.append(f"{self.skipped} {self.skipped_label}")
+        counts.append(f"{self.failed} rows failed")
+        message = f"{', '.join(counts)}, {elapsed:.1f}s ({rate:.0f} rows/s)"
+        if final:
+            self.stdout.write(self.style.SUCCESS(message))
+        else:
+            self.stdout.write(message)
+
+
+class ReconcileCommand(BaseCommand):
+    """
+    Base command that compares per-business counter rows with the values
+    counted from the source tables and rebuilds every row that drifted.
+
+    Subclasses set model and item_name and implement count_expected()
+    and get_empty_values(). The model needs a business_user_id column
+    and a rebuild(business_user_ids) classmethod.
+    """
+
+    model = None
+    item_name = "rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help=f"Only report drifted {self.item_name} without fixing them.",
+        )
+
+    def count_expected(self):
+        """
+        Return {business_user_id: {field: value}} from the source tables.
+        """
+        raise NotImplementedError("subclasses of ReconcileCommand must provide count_expected()")
+
+    def get_empty_values(self):
+        """
+        Return the field values of a business user without any rows.
+        """
+        raise NotImplementedError("subclasses of ReconcileCommand must provide get_empty_values()")
+
+    def fix(self, business_user_ids):
+        """
+        Rebuild the drifted rows of the given business users.
+        """
+        self.model.rebuild(business_user_ids)
+
+    def handle(self, *args, **options):
+        expected = self.count_expected()
+        empty = self.get_empty_values()
+
+        current = {
+            row.pop("business_user_id"): row
+            for row in self.model.objects.values("business_user_id", *empty)
+        }
+
+        business_user_ids = sorted(expected.keys() | current.keys())
+        drifted = [
+            business_user_id
+            for business_user_id in business_user_ids
+            if expected.get(business_user_id, empty) != current.get(business_user_id)
+        ]
+
+        for business_user_id in drifted:
+            self.stdout.write(
+                f"Business user {business_user_id}: "
+                f"{current.get(business_user_id)} -> {expected.get(business_user_id, empty)}"
+            )
+
+        if drifted and not options["dry_run"]:
+            self.fix(drifted)
+
+        verb = "found" if options["dry_run"] else "fixed"
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Checked {len(business_user_ids)} business users, "
+                f"{verb} {len(drifted)} drifted {self.item_name}."
+            )
+        )
@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.stats import rebuild_platform_stats
+
+
+class Command(BaseCommand):
+    help = "Recalculate the platform stats shown by /api/base-info/ from the source tables."
+
+    def handle(self, *args, **options):
+        stats = rebuild_platform_stats()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Rebuilt platform stats: {stats.review_count} reviews, "
+                f"average rating {stats.average_rating}, "
+                f"{stats.business_profile_count} business profiles, "
+                f"{stats.offer_count} offers."
+            )
+        )
@@ -0,0 +1,51 @@
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def seed_platform_stats(apps, schema_editor):
+    """
+    Create the stats row from the current reviews, profiles and offers.
+    """
+    PlatformStats = apps.get_model("core", "PlatformStats")
+    Review = apps.get_model("reviews_app", "Review")
+    Profile = apps.get_model("profiles_app", "Profile")
+    Offer = apps.get_model("offers_app", "Offer")
+
+    PlatformStats.objects.update_or_create(
+        pk=1,
+        defaults={
+            "review_count": Review.objects.count(),
+            "rating_sum": Review.objects.aggregate(total=Sum("rating"))["total"] or 0,
+            "business_profile_count": Profile.objects.filter(role="business").count(),
+            "offer_count": Offer.objects.count(),
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('offers_app', '0003_offer_search_index'),
+        ('profiles_app', '0002_profile_created_at_profile_description_profile_file_and_more'),
+        ('reviews_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('business_profile_count', models.IntegerField(default=0)),
+                ('offer_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name_plural': 'platform stats',
+            },
+        ),
+        migrations.RunPython(seed_platform_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,65 @@
+from django.db import models
+
+
+class LoadedValuesMixin:
+    """
+    Remember the field values loaded from the database, so signal
+    handlers can compute deltas without querying the old row.
+    """
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def get_loaded_value(self, name):
+        """
+        Return the value of a field as it was last loaded or saved.
+        """
+        return self.__dict__.get("_loaded_values", {}).get(name)
+
+    def remember_loaded_values(self):
+        """
+        Record the current field values after a save.
+        """
+        self._loaded_values = {
+            field.attname: self.__dict__[field.attname]
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+        }
+
+
+class PlatformStats(models.Model):
+    """
+    Store the platform wide counters shown by the base-info endpoint.
+
+    There is a single row that is updated incrementally on every
+    review, profile and offer write.
+    """
+
+    SINGLETON_ID = 1
+
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    business_profile_count = models.IntegerField(default=0)
+    offer_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name_plural = "platform stats"
+
+    def __str__(self):
+        """
+        Return a readable label for the stats row.
+        """
+        return f"Platform stats ({self.updated_at:%Y-%m-%d %H:%M})"
+
+    @property
+    def average_rating(self):
+        """
+        Return the average review rating rounded to one decimal.
+        """
+        if not self.review_count:
+            return 0.0
+        return round(self.rating_sum / self.review_count, 1)
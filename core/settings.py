@@ -36,6 +36,7 @@ INSTALLED_APPS = [
     "offers_app",
     "orders_app",
     "reviews_app",
+    "core",
 ]
 
 MIDDLEWARE = [
@@ -101,13 +102,56 @@ USE_TZ = True
 
 STATIC_URL = "/static/"
 
+# Local memory is per process. Offer list caches are keyed by a version
+# stored in the database, so they stay correct with several workers and
+# management commands; the platform stats cache can lag by its timeout
+# unless a shared backend (e.g. Redis) is configured here.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+OFFER_LIST_CACHE_ENABLED = os.environ.get("OFFER_LIST_CACHE_ENABLED", "1") == "1"
+# Cache hits and misses are written to the database in batches of this size.
+OFFER_LIST_CACHE_STATS_FLUSH_EVERY = int(
+    os.environ.get("OFFER_LIST_CACHE_STATS_FLUSH_EVERY", "100")
+)
+OFFER_LIST_CACHE_TIMEOUT = int(os.environ.get("OFFER_LIST_CACHE_TIMEOUT", "60"))
+OFFER_COUNT_CACHE_TIMEOUT = int(os.environ.get("OFFER_COUNT_CACHE_TIMEOUT", "300"))
+PLATFORM_STATS_CACHE_TIMEOUT = int(os.environ.get("PLATFORM_STATS_CACHE_TIMEOUT", "30"))
+
+# Weight of the platform average in the Bayesian business ranking score,
+# i.e. the number of average reviews every business starts with.
+BUSINESS_RANKING_PRIOR_WEIGHT = int(os.environ.get("BUSINESS_RANKING_PRIOR_WEIGHT", "10"))
+
+# Server-Sent Events for /api/orders/events/
+ORDER_EVENTS_HEARTBEAT_SECONDS = int(os.environ.get("ORDER_EVENTS_HEARTBEAT_SECONDS", "15"))
+ORDER_EVENTS_BATCH_SIZE = 100
+ORDER_EVENTS_RETRY_MS = 3000
+# Event ids are not assigned in commit order, so streams keep looking for
+# lower ids that show up late for this long after the event was created.
+# It has to exceed the longest transaction that records order events.
+ORDER_EVENTS_LOOKBACK_SECONDS = int(os.environ.get("ORDER_EVENTS_LOOKBACK_SECONDS", "10"))
+# Lifetime of the stream tokens from /api/orders/events/token/. They are
+# only checked when a stream connects, so reconnects need a fresh one.
+ORDER_EVENTS_STREAM_TOKEN_MAX_AGE = int(
+    os.environ.get("ORDER_EVENTS_STREAM_TOKEN_MAX_AGE", "60")
+)
+# Events older than this are deleted by the prune_order_events command.
+ORDER_EVENTS_RETENTION_DAYS = int(os.environ.get("ORDER_EVENTS_RETENTION_DAYS", "7"))
+
+# Completed and cancelled orders older than this are moved to the archive
+# by the archive_orders management command.
+ORDER_ARCHIVE_AFTER_DAYS = int(os.environ.get("ORDER_ARCHIVE_AFTER_DAYS", "180"))
+
 if not DEBUG:
     STATIC_ROOT = os.path.join(BASE_DIR, "staticfiles")
     STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "auth_app.api.authentication.ProfileTokenAuthentication",
     ],
     "DEFAULT_PERMISSION_CLASSES": [
         "rest_framework.permissions.IsAuthenticated",
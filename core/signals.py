@@ -0,0 +1,39 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.stats import adjust_platform_stats
+from offers_app.models import Offer
+from profiles_app.models import Profile
+
+
+def _is_business(role):
+    return 1 if role == Profile.ROLE_BUSINESS else 0
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, created, **kwargs):
+    """
+    Count business profiles, including role changes.
+    """
+    previous = None if created else instance.get_loaded_value("role")
+    if created or previous is not None:
+        adjust_platform_stats(
+            business_profile_count=_is_business(instance.role) - _is_business(previous)
+        )
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=Profile)
+def profile_deleted(sender, instance, **kwargs):
+    adjust_platform_stats(business_profile_count=-_is_business(instance.role))
+
+
+@receiver(post_save, sender=Offer)
+def offer_saved(sender, instance, created, **kwargs):
+    if created:
+        adjust_platform_stats(offer_count=1)
+
+
+@receiver(post_delete, sender=Offer)
+def offer_deleted(sender, instance, **kwargs):
+    adjust_platform_stats(offer_count=-1)
@@ -0,0 +1,79 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Sum
+from django.utils import timezone
+
+from core.models import PlatformStats
+from offers_app.models import Offer
+from profiles_app.models import Profile
+from reviews_app.models import Review
+
+PLATFORM_STATS_CACHE_KEY = "platform-stats"
+
+
+def get_platform_stats():
+    """
+    Return the platform stats, from the cache when possible.
+    """
+    data = cache.get(PLATFORM_STATS_CACHE_KEY)
+    if data is None:
+        stats = PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_ID).first()
+        if stats is None:
+            stats = rebuild_platform_stats()
+        data = {
+            "review_count": stats.review_count,
+            "average_rating": stats.average_rating,
+            "business_profile_count": stats.business_profile_count,
+            "offer_count": stats.offer_count,
+        }
+        cache.set(PLATFORM_STATS_CACHE_KEY, data, settings.PLATFORM_STATS_CACHE_TIMEOUT)
+    return data
+
+
+def adjust_platform_stats(**deltas):
+    """
+    Add the given deltas to the stats row in one UPDATE statement.
+
+    The row is rebuilt from scratch if it does not exist yet. The cached
+    stats are dropped after the commit, so a concurrent reader cannot cache
+    the values from before it.
+    """
+    deltas = {name: delta for name, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    updated = PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_ID).update(
+        updated_at=timezone.now(),
+        **{name: F(name) + delta for name, delta in deltas.items()},
+    )
+    if not updated:
+        rebuild_platform_stats()
+    transaction.on_commit(clear_platform_stats_cache)
+
+
+def rebuild_platform_stats():
+    """
+    Recalculate all platform stats from the source tables.
+    """
+    reviews = Review.objects.aggregate(rating_sum=Sum("rating"))
+    stats, _ = PlatformStats.objects.update_or_create(
+        pk=PlatformStats.SINGLETON_ID,
+        defaults={
+            "review_count": Review.objects.count(),
+            "rating_sum": reviews["rating_sum"] or 0,
+            "business_profile_count": Profile.objects.filter(
+                role=Profile.ROLE_BUSINESS
+            ).count(),
+            "offer_count": Offer.objects.count(),
+        },
+    )
+    transaction.on_commit(clear_platform_stats_cache)
+    return stats
+
+
+def clear_platform_stats_cache():
+    """
+    Drop the cached platform stats.
+    """
+    cache.delete(PLATFORM_STATS_CACHE_KEY)
@@ -1,7 +1,11 @@
+from io import StringIO
+
 import pytest
 from django.contrib.auth.models import User
+from django.core.management import call_command
 from rest_framework.test import APIClient
 
+from core.models import PlatformStats
 from offers_app.models import Offer
 from profiles_app.models import Profile
 from reviews_app.models import Review
@@ -55,4 +59,99 @@ def test_base_info_returns_correct_stats(api_client):
     assert data["review_count"] == 2
     assert data["average_rating"] == 4.5
     assert data["business_profile_count"] == 2
-    assert data["offer_count"] == 2
\ No newline at end of file
+    assert data["offer_count"] == 2
+
+
+@pytest.mark.django_db
+def test_base_info_reads_one_row_and_then_the_cache(
+    api_client, business_user, django_assert_num_queries
+):
+    Offer.objects.create(user=business_user, title="Offer", description="x")
+
+    with django_assert_num_queries(1):
+        res = api_client.get("/api/base-info/")
+    assert res.json()["offer_count"] == 1
+
+    with django_assert_num_queries(0):
+        res = api_client.get("/api/base-info/")
+    assert res.json()["business_profile_count"] == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_base_info_follows_review_updates_and_deletes(
+    api_client, business_user, customer_user
+):
+    review = Review.objects.create(
+        business_user=business_user, reviewer=customer_user, rating=2
+    )
+    assert api_client.get("/api/base-info/").json()["average_rating"] == 2.0
+
+    review = Review.objects.get(pk=review.pk)
+    review.rating = 5
+    review.save()
+    data = api_client.get("/api/base-info/").json()
+    assert data["review_count"] == 1
+    assert data["average_rating"] == 5.0
+
+    review.rating = 4
+    review.save()
+    assert api_client.get("/api/base-info/").json()["average_rating"] == 4.0
+
+    review.delete()
+    data = api_client.get("/api/base-info/").json()
+    assert data["review_count"] == 0
+    assert data["average_rating"] == 0.0
+
+
+@pytest.mark.django_db(transaction=True)
+def test_base_info_follows_profile_role_changes_and_deletes(api_client, business_user):
+    profile = Profile.objects.get(user=business_user)
+    profile.role = Profile.ROLE_CUSTOMER
+    profile.save()
+    assert api_client.get("/api/base-info/").json()["business_profile_count"] == 0
+
+    profile.role = Profile.ROLE_BUSINESS
+    profile.save()
+    assert api_client.get("/api/base-info/").json()["business_profile_count"] == 1
+
+    business_user.delete()
+    data = api_client.get("/api/base-info/").json()
+    assert data["business_profile_count"] == 0
+
+
+@pytest.mark.django_db
+def test_rebuild_platform_stats_repairs_drift(api_client, business_user):
+    Offer.objects.create(user=business_user, title="Offer", description="x")
+    PlatformStats.objects.update(offer_count=42, business_profile_count=0)
+
+    call_command("rebuild_platform_stats", stdout=StringIO())
+
+    data = api_client.get("/api/base-info/").json()
+    assert data["offer_count"] == 1
+    assert data["business_profile_count"] == 1
+
+
+@pytest.mark.django_db
+def test_platform_stats_row_is_rebuilt_when_missing(api_client, business_user):
+    PlatformStats.objects.all().delete()
+
+    Offer.objects.create(user=business_user, title="Offer", description="x")
+
+    assert PlatformStats.objects.get().offer_count == 1
+    assert api_client.get("/api/base-info/").json()["offer_count"] == 1
+
+
+@pytest.mark.django_db
+def test_platform_stats_cache_is_cleared_after_commit(
+    api_client, business_user, django_capture_on_commit_callbacks
+):
+    assert api_client.get("/api/base-info/").json()["offer_count"] == 0
+
+    with django_capture_on_commit_callbacks() as callbacks:
+        Offer.objects.create(user=business_user, title="Offer", description="x")
+        # a reader inside the writer's transaction still sees the cached value
+        assert api_client.get("/api/base-info/").json()["offer_count"] == 0
+
+    for callback in callbacks:
+        callback()
+    assert api_client.get("/api/base-info/").json()["offer_count"] == 1
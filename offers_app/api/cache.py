@@ -0,0 +1,174 @@
+import hashlib
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+
+from core.models import PlatformStats
+from core.stats import get_platform_stats
+from offers_app.models import OfferListCacheStats, OfferListVersion
+
+OFFER_LIST_CACHE_HITS_KEY = "offers:list:hits"
+OFFER_LIST_CACHE_MISSES_KEY = "offers:list:misses"
+OFFER_COUNT_FILTER_PARAMS = ("creator_id", "min_price", "max_delivery_time", "search")
+OFFER_LIST_CACHE_PARAMS = (
+    "creator_id",
+    "min_price",
+    "max_delivery_time",
+    "search",
+    "ordering",
+    "page",
+    "page_size",
+    "pagination",
+    "cursor",
+)
+
+
+def get_offer_list_version(request=None):
+    """
+    Return the current version of the cached offer list responses.
+
+    The version is read from the database, once per request when one is
+    given, so cache entries written by any process are only served while
+    they are current.
+    """
+    if request is None:
+        return OfferListVersion.get_version()
+    if not hasattr(request, "offer_list_version"):
+        request.offer_list_version = OfferListVersion.get_version()
+    return request.offer_list_version
+
+
+def bump_offer_list_version():
+    """
+    Invalidate all cached offer list responses and list ETags.
+    """
+    OfferListVersion.bump()
+
+
+def get_offer_total():
+    """
+    Return the number of all offers from the platform stats row.
+
+    The row is read directly instead of through the platform stats cache,
+    which is per process with the default backend.
+    """
+    offer_count = PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_ID).values_list(
+        "offer_count", flat=True
+    ).first()
+    if offer_count is None:
+        return get_platform_stats()["offer_count"]
+    return offer_count
+
+
+def get_offer_count(request, queryset):
+    """
+    Return the number of offers matching the request filters.
+
+    Unfiltered listings use the platform offer counter. Filtered counts are
+    cached per filter set until the next offer write or the timeout.
+    """
+    params = _normalized_params(request, OFFER_COUNT_FILTER_PARAMS)
+    if not params:
+        return get_offer_total()
+
+    key = "offers:count:" + hashlib.sha256(urlencode(params).encode()).hexdigest()
+    version = get_offer_list_version(request)
+    count = cache.get(key, version=version)
+    if count is None:
+        count = queryset.count()
+        cache.set(key, count, settings.OFFER_COUNT_CACHE_TIMEOUT, version=version)
+    return count
+
+
+def _normalized_params(request, names):
+    return sorted(
+        (name, value)
+        for name in names
+        for value in request.query_params.getlist(name)
+        if value != ""
+    )
+
+
+def get_offer_list_cache_key(request):
+    """
+    Return a cache key for the normalized offer list query.
+
+    Host and scheme are part of the key because the response
+    contains absolute URLs.
+    """
+    params = _normalized_params(request, OFFER_LIST_CACHE_PARAMS)
+    raw = f"{request.scheme}://{request.get_host()}{request.path}?{urlencode(params)}"
+    return "offers:list:" + hashlib.sha256(raw.encode()).hexdigest()
+
+
+def get_cached_offer_list(request):
+    """
+    Return the cached response data for the request and its cache key.
+
+    Both are None when OFFER_LIST_CACHE_ENABLED is off.
+    """
+    if not settings.OFFER_LIST_CACHE_ENABLED:
+        return None, None
+    key = get_offer_list_cache_key(request)
+    version = get_offer_list_version(request)
+    return cache.get(key, version=version), (key, version)
+
+
+def cache_offer_list(cache_key, data):
+    """
+    Store offer list response data under the key from get_cached_offer_list.
+    """
+    if cache_key is None:
+        return
+    key, version = cache_key
+    cache.set(key, data, settings.OFFER_LIST_CACHE_TIMEOUT, version=version)
+
+
+def count_offer_list_cache_lookup(hit):
+    """
+    Count a hit or a miss of the offer list cache.
+
+    Lookups are buffered in the cache and added to the shared stats row
+    once OFFER_LIST_CACHE_STATS_FLUSH_EVERY of them have piled up.
+    """
+    key = OFFER_LIST_CACHE_HITS_KEY if hit else OFFER_LIST_CACHE_MISSES_KEY
+    try:
+        pending = cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, None)
+        pending = cache.incr(key)
+
+    if pending >= settings.OFFER_LIST_CACHE_STATS_FLUSH_EVERY:
+        # A concurrent flush may take the same lookups; the buffer then
+        # goes negative and the total over both stays right.
+        cache.decr(key, pending)
+        OfferListCacheStats.add(**{"hits" if hit else "misses": pending})
+
+
+def get_offer_list_cache_stats():
+    """
+    Return the offer list cache hits and misses counted so far.
+
+    Lookups still buffered by other processes are not included.
+    """
+    stats = (
+        OfferListCacheStats.objects.filter(pk=OfferListCacheStats.SINGLETON_ID)
+        .values("hits", "misses")
+        .first()
+    ) or {"hits": 0, "misses": 0}
+    pending = cache.get_many([OFFER_LIST_CACHE_HITS_KEY, OFFER_LIST_CACHE_MISSES_KEY])
+    return {
+        "hits": stats["hits"] + pending.get(OFFER_LIST_CACHE_HITS_KEY, 0),
+        "misses": stats["misses"] + pending.get(OFFER_LIST_CACHE_MISSES_KEY, 0),
+    }
+
+
+def reset_offer_list_cache_stats():
+    """
+    Reset the shared counters and the lookups buffered by this process.
+    """
+    OfferListCacheStats.objects.filter(pk=OfferListCacheStats.SINGLETON_ID).update(
+        hits=0, misses=0
+    )
+    cache.delete_many([OFFER_LIST_CACHE_HITS_KEY, OFFER_LIST_CACHE_MISSES_KEY])
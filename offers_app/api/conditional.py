@@ -0,0 +1,95 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_cache_control
+from django.utils.http import http_date, quote_etag
+
+from offers_app.models import Offer, OfferDetail
+from .cache import get_offer_list_cache_key
+from .cache import get_offer_list_version as get_offer_list_cache_version
+
+
+def make_etag(*parts):
+    """
+    Return a quoted ETag built from the given version parts.
+    """
+    raw = "|".join(str(part) for part in parts)
+    return quote_etag(hashlib.sha256(raw.encode()).hexdigest()[:32])
+
+
+class ConditionalGetMixin:
+    """
+    Answer GET requests with 304 Not Modified from a cheap version lookup
+    before any serialization happens.
+    """
+
+    cache_private = True
+
+    def get_version(self, request, *args, **kwargs):
+        """
+        Return (etag, last_modified) for the requested resource,
+        or None to skip conditional handling, which is the default.
+        """
+        return None
+
+    def get(self, request, *args, **kwargs):
+        version = self.get_version(request, *args, **kwargs)
+        if version is None:
+            return super().get(request, *args, **kwargs)
+
+        etag, last_modified = version
+        timestamp = int(last_modified.timestamp()) if last_modified else None
+
+        response = get_conditional_response(
+            request,
+            etag=etag,
+            last_modified=timestamp,
+        )
+        if response is None:
+            response = super().get(request, *args, **kwargs)
+
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            if timestamp is not None:
+                response["Last-Modified"] = http_date(timestamp)
+            patch_cache_control(response, no_cache=True, private=self.cache_private)
+        return response
+
+
+def get_offer_version(request, pk):
+    """
+    Return the version of a single offer based on its updated_at.
+    """
+    updated_at = (
+        Offer.objects.filter(pk=pk).values_list("updated_at", flat=True).first()
+    )
+    if updated_at is None:
+        return None
+    return make_etag("offer", pk, updated_at.isoformat(), request.get_host()), updated_at
+
+
+def get_offer_detail_version(request, pk):
+    """
+    Return the version of an offer detail based on its offer's updated_at.
+    """
+    updated_at = (
+        OfferDetail.objects.filter(pk=pk)
+        .values_list("offer__updated_at", flat=True)
+        .first()
+    )
+    if updated_at is None:
+        return None
+    return make_etag("offerdetail", pk, updated_at.isoformat()), updated_at
+
+
+def get_offer_list_version(request):
+    """
+    Return the version of a filtered offer list from the stored list
+    version and the normalized query, with one primary key lookup.
+
+    The list version is bumped by every offer, offer detail and owner
+    name change, so there is no Last-Modified date.
+    """
+    etag = make_etag(
+        get_offer_list_cache_key(request), get_offer_list_cache_version(request)
+    )
+    return etag, None
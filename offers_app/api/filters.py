@@ -1,20 +1,134 @@
-from django.db.models import Min
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
 from django_filters import rest_framework as df
+from rest_framework import filters
 
 from offers_app.models import Offer
 
+SEARCH_RANK = "search_rank"
+
+SQLITE_MATCH_SQL = (
+    "SELECT rowid FROM offers_app_offer_fts "
+    "WHERE offers_app_offer_fts MATCH %s"
+)
+# bm25() is lower for better matches; title hits weigh more than description hits.
+SQLITE_RANK_SQL = "bm25(offers_app_offer_fts, 10.0, 1.0)"
+POSTGRES_MATCH_SQL = (
+    "SELECT id FROM offers_app_offer "
+    "WHERE search_vector @@ to_tsquery('simple', %s)"
+)
+# Negated so that, as on SQLite, ascending order means best match first.
+POSTGRES_RANK_SQL = (
+    "-ts_rank(offers_app_offer.search_vector, to_tsquery('simple', %s))"
+)
+
+
+def get_offers():
+    """ Return offers with their owner and details loaded up front."""
+    return Offer.objects.select_related("user").prefetch_related("details")
+
+
+def get_ordered_offers():
+    """ Return offers ordered by latest update."""
+    return get_offers().order_by("-updated_at")
+
+
+def get_search_tokens(terms):
+    """ Split search terms into plain words safe for a full-text query."""
+    return re.findall(r"\w+", " ".join(terms))
+
+
+def get_search_query(vendor, tokens):
+    """ Return the full-text query for the tokens, or None without a full-text index."""
+    # Every word has to match as a prefix in the title or description.
+    if vendor == "sqlite":
+        return " ".join(f'"{token}"*' for token in tokens)
+    if vendor == "postgresql":
+        return " & ".join(f"{token}:*" for token in tokens)
+    return None
+
+
+def search_offers(queryset, tokens):
+    """
+    Filter offers through the full-text index.
+
+    The match runs once as an uncorrelated subquery. Returns None if
+    the database has no full-text index.
+    """
+    vendor = connections[queryset.db].vendor
+    query = get_search_query(vendor, tokens)
+    if query is None:
+        return None
+
+    match_sql = SQLITE_MATCH_SQL if vendor == "sqlite" else POSTGRES_MATCH_SQL
+    return queryset.filter(id__in=RawSQL(match_sql, (query,)))
+
+
+def rank_offers(queryset, tokens):
+    """
+    Annotate a search_rank for ordering search results by relevance.
 
-def get_annotated_offers():
-    """ Return offers with annotated min price and min delivery time."""
-    return Offer.objects.all().annotate(
-        min_price=Min("details__price"),
-        min_delivery_time=Min("details__delivery_time_in_days"),
+    Returns None if the database has no full-text index.
+    """
+    vendor = connections[queryset.db].vendor
+    query = get_search_query(vendor, tokens)
+    if query is None:
+        return None
+
+    if vendor == "postgresql":
+        return queryset.annotate(**{SEARCH_RANK: RawSQL(POSTGRES_RANK_SQL, (query,))})
+
+    # bm25() only works in the query that runs the MATCH, so the index is
+    # joined once on rowid instead of matching again for every offer row.
+    return queryset.extra(
+        select={SEARCH_RANK: SQLITE_RANK_SQL},
+        tables=["offers_app_offer_fts"],
+        where=[
+            "offers_app_offer_fts MATCH %s",
+            "offers_app_offer_fts.rowid = offers_app_offer.id",
+        ],
+        params=[query],
     )
 
 
-def get_ordered_annotated_offers():
-    """ Return annotated offers ordered by latest update."""
-    return get_annotated_offers().order_by("-updated_at")
+class OfferSearchFilter(filters.SearchFilter):
+    """
+    Search offers through the full-text index of the database.
+
+    Falls back to the default LIKE search on other database backends.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """
+        Return offers matching the search query param.
+        """
+        tokens = get_search_tokens(self.get_search_terms(request))
+        if not tokens:
+            return queryset
+
+        results = search_offers(queryset, tokens)
+        if results is None:
+            return super().filter_queryset(request, queryset, view)
+        return results
+
+
+class OfferOrderingFilter(filters.OrderingFilter):
+    """
+    Order search results by relevance unless an ordering is requested.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        """
+        Rank search results only when they are ordered by relevance.
+        """
+        if not request.query_params.get(self.ordering_param):
+            tokens = get_search_tokens(OfferSearchFilter().get_search_terms(request))
+            ranked = rank_offers(queryset, tokens) if tokens else None
+            if ranked is not None:
+                return ranked.order_by(SEARCH_RANK, "-updated_at")
+        return super().filter_queryset(request, queryset, view)
 
 
 class OfferFilter(df.FilterSet):
@@ -1,4 +1,6 @@
 from django.contrib.auth.models import User
+from django.db import transaction
+from django.urls import reverse
 from rest_framework import serializers
 
 from offers_app.models import Offer, OfferDetail
@@ -39,10 +41,27 @@ class OfferDetailLinkSerializer(serializers.ModelSerializer):
         """
         Return the absolute or relative URL for an offer detail object.
         """
-        request = self.context.get("request")
-        if request:
-            return request.build_absolute_uri(f"/api/offerdetails/{obj.id}/")
-        return f"/api/offerdetails/{obj.id}/"
+        prefix, suffix = self.get_url_parts()
+        return f"{prefix}{obj.id}{suffix}"
+
+    def get_url_parts(self):
+        """
+        Return the URL text before and after the id.
+
+        The parts are resolved once and kept in the shared serializer
+        context, so a list response builds the absolute base URL only
+        once instead of once per detail.
+        """
+        parts = self.context.get("offerdetail_url_parts")
+        if parts is None:
+            path = reverse("offerdetails-detail", kwargs={"pk": 0})
+            prefix, suffix = path.rsplit("0", 1)
+            request = self.context.get("request")
+            if request:
+                prefix = request.build_absolute_uri(prefix)
+            parts = (prefix, suffix)
+            self.context["offerdetail_url_parts"] = parts
+        return parts
 
 
 class UserDetailsSerializer(serializers.ModelSerializer):
@@ -62,8 +81,6 @@ class OfferReadSerializer(serializers.ModelSerializer):
 
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     details = OfferDetailLinkSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
     user_details = serializers.SerializerMethodField()
 
     class Meta:
@@ -82,18 +99,6 @@ class OfferReadSerializer(serializers.ModelSerializer):
             "user_details",
         ]
 
-    def get_min_price(self, obj):
-        """
-        Return the annotated minimum price value.
-        """
-        return getattr(obj, "min_price", None)
-
-    def get_min_delivery_time(self, obj):
-        """
-        Return the annotated minimum delivery time value.
-        """
-        return getattr(obj, "min_delivery_time", None)
-
     def get_user_details(self, obj):
         """
         Return selected user details for the offer owner.
@@ -119,8 +124,6 @@ class OfferRetrieveSerializer(serializers.ModelSerializer):
 
     user = serializers.PrimaryKeyRelatedField(read_only=True)
     details = OfferDetailLinkSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
 
     class Meta:
         model = Offer
@@ -137,12 +140,6 @@ class OfferRetrieveSerializer(serializers.ModelSerializer):
             "min_delivery_time",
         ]
 
-    def get_min_price(self, obj):
-        return getattr(obj, "min_price", None)
-
-    def get_min_delivery_time(self, obj):
-        return getattr(obj, "min_delivery_time", None)
-
 
 class OfferWriteSerializer(serializers.ModelSerializer):
     """
@@ -163,11 +160,9 @@ class OfferWriteSerializer(serializers.ModelSerializer):
 
     def validate(self, attrs):
         """
-        Ensure that POST requests contain exactly three offer details.
+        Ensure that new offers contain exactly three offer details.
         """
-        request = self.context.get("request")
-
-        if request and request.method == "POST":
+        if self.instance is None:
             details = attrs.get("details", [])
             if len(details) != 3:
                 raise serializers.ValidationError(
@@ -178,57 +173,100 @@ class OfferWriteSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         """
-        Create an offer with nested offer details.
+        Create an offer and insert its details in one bulk statement.
         """
         details_data = validated_data.pop("details", [])
         request = self.context.get("request")
 
-        offer = Offer.objects.create(
-            user=request.user,
-            **validated_data,
-        )
+        details = [
+            OfferDetail(**self._detail_fields(detail_data))
+            for detail_data in details_data
+        ]
+        offer = Offer(user=request.user, **validated_data)
+        offer.set_detail_summary(details)
 
-        for detail_data in details_data:
-            OfferDetail.objects.create(offer=offer, **detail_data)
+        with transaction.atomic():
+            offer.save()
+            for detail in details:
+                detail.offer = offer
+            OfferDetail.objects.bulk_create(details)
 
         return offer
 
     def update(self, instance, validated_data):
         """
         Update an offer and its nested details by offer_type.
+
+        The details are loaded once and only changed fields
+        are written back with a single bulk update.
         """
         details_data = validated_data.pop("details", None)
 
         for attr, value in validated_data.items():
             setattr(instance, attr, value)
-        instance.save()
 
-        if details_data is not None:
-            for detail_data in details_data:
-                offer_type = detail_data.get("offer_type")
-
-                if not offer_type:
-                    raise serializers.ValidationError(
-                        {"details": "Each detail needs an offer_type."}
+        with transaction.atomic():
+            if details_data is not None:
+                details = {detail.offer_type: detail for detail in instance.details.all()}
+                changed_details, changed_fields = self._apply_detail_changes(
+                    details,
+                    details_data,
+                )
+                if changed_details:
+                    OfferDetail.objects.bulk_update(
+                        changed_details,
+                        sorted(changed_fields),
                     )
+                instance.set_detail_summary(details.values())
 
-                try:
-                    detail_obj = OfferDetail.objects.get(
-                        offer=instance,
-                        offer_type=offer_type,
-                    )
-                except OfferDetail.DoesNotExist:
-                    raise serializers.ValidationError(
-                        {
-                            "details": (
-                                f"Detail with offer_type='{offer_type}' "
-                                f"does not belong to this offer."
-                            )
-                        }
-                    )
+            instance.save()
+
+        return instance
+
+    def _apply_detail_changes(self, details, details_data):
+        """
+        Apply detail data to the loaded details by offer_type
+        and return the changed details and field names.
+        """
+        changed_details = []
+        changed_fields = set()
+
+        for detail_data in details_data:
+            offer_type = detail_data.get("offer_type")
 
-                for attr, value in detail_data.items():
-                    setattr(detail_obj, attr, value)
-                detail_obj.save()
+            if not offer_type:
+                raise serializers.ValidationError(
+                    {"details": "Each detail needs an offer_type."}
+                )
 
-        return instance
\ No newline at end of file
+            detail_obj = details.get(offer_type)
+            if detail_obj is None:
+                raise serializers.ValidationError(
+                    {
+                        "details": (
+                            f"Detail with offer_type='{offer_type}' "
+                            f"does not belong to this offer."
+                        )
+                    }
+                )
+
+            fields = {
+                attr
+                for attr, value in self._detail_fields(detail_data).items()
+                if getattr(detail_obj, attr) != value
+            }
+            for attr in fields:
+                setattr(detail_obj, attr, detail_data[attr])
+
+            if fields:
+                changed_details.append(detail_obj)
+                changed_fields |= fields
+
+        return changed_details, changed_fields
+
+    @staticmethod
+    def _detail_fields(detail_data):
+        """
+        Return detail data without the client supplied id.
+        """
+        return {attr: value for attr, value in detail_data.items() if attr != "id"}
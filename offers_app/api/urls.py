@@ -2,7 +2,11 @@ from django.urls import path
 from .views import *
 
 urlpatterns = [
-    path("offers/", OfferListCreateView.as_view()),
-    path("offers/<int:pk>/", OfferDetailView.as_view()),
-    path("offerdetails/<int:pk>/", OfferDetailSingleView.as_view()),
-]
\ No newline at end of file
+    path("offers/", OfferListCreateView.as_view(), name="offers-list-create"),
+    path("offers/<int:pk>/", OfferDetailView.as_view(), name="offers-detail"),
+    path(
+        "offerdetails/<int:pk>/",
+        OfferDetailSingleView.as_view(),
+        name="offerdetails-detail",
+    ),
+]
@@ -1,12 +1,31 @@
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework import filters, generics, permissions
-from rest_framework.pagination import PageNumberPagination
+from rest_framework import generics, permissions
+from rest_framework.response import Response
 
+from core.api.pagination import (
+    CachedCountPagination,
+    CursorPaginationOptInMixin,
+    KeysetPagination,
+)
 from offers_app.models import OfferDetail
+from .cache import (
+    cache_offer_list,
+    count_offer_list_cache_lookup,
+    get_cached_offer_list,
+    get_offer_count,
+)
+from .conditional import (
+    ConditionalGetMixin,
+    get_offer_detail_version,
+    get_offer_list_version,
+    get_offer_version,
+)
 from .filters import (
     OfferFilter,
-    get_annotated_offers,
-    get_ordered_annotated_offers,
+    OfferOrderingFilter,
+    OfferSearchFilter,
+    get_offers,
+    get_ordered_offers,
 )
 from .permissions import IsBusinessUser, IsOwner
 from .serializers import (
@@ -17,17 +36,38 @@ from .serializers import (
 )
 
 
-class OfferPagination(PageNumberPagination):
+class OfferPagination(CachedCountPagination):
     """
     Page number pagination for offer list endpoints.
+
+    The total count comes from the offer counter or the per-filter
+    count cache instead of a COUNT(*) on every page.
     """
 
     page_size = 10
     page_size_query_param = "page_size"
     max_page_size = 100
 
+    def get_count(self, queryset):
+        return get_offer_count(self.request, queryset)
 
-class OfferListCreateView(generics.ListCreateAPIView):
+
+class OfferCursorPagination(KeysetPagination):
+    """
+    Keyset pagination for clients that walk the whole offer list,
+    e.g. infinite scrolling. Requested with ?pagination=cursor.
+    """
+
+    page_size = 10
+    max_page_size = 100
+    ordering = ("-updated_at",)
+
+
+class OfferListCreateView(
+    ConditionalGetMixin,
+    CursorPaginationOptInMixin,
+    generics.ListCreateAPIView,
+):
     """
     List all offers or create a new offer.
 
@@ -36,15 +76,17 @@ class OfferListCreateView(generics.ListCreateAPIView):
     """
 
     pagination_class = OfferPagination
+    cursor_pagination_class = OfferCursorPagination
     filter_backends = [
         DjangoFilterBackend,
-        filters.SearchFilter,
-        filters.OrderingFilter,
+        OfferSearchFilter,
+        OfferOrderingFilter,
     ]
     filterset_class = OfferFilter
     search_fields = ["title", "description"]
     ordering_fields = ["updated_at", "min_price"]
     ordering = ["-updated_at"]
+    cache_private = False
 
     def get_permissions(self):
         """
@@ -66,13 +108,35 @@ class OfferListCreateView(generics.ListCreateAPIView):
 
     def get_queryset(self):
         """
-        Return all offers annotated with minimum price
+        Return all offers with their minimum price
         and minimum delivery time.
         """
-        return get_ordered_annotated_offers()
+        return get_ordered_offers()
+
+    def get_version(self, request, *args, **kwargs):
+        """
+        Return the version of the filtered offer list.
+        """
+        return get_offer_list_version(request)
+
+    def list(self, request, *args, **kwargs):
+        """
+        Return the offer list, served from the cache when possible.
+        """
+        data, cache_key = get_cached_offer_list(request)
+        if cache_key is None:
+            return super().list(request, *args, **kwargs)
+
+        count_offer_list_cache_lookup(hit=data is not None)
+        if data is not None:
+            return Response(data)
+
+        response = super().list(request, *args, **kwargs)
+        cache_offer_list(cache_key, response.data)
+        return response
 
 
-class OfferDetailView(generics.RetrieveUpdateDestroyAPIView):
+class OfferDetailView(ConditionalGetMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update, or delete a single offer.
 
@@ -81,7 +145,13 @@ class OfferDetailView(generics.RetrieveUpdateDestroyAPIView):
     """
 
     def get_queryset(self):
-        return get_annotated_offers()
+        return get_offers()
+
+    def get_version(self, request, *args, **kwargs):
+        """
+        Return the version of the requested offer.
+        """
+        return get_offer_version(request, kwargs["pk"])
 
     def get_permissions(self):
         """
@@ -100,11 +170,17 @@ class OfferDetailView(generics.RetrieveUpdateDestroyAPIView):
         return OfferWriteSerializer
 
 
-class OfferDetailSingleView(generics.RetrieveAPIView):
+class OfferDetailSingleView(ConditionalGetMixin, generics.RetrieveAPIView):
     """
     Retrieve a single offer detail instance.
     """
 
     queryset = OfferDetail.objects.all()
     serializer_class = OfferDetailSerializer
-    permission_classes = [permissions.IsAuthenticated]
\ No newline at end of file
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get_version(self, request, *args, **kwargs):
+        """
+        Return the version of the requested offer detail.
+        """
+        return get_offer_detail_version(request, kwargs["pk"])
\ No newline at end of file
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class OffersAppConfig(AppConfig):
     name = 'offers_app'
+
+    def ready(self):
+        from offers_app import signals  # noqa: F401
@@ -0,0 +1,116 @@
+import json
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from core.management.base import ImportCommand, RowError
+from core.stats import adjust_platform_stats
+from offers_app.api.cache import bump_offer_list_version
+from offers_app.api.serializers import OfferWriteSerializer
+from offers_app.models import Offer, OfferDetail
+from profiles_app.models import Profile
+
+OFFER_TYPES = ("basic", "standard", "premium")
+DETAIL_COLUMNS = ("title", "revisions", "delivery_time_in_days", "price", "features")
+
+
+class Command(ImportCommand):
+    help = (
+        "Import offers with their three details from a JSONL or CSV file. "
+        "Rows are streamed and inserted in batches with bulk_create."
+    )
+    item_name = "offers"
+    default_batch_size = 500
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--user",
+            help="Username of the business user owning rows without a user column.",
+        )
+
+    def handle(self, *args, **options):
+        self.default_username = options["user"]
+        super().handle(*args, **options)
+
+    def parse_csv_row(self, row):
+        """
+        Convert flat basic_*, standard_* and premium_* columns into details.
+        """
+        details = []
+        for offer_type in OFFER_TYPES:
+            detail = {
+                column: row.get(f"{offer_type}_{column}")
+                for column in DETAIL_COLUMNS
+                if row.get(f"{offer_type}_{column}") not in (None, "")
+            }
+            if not detail:
+                continue
+            features = detail.get("features", "")
+            detail["features"] = [part.strip() for part in features.split("|") if part.strip()]
+            detail["offer_type"] = offer_type
+            details.append(detail)
+
+        return {
+            "user": row.get("user"),
+            "title": row.get("title"),
+            "description": row.get("description", ""),
+            "details": details,
+        }
+
+    def build_row(self, data):
+        """
+        Validate one row and return an unsaved offer with its details.
+        """
+        user = self.get_user(data.pop("user", None) or self.default_username)
+
+        serializer = OfferWriteSerializer(data=data)
+        if not serializer.is_valid():
+            raise RowError(json.dumps(serializer.errors))
+
+        validated = dict(serializer.validated_data)
+        details = [
+            OfferDetail(**{key: value for key, value in detail.items() if key != "id"})
+            for detail in validated.pop("details")
+        ]
+        offer = Offer(user=user, **validated)
+        offer.set_detail_summary(details)
+        return offer, details
+
+    def get_user(self, username):
+        """
+        Return the business user for a username, cached for the whole import.
+        """
+        if not username:
+            raise RowError("No user given, use a user column or --user.")
+        if username not in self.users:
+            self.users[username] = (
+                User.objects.filter(
+                    username=username,
+                    profile__role=Profile.ROLE_BUSINESS,
+                ).first()
+            )
+        user = self.users[username]
+        if user is None:
+            raise RowError(f"Business user '{username}' not found.")
+        return user
+
+    def write_batch(self, batch):
+        """
+        Insert a batch of offers and their details in one transaction.
+        """
+        with transaction.atomic():
+            Offer.objects.bulk_create([offer for offer, _ in batch])
+            details = []
+            for offer, offer_details in batch:
+                for detail in offer_details:
+                    detail.offer = offer
+                    details.append(detail)
+            OfferDetail.objects.bulk_create(details)
+
+        # bulk_create does not send signals, so update the counters here.
+        # The list version lives in the database, so the bump reaches the
+        # web workers; their platform stats caches expire by timeout.
+        adjust_platform_stats(offer_count=len(batch))
+        bump_offer_list_version()
+        return len(batch)
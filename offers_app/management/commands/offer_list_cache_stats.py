@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand
+
+from offers_app.api.cache import get_offer_list_cache_stats, reset_offer_list_cache_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the hits and misses of the offer list response cache counted "
+        "by all processes. Each process adds its lookups in batches of "
+        "OFFER_LIST_CACHE_STATS_FLUSH_EVERY."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Reset the counters after printing them.",
+        )
+
+    def handle(self, *args, **options):
+        stats = get_offer_list_cache_stats()
+        lookups = stats["hits"] + stats["misses"]
+        hit_rate = stats["hits"] / lookups if lookups else 0
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Offer list cache: {stats['hits']} hits, {stats['misses']} misses "
+                f"({hit_rate:.0%} hit rate)."
+            )
+        )
+        if options["reset"]:
+            reset_offer_list_cache_stats()
@@ -0,0 +1,51 @@
+# Generated by Django 6.0.2 on 2026-10-18 19:20
+
+from django.db import migrations, models
+from django.db.models import Min, OuterRef, Subquery
+
+
+def backfill_detail_summary(apps, schema_editor):
+    """
+    Copy the current minimum price and delivery time onto every offer.
+    """
+    Offer = apps.get_model("offers_app", "Offer")
+    OfferDetail = apps.get_model("offers_app", "OfferDetail")
+
+    details = OfferDetail.objects.filter(offer=OuterRef("pk")).values("offer")
+    Offer.objects.update(
+        min_price=Subquery(
+            details.annotate(value=Min("price")).values("value")
+        ),
+        min_delivery_time=Subquery(
+            details.annotate(value=Min("delivery_time_in_days")).values("value")
+        ),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='offer',
+            name='min_delivery_time',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='offer',
+            name='min_price',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.RunPython(backfill_detail_summary, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['min_price'], name='offer_min_price_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='offer',
+            index=models.Index(fields=['min_delivery_time'], name='offer_min_delivery_time_idx'),
+        ),
+    ]
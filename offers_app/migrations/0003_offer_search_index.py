@@ -0,0 +1,100 @@
+from django.db import migrations
+
+# The SQLite index is an external-content FTS5 table kept in sync by triggers.
+# Note: a migration that makes SQLite rebuild offers_app_offer drops these
+# triggers, so it has to recreate them and run the 'rebuild' command again.
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE offers_app_offer_fts USING fts5(
+        title, description, content='offers_app_offer', content_rowid='id'
+    )
+    """,
+    """
+    CREATE TRIGGER offers_app_offer_fts_insert AFTER INSERT ON offers_app_offer
+    BEGIN
+        INSERT INTO offers_app_offer_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER offers_app_offer_fts_delete AFTER DELETE ON offers_app_offer
+    BEGIN
+        INSERT INTO offers_app_offer_fts (offers_app_offer_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER offers_app_offer_fts_update
+    AFTER UPDATE OF title, description ON offers_app_offer
+    BEGIN
+        INSERT INTO offers_app_offer_fts (offers_app_offer_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO offers_app_offer_fts (rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO offers_app_offer_fts (offers_app_offer_fts) VALUES ('rebuild')",
+]
+
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS offers_app_offer_fts_update",
+    "DROP TRIGGER IF EXISTS offers_app_offer_fts_delete",
+    "DROP TRIGGER IF EXISTS offers_app_offer_fts_insert",
+    "DROP TABLE IF EXISTS offers_app_offer_fts",
+]
+
+# PostgreSQL keeps the tsvector in a generated column, so no triggers are needed.
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE offers_app_offer ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    """
+    CREATE INDEX offers_app_offer_search_vector_idx
+    ON offers_app_offer USING GIN (search_vector)
+    """,
+]
+
+POSTGRES_REVERSE = [
+    "DROP INDEX IF EXISTS offers_app_offer_search_vector_idx",
+    "ALTER TABLE offers_app_offer DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def _run(schema_editor, statements_by_vendor):
+    for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def create_search_index(apps, schema_editor):
+    """
+    Create the full-text index for the current database backend.
+    """
+    _run(
+        schema_editor,
+        {"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD},
+    )
+
+
+def drop_search_index(apps, schema_editor):
+    """
+    Remove the full-text index for the current database backend.
+    """
+    _run(
+        schema_editor,
+        {"sqlite": SQLITE_REVERSE, "postgresql": POSTGRES_REVERSE},
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0002_offer_min_price_min_delivery_time'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 6.0.2 on 2026-10-18 21:33
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0004_offer_pagination_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferListVersion',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('version', models.BigIntegerField(default=0)),
+            ],
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-18 21:36
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0005_offer_list_version'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OfferListCacheStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hits', models.BigIntegerField(default=0)),
+                ('misses', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'verbose_name_plural': 'offer list cache stats',
+            },
+        ),
+    ]
@@ -1,5 +1,7 @@
 from django.contrib.auth.models import User
 from django.db import models
+from django.db.models import F, Min
+from django.utils import timezone
 
 
 class Offer(models.Model):
@@ -14,12 +16,57 @@ class Offer(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    # Denormalized from the related details so that list filters and
+    # ordering can use an index instead of aggregating per request.
+    min_price = models.FloatField(null=True, blank=True, editable=False)
+    min_delivery_time = models.IntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Both serve the keyset pagination, which adds id as tie-breaker.
+            models.Index(fields=["updated_at", "id"], name="offer_updated_at_id_idx"),
+            models.Index(fields=["min_price", "id"], name="offer_min_price_id_idx"),
+            models.Index(
+                fields=["min_delivery_time"],
+                name="offer_min_delivery_time_idx",
+            ),
+        ]
+
     def __str__(self):
         """
         Return the offer title.
         """
         return self.title
 
+    def update_detail_summary(self):
+        """
+        Recalculate min_price and min_delivery_time from the stored details.
+
+        Also touches updated_at, which serves as version of the offer
+        and its details for conditional requests.
+        """
+        summary = self.details.aggregate(
+            min_price=Min("price"),
+            min_delivery_time=Min("delivery_time_in_days"),
+        )
+        summary["updated_at"] = timezone.now()
+        Offer.objects.filter(pk=self.pk).update(**summary)
+        self.min_price = summary["min_price"]
+        self.min_delivery_time = summary["min_delivery_time"]
+        self.updated_at = summary["updated_at"]
+
+    def set_detail_summary(self, details):
+        """
+        Set min_price and min_delivery_time from in-memory details
+        without saving.
+        """
+        details = list(details)
+        self.min_price = min((d.price for d in details), default=None)
+        self.min_delivery_time = min(
+            (d.delivery_time_in_days for d in details),
+            default=None,
+        )
+
 
 class OfferDetail(models.Model):
     """
@@ -44,4 +91,84 @@ class OfferDetail(models.Model):
         """
         Return a readable label for the offer detail.
         """
-        return f"{self.offer.title} - {self.offer_type}"
\ No newline at end of file
+        return f"{self.offer.title} - {self.offer_type}"
+
+class OfferListVersion(models.Model):
+    """
+    Store the version of the cached offer list responses and their ETags.
+
+    There is a single row. It lives in the database, so a write from any
+    process, including management commands, changes the version that
+    every web worker reads, whatever cache backend is configured.
+    """
+
+    SINGLETON_ID = 1
+
+    version = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        """
+        Return a readable label for the version row.
+        """
+        return f"Offer list version {self.version}"
+
+    @classmethod
+    def get_version(cls):
+        """
+        Return the current version with one primary key lookup.
+        """
+        version = cls.objects.filter(pk=cls.SINGLETON_ID).values_list(
+            "version", flat=True
+        ).first()
+        return version or 0
+
+    @classmethod
+    def bump(cls):
+        """
+        Increase the version in a single UPDATE, creating the row if needed.
+        """
+        updated = cls.objects.filter(pk=cls.SINGLETON_ID).update(version=F("version") + 1)
+        if not updated:
+            _, created = cls.objects.get_or_create(
+                pk=cls.SINGLETON_ID, defaults={"version": 1}
+            )
+            if not created:
+                cls.objects.filter(pk=cls.SINGLETON_ID).update(version=F("version") + 1)
+
+
+class OfferListCacheStats(models.Model):
+    """
+    Store the offer list cache hits and misses counted by all processes.
+
+    Each process buffers its lookups in the cache and adds them here in
+    batches, so the counters do not cost a write per request.
+    """
+
+    SINGLETON_ID = 1
+
+    hits = models.BigIntegerField(default=0)
+    misses = models.BigIntegerField(default=0)
+
+    class Meta:
+        verbose_name_plural = "offer list cache stats"
+
+    def __str__(self):
+        """
+        Return a readable label for the stats row.
+        """
+        return f"Offer list cache: {self.hits} hits, {self.misses} misses"
+
+    @classmethod
+    def add(cls, hits=0, misses=0):
+        """
+        Add buffered lookups in a single UPDATE, creating the row if needed.
+        """
+        updated = cls.objects.filter(pk=cls.SINGLETON_ID).update(
+            hits=F("hits") + hits, misses=F("misses") + misses
+        )
+        if not updated:
+            _, created = cls.objects.get_or_create(
+                pk=cls.SINGLETON_ID, defaults={"hits": hits, "misses": misses}
+            )
+            if not created:
+                cls.add(hits, misses)
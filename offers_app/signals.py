@@ -0,0 +1,60 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from offers_app.api.cache import bump_offer_list_version
+from offers_app.models import Offer, OfferDetail
+
+# User fields shown as user_details in the offer list.
+OWNER_FIELDS = {"first_name", "last_name", "username"}
+
+
+# Cached offer lists are invalidated after commit. A bump inside the
+# transaction would let a concurrent request cache the old rows under
+# the new version, where they stay until the timeout.
+@receiver(post_save, sender=Offer)
+def offer_saved(sender, instance, created, **kwargs):
+    """
+    Invalidate cached offer list responses.
+    """
+    transaction.on_commit(bump_offer_list_version)
+
+
+@receiver(post_delete, sender=Offer)
+def offer_deleted(sender, instance, **kwargs):
+    """
+    Invalidate cached offer list responses.
+    """
+    transaction.on_commit(bump_offer_list_version)
+
+
+@receiver(post_save, sender=OfferDetail)
+def offer_detail_saved(sender, instance, **kwargs):
+    """
+    Keep the denormalized price and delivery summary of the offer current.
+    """
+    instance.offer.update_detail_summary()
+    transaction.on_commit(bump_offer_list_version)
+
+
+@receiver(post_delete, sender=OfferDetail)
+def offer_detail_deleted(sender, instance, origin=None, **kwargs):
+    """
+    Refresh the offer summary unless the offer itself is being deleted.
+    """
+    transaction.on_commit(bump_offer_list_version)
+    if isinstance(origin, Offer) or getattr(origin, "model", None) is Offer:
+        return
+    instance.offer.update_detail_summary()
+
+
+@receiver(post_save, sender=User)
+def offer_owner_saved(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Invalidate cached offer list responses when an offer owner's name changes.
+    """
+    if created or (update_fields is not None and not OWNER_FIELDS & set(update_fields)):
+        return
+    if instance.offers.exists():
+        transaction.on_commit(bump_offer_list_version)
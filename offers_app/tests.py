@@ -1,8 +1,19 @@
+import csv
+import json
+from io import StringIO
+from types import SimpleNamespace
+
 import pytest
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import IntegrityError, connection
+from django.db.models import F
 from rest_framework.test import APIClient
 
-from offers_app.models import Offer, OfferDetail
+from offers_app.api.cache import get_offer_list_cache_stats, get_offer_list_version
+from offers_app.api.serializers import OfferWriteSerializer
+from offers_app.models import Offer, OfferDetail, OfferListVersion
 from profiles_app.models import Profile
 
 
@@ -502,4 +513,736 @@ def test_offerdetail_returns_exact_fields(api_client, business_user):
         "features",
         "offer_type",
     }
-    assert set(response.data.keys()) == expected_keys
\ No newline at end of file
+    assert set(response.data.keys()) == expected_keys
+
+@pytest.mark.django_db
+def test_offer_min_values_follow_detail_writes(business_user):
+    offer = _create_offer_with_details(business_user, prices=(100, 200), days=(7, 3))
+    offer.refresh_from_db()
+    assert offer.min_price == 100
+    assert offer.min_delivery_time == 3
+
+    basic = offer.details.get(offer_type="basic")
+    basic.price = 40
+    basic.save()
+    offer.refresh_from_db()
+    assert offer.min_price == 40
+
+    basic.delete()
+    offer.refresh_from_db()
+    assert offer.min_price == 200
+    assert offer.min_delivery_time == 3
+
+    offer.details.all().delete()
+    offer.refresh_from_db()
+    assert offer.min_price is None
+    assert offer.min_delivery_time is None
+
+
+@pytest.mark.django_db
+def test_offer_update_refreshes_min_values(api_client, business_user):
+    offer = _create_offer_with_details(business_user, prices=(100, 200), days=(7, 3))
+    api_client.force_authenticate(user=business_user)
+
+    response = api_client.patch(
+        f"/api/offers/{offer.id}/",
+        {"details": [{"offer_type": "standard", "price": 20, "delivery_time_in_days": 1}]},
+        format="json",
+    )
+    assert response.status_code == 200, response.data
+
+    response = api_client.get(f"/api/offers/{offer.id}/")
+    assert response.data["min_price"] == 20
+    assert response.data["min_delivery_time"] == 1
+
+
+@pytest.mark.django_db
+def test_get_offers_filters_use_min_values(api_client, business_user):
+    _create_offer_with_details(business_user, title="Cheap", prices=(50, 70), days=(9, 8))
+    _create_offer_with_details(business_user, title="Fast", prices=(150, 300), days=(2, 1))
+
+    response = api_client.get("/api/offers/?min_price=100")
+    assert [item["title"] for item in response.data["results"]] == ["Fast"]
+
+    response = api_client.get("/api/offers/?max_delivery_time=5")
+    assert [item["title"] for item in response.data["results"]] == ["Fast"]
+
+
+@pytest.mark.django_db
+def test_get_offers_query_count_is_constant(
+    api_client,
+    business_user,
+    other_business_user,
+    django_assert_max_num_queries,
+):
+    for i in range(15):
+        owner = business_user if i % 2 else other_business_user
+        _create_offer_with_details(owner, title=f"Offer {i}")
+
+    # version lookup, count, offers joined with users, prefetched details
+    with django_assert_max_num_queries(4):
+        response = api_client.get("/api/offers/?page_size=100")
+
+    assert response.status_code == 200
+    assert len(response.data["results"]) == 15
+
+
+@pytest.mark.django_db
+def test_get_single_offer_query_count(
+    api_client,
+    business_user,
+    django_assert_max_num_queries,
+):
+    offer = _create_offer_with_details(business_user)
+    api_client.force_authenticate(user=business_user)
+
+    # version lookup, offer joined with user, prefetched details
+    with django_assert_max_num_queries(3):
+        response = api_client.get(f"/api/offers/{offer.id}/")
+
+    assert response.status_code == 200
+    assert len(response.data["details"]) == 2
+
+
+def _explain_plan(sql):
+    """Return the SQLite query plan of a captured query."""
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql}")
+        return "\n".join(row[-1] for row in cursor.fetchall())
+
+
+def _walk_cursor_pages(api_client, url):
+    ids = []
+    while url:
+        response = api_client.get(url)
+        assert response.status_code == 200
+        assert "count" not in response.data
+        ids.extend(item["id"] for item in response.data["results"])
+        url = response.data["next"]
+    return ids
+
+
+@pytest.mark.django_db
+def test_get_offers_cursor_pagination_min_price_ties(api_client, business_user):
+    offers = [
+        _create_offer_with_details(business_user, title=f"Offer {i}", prices=(price, 500))
+        for i, price in enumerate([30, 10, 30, 20, 30, 10, 30])
+    ]
+    Offer.objects.create(user=business_user, title="No details", description="x")
+
+    ids = _walk_cursor_pages(
+        api_client,
+        "/api/offers/?pagination=cursor&ordering=min_price&page_size=2",
+    )
+
+    expected = sorted(offers, key=lambda offer: (offer.details.first().price, offer.id))
+    no_details = Offer.objects.get(title="No details")
+    assert ids == [offer.id for offer in expected] + [no_details.id]
+
+
+@pytest.mark.django_db
+def test_get_offers_cursor_pagination_previous_and_default_ordering(
+    api_client,
+    business_user,
+    django_assert_max_num_queries,
+):
+    for i in range(5):
+        _create_offer_with_details(business_user, title=f"Offer {i}")
+    Offer.objects.update(updated_at=Offer.objects.first().updated_at)
+
+    ids = _walk_cursor_pages(api_client, "/api/offers/?pagination=cursor&page_size=2")
+    assert ids == list(
+        Offer.objects.order_by("-updated_at", "-id").values_list("id", flat=True)
+    )
+
+    first = api_client.get("/api/offers/?pagination=cursor&page_size=3")
+    assert first.data["previous"] is None
+
+    # version lookup, page query and prefetched details, no COUNT
+    with django_assert_max_num_queries(3) as captured:
+        second = api_client.get(first.data["next"])
+    assert _count_queries(captured) == []
+    back = api_client.get(second.data["previous"])
+    assert [item["id"] for item in back.data["results"]] == [
+        item["id"] for item in first.data["results"]
+    ]
+
+
+@pytest.mark.django_db
+def test_get_offers_invalid_cursor_returns_404(api_client):
+    response = api_client.get("/api/offers/?cursor=not-a-cursor")
+    assert response.status_code == 404
+
+
+@pytest.mark.django_db
+def test_get_offers_search_matches_word_prefixes(api_client, business_user):
+    _create_offer_with_details(business_user, title="Website Design", desc="Responsive")
+    _create_offer_with_details(business_user, title="Logo Design", desc="Vector art")
+
+    response = api_client.get("/api/offers/?search=web des")
+    assert [item["title"] for item in response.data["results"]] == ["Website Design"]
+
+    response = api_client.get("/api/offers/?search=design")
+    assert len(response.data["results"]) == 2
+    assert response.data["count"] == 2
+
+
+@pytest.mark.django_db
+def test_get_offers_search_orders_by_relevance(api_client, business_user):
+    _create_offer_with_details(business_user, title="Branding", desc="Includes a logo")
+    _create_offer_with_details(business_user, title="Logo Design", desc="Logo files")
+    _create_offer_with_details(business_user, title="Unrelated", desc="Nothing")
+
+    response = api_client.get("/api/offers/?search=logo")
+    titles = [item["title"] for item in response.data["results"]]
+    assert titles == ["Logo Design", "Branding"]
+
+    response = api_client.get("/api/offers/?search=logo&ordering=updated_at")
+    titles = [item["title"] for item in response.data["results"]]
+    assert titles == ["Branding", "Logo Design"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_get_offers_search_index_follows_writes(api_client, business_user):
+    offer = _create_offer_with_details(business_user, title="Old Title", desc="Text")
+
+    offer.title = "Photography"
+    offer.save()
+    response = api_client.get("/api/offers/?search=photo")
+    assert [item["id"] for item in response.data["results"]] == [offer.id]
+    response = api_client.get("/api/offers/?search=old")
+    assert response.data["results"] == []
+
+    offer.delete()
+    response = api_client.get("/api/offers/?search=photo")
+    assert response.data["results"] == []
+
+
+@pytest.mark.django_db
+def test_get_offers_search_with_cursor_pagination(api_client, business_user):
+    for i in range(5):
+        _create_offer_with_details(business_user, title=f"Logo {i}", desc="logo " * i)
+
+    # Relevance scores change with every offer write, so they cannot be a cursor.
+    response = api_client.get("/api/offers/?search=logo&pagination=cursor&page_size=2")
+    assert response.status_code == 400
+    assert "ordering" in response.data
+
+    ids = _walk_cursor_pages(
+        api_client,
+        "/api/offers/?search=logo&ordering=-updated_at&pagination=cursor&page_size=2",
+    )
+    assert ids == list(
+        Offer.objects.order_by("-updated_at", "-id").values_list("id", flat=True)
+    )
+
+
+@pytest.mark.django_db
+def test_get_offers_search_ranks_many_matches_in_one_pass(
+    api_client,
+    business_user,
+    django_assert_max_num_queries,
+):
+    Offer.objects.bulk_create(
+        Offer(user=business_user, title=f"Offer {i}", description="design " * (i % 3 + 1))
+        for i in range(3000)
+    )
+    best = _create_offer_with_details(business_user, title="Design", desc="Design design")
+
+    with django_assert_max_num_queries(4) as captured:
+        response = api_client.get("/api/offers/?search=design&page_size=5")
+    assert response.data["count"] == 3001
+    assert response.data["results"][0]["id"] == best.id
+
+    if connection.vendor == "sqlite":
+        plan = _explain_plan(
+            next(q["sql"] for q in captured.captured_queries if "bm25" in q["sql"])
+        )
+        # The index is matched once and joined on rowid, not matched per offer.
+        assert "CORRELATED" not in plan
+        assert "SEARCH offers_app_offer USING INTEGER PRIMARY KEY" in plan
+
+    # Without relevance ordering the rank is not computed at all.
+    with django_assert_max_num_queries(4) as captured:
+        api_client.get("/api/offers/?search=design&ordering=-updated_at&page_size=5")
+    assert not any("bm25" in q["sql"] for q in captured.captured_queries)
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "ordering, index",
+    [
+        (("-updated_at", "-id"), "offer_updated_at_id_idx"),
+        ((F("min_price").asc(nulls_last=True), "id"), "offer_min_price_id_idx"),
+    ],
+)
+def test_offer_cursor_orderings_are_served_by_an_index(ordering, index):
+    if connection.vendor != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN output is SQLite specific.")
+
+    plan = Offer.objects.order_by(*ordering)[:11].explain()
+
+    assert f"USING INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("link", ["next", "previous"])
+def test_offer_cursor_pages_seek_into_the_index(
+    api_client,
+    business_user,
+    django_assert_max_num_queries,
+    link,
+):
+    if connection.vendor != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN output is SQLite specific.")
+    for i in range(4):
+        _create_offer_with_details(business_user, title=f"Offer {i}")
+    url = api_client.get("/api/offers/?pagination=cursor&page_size=1").data["next"]
+    if link == "previous":
+        url = api_client.get(url).data["next"]
+        url = api_client.get(url).data["previous"]
+
+    with django_assert_max_num_queries(3) as captured:
+        api_client.get(url)
+    page_sql = next(
+        q["sql"] for q in captured.captured_queries if 'FROM "offers_app_offer" ' in q["sql"]
+    )
+    plan = _explain_plan(page_sql)
+
+    # The page starts at the cursor instead of reading the index from its start.
+    operator = "<" if link == "next" else ">"
+    assert (
+        f"SEARCH offers_app_offer USING INDEX offer_updated_at_id_idx (updated_at{operator}?)"
+        in plan
+    )
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.django_db
+def test_get_offers_is_served_from_cache(
+    api_client,
+    business_user,
+    django_assert_num_queries,
+):
+    _create_offer_with_details(business_user, title="Cached")
+    first = api_client.get("/api/offers/?page_size=5&ordering=min_price")
+
+    # only the version lookup, the response comes from the cache
+    with django_assert_num_queries(1):
+        second = api_client.get("/api/offers/?ordering=min_price&page_size=5&unknown=1")
+
+    assert second.status_code == 200
+    assert second.data == first.data
+
+    # A bump by any process makes every worker miss its cached entry.
+    OfferListVersion.bump()
+    with django_assert_num_queries(4):
+        api_client.get("/api/offers/?ordering=min_price&page_size=5")
+
+
+@pytest.mark.django_db
+def test_offer_list_version_is_bumped_after_commit(
+    business_user,
+    django_capture_on_commit_callbacks,
+):
+    version = get_offer_list_version()
+
+    with django_capture_on_commit_callbacks(execute=True):
+        _create_offer_with_details(business_user, title="New")
+        assert get_offer_list_version() == version
+
+    assert get_offer_list_version() != version
+
+
+@pytest.mark.django_db
+def test_get_offers_counts_cache_hits_and_misses(api_client, business_user):
+    _create_offer_with_details(business_user, title="Cached")
+    api_client.get("/api/offers/")
+    api_client.get("/api/offers/")
+    api_client.get("/api/offers/?page=1")
+
+    out = StringIO()
+    call_command("offer_list_cache_stats", "--reset", stdout=out)
+
+    assert "1 hits, 2 misses (33% hit rate)" in out.getvalue()
+    assert get_offer_list_cache_stats() == {"hits": 0, "misses": 0}
+
+
+@pytest.mark.django_db
+def test_offer_list_cache_stats_are_shared_between_processes(
+    api_client, business_user, settings
+):
+    settings.OFFER_LIST_CACHE_STATS_FLUSH_EVERY = 2
+    _create_offer_with_details(business_user, title="Cached")
+    for _ in range(3):
+        api_client.get("/api/offers/")
+    api_client.get("/api/offers/?page=1")
+
+    # The management command runs in its own process with an empty local cache.
+    cache.clear()
+    out = StringIO()
+    call_command("offer_list_cache_stats", stdout=out)
+
+    # Both counters reached the flush size, so they are in the database.
+    assert "2 hits, 2 misses (50% hit rate)" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_get_offers_cache_can_be_disabled(api_client, business_user, settings):
+    settings.OFFER_LIST_CACHE_ENABLED = False
+    offer = _create_offer_with_details(business_user, title="Before")
+    api_client.get("/api/offers/")
+    Offer.objects.filter(pk=offer.pk).update(title="After")
+
+    response = api_client.get("/api/offers/")
+
+    assert response.data["results"][0]["title"] == "After"
+    assert get_offer_list_cache_stats() == {"hits": 0, "misses": 0}
+
+
+@pytest.mark.django_db(transaction=True)
+def test_get_offers_cache_is_invalidated_by_writes(api_client, business_user):
+    offer = _create_offer_with_details(business_user, title="Before")
+    assert api_client.get("/api/offers/").data["count"] == 1
+
+    offer.title = "After"
+    offer.save()
+    response = api_client.get("/api/offers/")
+    assert response.data["results"][0]["title"] == "After"
+
+    detail = offer.details.get(offer_type="basic")
+    detail.price = 1
+    detail.save()
+    response = api_client.get("/api/offers/")
+    assert response.data["results"][0]["min_price"] == 1
+
+    _create_offer_with_details(business_user, title="New")
+    assert api_client.get("/api/offers/").data["count"] == 2
+
+    offer.delete()
+    assert api_client.get("/api/offers/").data["count"] == 1
+
+
+def _three_details(price=100):
+    return [
+        {
+            "title": offer_type.title(),
+            "revisions": i,
+            "delivery_time_in_days": 10 - i,
+            "price": price * (i + 1),
+            "features": ["Logo"],
+            "offer_type": offer_type,
+        }
+        for i, offer_type in enumerate(["basic", "standard", "premium"])
+    ]
+
+
+@pytest.mark.django_db
+def test_offer_write_serializer_create_uses_constant_queries(
+    business_user,
+    django_assert_num_queries,
+):
+    request = SimpleNamespace(user=business_user, method="POST")
+    serializer = OfferWriteSerializer(
+        data={"title": "Bulk", "description": "x", "details": _three_details()},
+        context={"request": request},
+    )
+    assert serializer.is_valid(), serializer.errors
+
+    # savepoint, offer insert, platform stats update, bulk detail insert, release
+    with django_assert_num_queries(5):
+        offer = serializer.save()
+
+    offer.refresh_from_db()
+    assert offer.details.count() == 3
+    assert offer.min_price == 100
+    assert offer.min_delivery_time == 8
+
+
+@pytest.mark.django_db
+def test_offer_write_serializer_update_uses_constant_queries(
+    business_user,
+    django_assert_num_queries,
+):
+    offer = _create_offer_with_details(business_user, prices=(100, 200), days=(7, 3))
+    offer = Offer.objects.prefetch_related("details").get(pk=offer.pk)
+    serializer = OfferWriteSerializer(
+        offer,
+        data={
+            "details": [
+                {"offer_type": "basic", "price": 10},
+                {"offer_type": "standard", "price": 200, "delivery_time_in_days": 1},
+            ]
+        },
+        partial=True,
+    )
+    assert serializer.is_valid(), serializer.errors
+
+    # savepoint, bulk detail update, offer update, release
+    with django_assert_num_queries(4):
+        serializer.save()
+
+    offer.refresh_from_db()
+    assert offer.min_price == 10
+    assert offer.min_delivery_time == 1
+    assert offer.details.get(offer_type="standard").price == 200
+
+
+@pytest.mark.django_db
+def test_offer_create_failure_leaves_no_offer(api_client, business_user, monkeypatch):
+    def fail(*args, **kwargs):
+        raise IntegrityError("detail insert failed")
+
+    monkeypatch.setattr(OfferDetail.objects, "bulk_create", fail)
+    api_client.force_authenticate(user=business_user)
+    api_client.raise_request_exception = False
+
+    response = api_client.post(
+        "/api/offers/",
+        {"title": "Broken", "description": "x", "details": _three_details()},
+        format="json",
+    )
+
+    assert response.status_code == 500
+    assert Offer.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_offer_update_with_unknown_detail_changes_nothing(api_client, business_user):
+    offer = _create_offer_with_details(business_user, title="Original")
+    api_client.force_authenticate(user=business_user)
+
+    response = api_client.patch(
+        f"/api/offers/{offer.id}/",
+        {
+            "title": "Changed",
+            "details": [
+                {"offer_type": "basic", "price": 1},
+                {"offer_type": "premium", "price": 2},
+            ],
+        },
+        format="json",
+    )
+
+    assert response.status_code == 400
+    offer.refresh_from_db()
+    assert offer.title == "Original"
+    assert offer.details.get(offer_type="basic").price == 100
+
+
+@pytest.mark.django_db
+def test_get_offers_conditional_get(
+    api_client,
+    business_user,
+    django_assert_num_queries,
+    django_capture_on_commit_callbacks,
+):
+    offer = _create_offer_with_details(business_user)
+    response = api_client.get("/api/offers/")
+    etag = response["ETag"]
+
+    # The ETag only needs the stored list version.
+    with django_assert_num_queries(1):
+        response = api_client.get("/api/offers/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    assert response.content == b""
+
+    # A write from another process, e.g. import_offers, only reaches this
+    # one through the database, not through its local cache.
+    OfferListVersion.bump()
+    response = api_client.get("/api/offers/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    etag = response["ETag"]
+
+    response = api_client.get("/api/offers/?page_size=1", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+
+    with django_capture_on_commit_callbacks(execute=True):
+        business_user.first_name = "Renamed"
+        business_user.save()
+    response = api_client.get("/api/offers/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["results"][0]["user_details"]["first_name"] == "Renamed"
+    etag = response["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        offer.delete()
+    response = api_client.get("/api/offers/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_get_single_offer_conditional_get(api_client, business_user):
+    offer = _create_offer_with_details(business_user)
+    api_client.force_authenticate(user=business_user)
+
+    response = api_client.get(f"/api/offers/{offer.id}/")
+    etag = response["ETag"]
+    last_modified = response["Last-Modified"]
+
+    response = api_client.get(f"/api/offers/{offer.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+    response = api_client.get(
+        f"/api/offers/{offer.id}/",
+        HTTP_IF_MODIFIED_SINCE=last_modified,
+    )
+    assert response.status_code == 304
+
+    detail = offer.details.get(offer_type="basic")
+    detail.price = 5
+    detail.save()
+    response = api_client.get(f"/api/offers/{offer.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["min_price"] == 5
+
+
+@pytest.mark.django_db
+def test_get_offerdetail_conditional_get(api_client, business_user):
+    offer = _create_offer_with_details(business_user)
+    detail = offer.details.get(offer_type="basic")
+
+    response = api_client.get(f"/api/offerdetails/{detail.id}/", HTTP_IF_NONE_MATCH="*")
+    assert response.status_code == 401
+
+    api_client.force_authenticate(user=business_user)
+    response = api_client.get(f"/api/offerdetails/{detail.id}/")
+    etag = response["ETag"]
+
+    response = api_client.get(f"/api/offerdetails/{detail.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 304
+
+    detail.title = "Renamed"
+    detail.save()
+    response = api_client.get(f"/api/offerdetails/{detail.id}/", HTTP_IF_NONE_MATCH=etag)
+    assert response.status_code == 200
+    assert response.data["title"] == "Renamed"
+
+
+@pytest.mark.django_db
+def test_import_offers_jsonl_in_batches(business_user, tmp_path):
+    rows = [
+        {"title": f"Imported {i}", "description": "x", "details": _three_details(10 + i)}
+        for i in range(3)
+    ]
+    rows.insert(1, {"title": "Two tiers", "details": _three_details()[:2]})
+    path = tmp_path / "offers.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\nnot json\n")
+
+    version = OfferListVersion.get_version()
+
+    out, err = StringIO(), StringIO()
+    call_command(
+        "import_offers",
+        str(path),
+        user=business_user.username,
+        batch_size=2,
+        stdout=out,
+        stderr=err,
+    )
+
+    assert Offer.objects.count() == 3
+    assert OfferDetail.objects.count() == 9
+    assert Offer.objects.get(title="Imported 2").min_price == 12
+    assert "Row 2:" in err.getvalue()
+    assert "exactly 3 details" in err.getvalue()
+    assert "Row 5: Invalid JSON" in err.getvalue()
+    assert "Imported 3 offers, 2 rows failed" in out.getvalue()
+    assert "rows/s" in out.getvalue()
+    # Bumped in the database, so web workers in other processes see it.
+    assert OfferListVersion.get_version() == version + 2
+
+
+@pytest.mark.django_db
+def test_import_offers_csv(api_client, business_user, customer_user, tmp_path):
+    header = ["user", "title", "description"] + [
+        f"{offer_type}_{column}"
+        for offer_type in ("basic", "standard", "premium")
+        for column in ("title", "revisions", "delivery_time_in_days", "price", "features")
+    ]
+    tiers = ["Basic", "1", "5", "50", "Logo", "Std", "2", "4", "80", "Logo|Card",
+             "Pro", "3", "2", "150", "Logo|Card|Flyer"]
+    path = tmp_path / "offers.csv"
+    with path.open("w", newline="") as handle:
+        writer = csv.writer(handle)
+        writer.writerow(header)
+        writer.writerow([business_user.username, "Brand Kit", "CSV offer"] + tiers)
+        writer.writerow([customer_user.username, "Not allowed", ""] + tiers)
+
+    err = StringIO()
+    call_command("import_offers", str(path), stdout=StringIO(), stderr=err)
+
+    offer = Offer.objects.get()
+    assert offer.user == business_user
+    assert offer.min_delivery_time == 2
+    assert offer.details.get(offer_type="premium").features == ["Logo", "Card", "Flyer"]
+    assert "Row 3: Business user 'customer_test' not found." in err.getvalue()
+
+    response = api_client.get("/api/offers/?search=brand")
+    assert [item["id"] for item in response.data["results"]] == [offer.id]
+
+
+def _count_queries(captured):
+    return [q["sql"] for q in captured.captured_queries if "COUNT(" in q["sql"].upper()]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_get_offers_reuses_cached_count_per_filter_set(
+    api_client,
+    business_user,
+    django_assert_max_num_queries,
+):
+    for i in range(3):
+        _create_offer_with_details(business_user, title=f"Logo {i}")
+    _create_offer_with_details(business_user, title="Website")
+
+    first = api_client.get("/api/offers/?search=logo&page_size=2")
+    assert first.data["count"] == 3
+
+    with django_assert_max_num_queries(10) as captured:
+        second = api_client.get("/api/offers/?search=logo&page_size=2&page=2")
+    assert second.data["count"] == 3
+    assert len(second.data["results"]) == 1
+    assert _count_queries(captured) == []
+
+    _create_offer_with_details(business_user, title="Logo new")
+    assert api_client.get("/api/offers/?search=logo&page=2&page_size=2").data["count"] == 4
+
+
+@pytest.mark.django_db(transaction=True)
+def test_get_offers_unfiltered_count_uses_counter(
+    api_client,
+    business_user,
+    django_assert_max_num_queries,
+    tmp_path,
+):
+    first = _create_offer_with_details(business_user, title="One")
+    assert api_client.get("/api/offers/").data["count"] == 1
+
+    _create_offer_with_details(business_user, title="Two")
+    with django_assert_max_num_queries(10) as captured:
+        response = api_client.get("/api/offers/")
+    assert response.data["count"] == 2
+    assert _count_queries(captured) == []
+
+    path = tmp_path / "offers.jsonl"
+    path.write_text(json.dumps({"title": "Three", "details": _three_details()}))
+    call_command("import_offers", str(path), user=business_user.username, stdout=StringIO())
+    assert api_client.get("/api/offers/").data["count"] == 3
+
+    first.delete()
+    response = api_client.get("/api/offers/")
+    assert response.data["count"] == 2
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+def test_offer_detail_links_are_absolute_urls(api_client, business_user):
+    offer = _create_offer_with_details(business_user)
+    response = api_client.get("/api/offers/")
+
+    links = response.data["results"][0]["details"]
+    assert sorted(link["url"] for link in links) == sorted(
+        f"http://testserver/api/offerdetails/{detail.id}/" for detail in offer.details.all()
+    )
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
-from orders_app.models import Order
+from orders_app.models import BusinessOrderCounter, Order, OrderEvent
 
 
-admin.site.register(Order)
\ No newline at end of file
+admin.site.register(Order)
+admin.site.register(BusinessOrderCounter)
+admin.site.register(OrderEvent)
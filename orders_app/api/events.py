@@ -0,0 +1,276 @@
+import asyncio
+import json
+import threading
+from datetime import timedelta
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core import signing
+from django.db import transaction
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from orders_app.api.serializers import OrderSerializer
+from orders_app.models import OrderEvent
+
+
+class OrderEventBroker:
+    """
+    Wake up the event streams of this process when new events are committed.
+
+    The database stays the source of truth: streams re-read it after every
+    wake-up and every heartbeat, so events written by other processes are
+    delivered at the latest with the next heartbeat.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._waiters = set()
+        self.version = 0
+
+    def notify(self):
+        """
+        Wake up all waiting streams.
+        """
+        with self._lock:
+            self.version += 1
+            waiters = list(self._waiters)
+        for loop, event in waiters:
+            try:
+                loop.call_soon_threadsafe(event.set)
+            except RuntimeError:
+                # The loop of a disconnected stream is already closed.
+                pass
+
+    async def wait(self, since_version, timeout):
+        """
+        Wait until notify() was called after since_version or the timeout
+        expires. Return True when woken up.
+        """
+        event = asyncio.Event()
+        waiter = (asyncio.get_running_loop(), event)
+        with self._lock:
+            if self.version != since_version:
+                return True
+            self._waiters.add(waiter)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            with self._lock:
+                self._waiters.discard(waiter)
+
+
+broker = OrderEventBroker()
+
+
+def record_order_events(orders, event_type, previous_statuses=None):
+    """
+    Store one event per order and wake up the streams after commit.
+    """
+    previous_statuses = previous_statuses or {}
+    events = []
+    for order in orders:
+        payload = {"order": OrderSerializer(order).data}
+        if event_type == OrderEvent.TYPE_STATUS_CHANGED:
+            payload["previous_status"] = previous_statuses.get(order.pk)
+        events.append(
+            OrderEvent(
+                order_id=order.pk,
+                customer_user_id=order.customer_user_id,
+                business_user_id=order.business_user_id,
+                event_type=event_type,
+                payload=json.loads(json.dumps(payload, default=str)),
+            )
+        )
+    OrderEvent.objects.bulk_create(events)
+    transaction.on_commit(broker.notify)
+    return events
+
+
+# Stream tokens are signed with their own salt, so they cannot be used
+# anywhere else and no other signed value is accepted as one.
+STREAM_TOKEN_SALT = "orders_app.events.stream-token"
+
+
+def create_stream_token(user):
+    """
+    Return a short-lived signed token that only opens the event stream.
+    """
+    return signing.TimestampSigner(salt=STREAM_TOKEN_SALT).sign(str(user.pk))
+
+
+def get_stream_token_user_id(value):
+    """
+    Return the user id of a valid, unexpired stream token, or None.
+    """
+    try:
+        user_id = signing.TimestampSigner(salt=STREAM_TOKEN_SALT).unsign(
+            value, max_age=settings.ORDER_EVENTS_STREAM_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+    return int(user_id) if user_id.isdigit() else None
+
+
+async def get_stream_user(request):
+    """
+    Return the active user for the auth token in the Authorization header
+    or the stream token in ?stream_token=, which EventSource clients have
+    to use. The long-lived auth token is never accepted in the URL.
+    """
+    header = request.headers.get("Authorization", "")
+    scheme, _, key = header.partition(" ")
+    if scheme.lower() == "token" and key:
+        token = await Token.objects.select_related("user").filter(key=key.strip()).afirst()
+        if token is None or not token.user.is_active:
+            return None
+        return token.user
+
+    user_id = get_stream_token_user_id(request.GET.get("stream_token", ""))
+    if user_id is None:
+        return None
+    return await User.objects.filter(pk=user_id, is_active=True).afirst()
+
+
+def get_user_events(user, last_id, exclude_ids=()):
+    """
+    Return the events of the user after last_id, oldest first.
+    """
+    # Two index range scans glued with UNION ALL instead of OR. Events of
+    # self-orders are only taken from the customer side, so no row repeats.
+    as_customer = OrderEvent.objects.filter(customer_user=user, id__gt=last_id)
+    as_business = OrderEvent.objects.filter(business_user=user, id__gt=last_id).exclude(
+        customer_user=user
+    )
+    if exclude_ids:
+        as_customer = as_customer.exclude(id__in=exclude_ids)
+        as_business = as_business.exclude(id__in=exclude_ids)
+    return as_customer.order_by().union(as_business.order_by(), all=True).order_by("id")
+
+
+class OrderEventPosition:
+    """
+    Track how far a stream got.
+
+    Event ids are assigned when the row is inserted, not when it commits,
+    so an event with a lower id can become visible after a higher one was
+    sent. The position is therefore a floor, below which every event was
+    sent, plus the ids sent above it. The floor only moves past events
+    older than ORDER_EVENTS_LOOKBACK_SECONDS, whose lower ids have
+    committed by then. The position is sent as the event id, e.g. "41,43",
+    so a reconnecting client neither misses nor repeats events.
+    """
+
+    def __init__(self, floor=0, sent_ids=()):
+        self.floor = floor
+        # Event ids above the floor mapped to their created_at, or None
+        # for ids taken over from a resume token.
+        self.sent = {event_id: None for event_id in sent_ids if event_id > floor}
+
+    @classmethod
+    def from_token(cls, value):
+        """
+        Return the position of a "floor,id,..." token, or None if invalid.
+        """
+        try:
+            ids = [max(int(part), 0) for part in value.split(",")]
+        except (AttributeError, ValueError):
+            return None
+        return cls(ids[0], ids[1:])
+
+    def token(self):
+        """
+        Return the position as an event id.
+        """
+        return ",".join(str(event_id) for event_id in [self.floor, *sorted(self.sent)])
+
+    def add(self, event):
+        """
+        Record a sent event.
+        """
+        self.sent[event.id] = event.created_at
+
+    def settle(self, cutoff):
+        """
+        Move the floor to the newest sent event created before cutoff.
+
+        The cutoff has to be taken before the events were read, so every
+        lower id was committed and therefore read by then.
+        """
+        settled = [
+            event_id
+            for event_id, created_at in self.sent.items()
+            if created_at is not None and created_at <= cutoff
+        ]
+        if settled:
+            self.floor = max(self.floor, *settled)
+            self.sent = {
+                event_id: created_at
+                for event_id, created_at in self.sent.items()
+                if event_id > self.floor
+            }
+
+
+def get_resume_position(request):
+    """
+    Return the position to resume after, or None to start with new events.
+    """
+    raw = request.headers.get("Last-Event-ID") or request.GET.get("last_event_id")
+    return OrderEventPosition.from_token(raw)
+
+
+def format_event(event, position):
+    """
+    Return the event in text/event-stream format.
+    """
+    data = json.dumps({"type": event.event_type, **event.payload})
+    return f"id: {position.token()}\nevent: {event.event_type}\ndata: {data}\n\n"
+
+
+async def get_start_position(user, lookback):
+    """
+    Return the position of a new stream: every event that is visible now
+    counts as sent, later commits are new, even with a lower id.
+    """
+    floor = await OrderEvent.objects.filter(
+        created_at__lte=timezone.now() - lookback
+    ).order_by("-id").values_list("id", flat=True).afirst() or 0
+    position = OrderEventPosition(floor)
+    async for event in get_user_events(user, floor):
+        position.add(event)
+    return position
+
+
+async def stream_order_events(user, position):
+    """
+    Yield the events of the user after position, then wait for new ones.
+    """
+    lookback = timedelta(seconds=settings.ORDER_EVENTS_LOOKBACK_SECONDS)
+    if position is None:
+        position = await get_start_position(user, lookback)
+
+    batch_size = settings.ORDER_EVENTS_BATCH_SIZE
+    heartbeat = settings.ORDER_EVENTS_HEARTBEAT_SECONDS
+
+    yield f"retry: {settings.ORDER_EVENTS_RETRY_MS}\n\n"
+    while True:
+        version = broker.version
+        cutoff = timezone.now() - lookback
+        batch = [
+            event
+            async for event in get_user_events(
+                user, position.floor, list(position.sent)
+            )[:batch_size]
+        ]
+        for event in batch:
+            position.add(event)
+            position.settle(cutoff)
+            yield format_event(event, position)
+        position.settle(cutoff)
+        if len(batch) == batch_size:
+            continue
+        if not await broker.wait(version, heartbeat):
+            yield ": keep-alive\n\n"
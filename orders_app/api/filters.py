@@ -1,47 +1,164 @@
+from collections import Counter
+from decimal import Decimal
+
 from django.contrib.auth.models import User
-from django.db.models import Q
+from django.db import connection
+from django.db.models import F, Sum
+from django.db.models.functions import TruncMonth
+from django.utils import timezone
 
 from offers_app.models import OfferDetail
-from orders_app.models import Order
+from orders_app.models import (
+    ArchivedOrder,
+    BusinessDailyOrderStats,
+    BusinessOrderCounter,
+    Order,
+)
+from profiles_app.models import Profile
 
+# PostgreSQL can return the previous status from the locked row in the
+# same statement, so the whole transition is a single round trip.
+POSTGRES_STATUS_UPDATE_SQL = """
+    UPDATE orders_app_order
+    SET status = %s, updated_at = %s
+    FROM (
+        SELECT o.id, o.status
+        FROM orders_app_order o
+        JOIN profiles_app_profile p ON p.user_id = o.business_user_id
+        WHERE o.id = %s AND o.business_user_id = %s AND p.role = %s
+        FOR UPDATE OF o
+    ) AS old
+    WHERE orders_app_order.id = old.id
+    RETURNING orders_app_order.*, old.status AS old_status
+"""
 
-def get_user_orders(user):
-    """ Return orders where the user is customer or business user."""
-    return Order.objects.filter(
-        Q(customer_user=user) | Q(business_user=user)
-    ).distinct()
+# SQLite 3.35+ only returns the new row, so the update is made
+# conditional on the status read just before.
+SQLITE_STATUS_UPDATE_SQL = """
+    UPDATE orders_app_order
+    SET status = %s, updated_at = %s
+    WHERE id = %s AND status = %s
+    RETURNING *
+"""
 
 
-def business_user_exists(business_user_id):
-    """ Check whether the business user exists."""
-    return User.objects.filter(id=business_user_id).exists()
+def get_user_orders(user, *conditions):
+    """ Return orders where the user is customer or business user, newest first."""
+    # Two index range scans glued with UNION ALL instead of OR + DISTINCT.
+    # Self-orders are only taken from the customer side, so no row repeats.
+    as_customer = Order.objects.filter(customer_user=user, *conditions)
+    as_business = Order.objects.filter(business_user=user, *conditions).exclude(
+        customer_user=user
+    )
+    return as_customer.order_by().union(as_business.order_by(), all=True).order_by(
+        "-created_at", "-id"
+    )
 
 
-def get_in_progress_order_count(business_user_id):
-    """ Count in-progress orders for a business user."""
-    return Order.objects.filter(
-        business_user_id=business_user_id,
-        status=Order.STATUS_IN_PROGRESS,
-    ).count()
+def get_user_order_history(user, *conditions):
+    """ Return live and archived orders of the user as Order objects, newest first."""
+    branches = []
+    for model in (Order, ArchivedOrder):
+        as_customer = model.objects.filter(customer_user=user, *conditions)
+        as_business = model.objects.filter(business_user=user, *conditions).exclude(
+            customer_user=user
+        )
+        if model is ArchivedOrder:
+            # The archive mirrors the Order columns, only archived_at is extra.
+            as_customer = as_customer.defer("archived_at")
+            as_business = as_business.defer("archived_at")
+        branches += [as_customer.order_by(), as_business.order_by()]
+    return branches[0].union(*branches[1:], all=True).order_by("-created_at", "-id")
+
+
+def get_order_analytics(business_user, start, end, granularity):
+    """ Return order counts and revenue per day or month from the daily rollups."""
+    period = TruncMonth("date") if granularity == "month" else F("date")
+    rows = (
+        BusinessDailyOrderStats.objects.filter(
+            business_user=business_user, date__range=(start, end)
+        )
+        .annotate(period=period)
+        .values("period", "status")
+        .annotate(count=Sum("order_count"), total=Sum("revenue"))
+        .order_by("period", "status")
+    )
+
+    empty = {"order_count": 0, "revenue": Decimal(0)}
+    periods = {}
+    for row in rows:
+        statuses = periods.setdefault(
+            row["period"], {status: dict(empty) for status, _ in Order.STATUS_CHOICES}
+        )
+        statuses[row["status"]] = {
+            "order_count": row["count"],
+            "revenue": row["total"] or Decimal(0),
+        }
+
+    results = []
+    for day, statuses in periods.items():
+        # Cancelled orders count as orders but not as revenue.
+        revenue = sum(
+            values["revenue"]
+            for status, values in statuses.items()
+            if status != Order.STATUS_CANCELLED
+        )
+        results.append(
+            {
+                "period": day.isoformat(),
+                "order_count": sum(values["order_count"] for values in statuses.values()),
+                "revenue": _format_money(revenue),
+                "statuses": {
+                    status: {
+                        "order_count": values["order_count"],
+                        "revenue": _format_money(values["revenue"]),
+                    }
+                    for status, values in statuses.items()
+                },
+            }
+        )
+    return results
+
 
+def _format_money(value):
+    return str(Decimal(value).quantize(Decimal("0.01")))
 
-def get_completed_order_count(business_user_id):
-    """ Count completed orders for a business user."""
-    return Order.objects.filter(
+
+def get_business_order_counter(business_user_id):
+    """ Return the order counter of a user in one read-only query, or None if the user does not exist."""
+    fields = list(BusinessOrderCounter.STATUS_FIELDS.values())
+    row = (
+        User.objects.filter(id=business_user_id)
+        .values_list(*(f"order_counter__{field}" for field in fields))
+        .first()
+    )
+    if row is None:
+        return None
+    # Users without a counter row have no orders yet, so they count zero.
+    return BusinessOrderCounter(
         business_user_id=business_user_id,
-        status=Order.STATUS_COMPLETED,
-    ).count()
+        **{field: value or 0 for field, value in zip(fields, row)},
+    )
 
 
-def create_order_from_offer_detail(offer_detail_id, customer_user):
-    """ Create an order from the selected offer detail."""
-    offer_detail = OfferDetail.objects.select_related(
-        "offer",
-        "offer__user",
-    ).get(id=offer_detail_id)
+def get_business_order_counts(business_user_ids):
+    """ Return in-progress and completed counts for existing users in one query."""
+    rows = User.objects.filter(id__in=business_user_ids).values_list(
+        "id",
+        "order_counter__in_progress_count",
+        "order_counter__completed_count",
+    )
+    return {
+        user_id: {
+            "order_count": in_progress or 0,
+            "completed_order_count": completed or 0,
+        }
+        for user_id, in_progress, completed in rows
+    }
+
 
-    offer = offer_detail.offer
-    business_user = offer.user
+def build_order_from_offer_detail(offer_detail, customer_user):
+    """ Return an unsaved order copying the data of the offer detail."""
     title = offer_detail.title or ""
 
     raw_revisions = getattr(offer_detail, "revisions", 0)
@@ -68,9 +185,9 @@ def create_order_from_offer_detail(offer_detail_id, customer_user):
     features = getattr(offer_detail, "features", []) or []
     offer_type = getattr(offer_detail, "offer_type", "basic") or "basic"
 
-    return Order.objects.create(
+    return Order(
         customer_user=customer_user,
-        business_user=business_user,
+        business_user_id=offer_detail.offer.user_id,
         offer_detail=offer_detail,
         title=title,
         revisions=revisions,
@@ -79,4 +196,90 @@ def create_order_from_offer_detail(offer_detail_id, customer_user):
         features=features,
         offer_type=offer_type,
         status=Order.STATUS_IN_PROGRESS,
-    )
\ No newline at end of file
+    )
+
+
+def create_order_from_offer_detail(offer_detail_id, customer_user):
+    """ Create an order from the selected offer detail."""
+    offer_detail = OfferDetail.objects.select_related("offer").get(id=offer_detail_id)
+    order = build_order_from_offer_detail(offer_detail, customer_user)
+    order.save()
+    return order
+
+
+def get_offer_details_by_id(offer_detail_ids):
+    """ Return the offer details with their offers for the given ids in one query."""
+    return OfferDetail.objects.select_related("offer").in_bulk(set(offer_detail_ids))
+
+
+def create_orders_from_offer_details(offer_details, customer_user):
+    """ Create one order per offer detail with a single bulk insert, inside a transaction."""
+    orders = [
+        build_order_from_offer_detail(offer_detail, customer_user)
+        for offer_detail in offer_details
+    ]
+    Order.objects.bulk_create(orders)
+
+    # bulk_create does not send signals, so count the orders here.
+    per_business_user = Counter(order.business_user_id for order in orders)
+    for business_user_id, count in per_business_user.items():
+        BusinessOrderCounter.apply_status_change(
+            business_user_id, new_status=Order.STATUS_IN_PROGRESS, count=count
+        )
+
+    per_day = {}
+    for order in orders:
+        key = (order.business_user_id, BusinessDailyOrderStats.order_date(order))
+        count, revenue = per_day.get(key, (0, Decimal(0)))
+        per_day[key] = (count + 1, revenue + Decimal(str(order.price)))
+    for (business_user_id, date), (count, revenue) in per_day.items():
+        BusinessDailyOrderStats.apply_status_change(
+            business_user_id,
+            date,
+            new_status=Order.STATUS_IN_PROGRESS,
+            count=count,
+            revenue=revenue,
+        )
+    return orders
+
+
+def update_order_status(order_id, business_user, new_status, attempts=3):
+    """ Change the status of a business user's order, return (order, old_status) or None."""
+    updated_at = connection.ops.adapt_datetimefield_value(timezone.now())
+    if connection.vendor == "postgresql":
+        rows = list(
+            Order.objects.raw(
+                POSTGRES_STATUS_UPDATE_SQL,
+                [new_status, updated_at, order_id, business_user.id, Profile.ROLE_BUSINESS],
+            )
+        )
+        return (rows[0], rows[0].old_status) if rows else None
+
+    owned = Order.objects.filter(
+        pk=order_id,
+        business_user=business_user,
+        business_user__profile__role=Profile.ROLE_BUSINESS,
+    )
+    for _ in range(attempts):
+        old_status = owned.values_list("status", flat=True).first()
+        if old_status is None:
+            return None
+        order = _update_order_status_if_unchanged(order_id, old_status, new_status, updated_at)
+        if order is not None:
+            return order, old_status
+    return None
+
+
+def _update_order_status_if_unchanged(order_id, old_status, new_status, updated_at):
+    if connection.vendor == "sqlite" and connection.Database.sqlite_version_info >= (3, 35):
+        rows = list(
+            Order.objects.raw(
+                SQLITE_STATUS_UPDATE_SQL, [new_status, updated_at, order_id, old_status]
+            )
+        )
+        return rows[0] if rows else None
+
+    updated = Order.objects.filter(pk=order_id, status=old_status).update(
+        status=new_status, updated_at=timezone.now()
+    )
+    return Order.objects.get(pk=order_id) if updated else None
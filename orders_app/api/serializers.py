@@ -2,9 +2,16 @@ from django.db import IntegrityError
 from rest_framework import serializers
 
 from offers_app.models import OfferDetail
-from orders_app.api.filters import create_order_from_offer_detail
+from orders_app.api.filters import (
+    create_order_from_offer_detail,
+    create_orders_from_offer_details,
+    get_offer_details_by_id,
+)
 from orders_app.models import Order
 
+# Upper limit for offer_detail_ids in one batch order request.
+MAX_ORDER_BATCH_SIZE = 20
+
 
 class OrderSerializer(serializers.ModelSerializer):
     """
@@ -40,17 +47,12 @@ class OrderCreateSerializer(serializers.Serializer):
 
     offer_detail_id = serializers.IntegerField(write_only=True)
 
-    def validate_offer_detail_id(self, value: int) -> int:
-        """
-        Ensure that the referenced offer detail exists.
-        """
-        if not OfferDetail.objects.filter(id=value).exists():
-            raise serializers.ValidationError("OfferDetail not found.")
-        return value
-
     def create(self, validated_data):
         """
         Create a new order using extracted business logic.
+
+        The offer detail is loaded only once, so a missing one is
+        reported from the lookup instead of a separate exists() check.
         """
         request = self.context["request"]
 
@@ -59,6 +61,52 @@ class OrderCreateSerializer(serializers.Serializer):
                 validated_data["offer_detail_id"],
                 request.user,
             )
+        except OfferDetail.DoesNotExist:
+            raise serializers.ValidationError(
+                {"offer_detail_id": ["OfferDetail not found."]}
+            )
+        except IntegrityError:
+            raise serializers.ValidationError(
+                {"detail": "Invalid order data."}
+            )
+
+
+class OrderBatchCreateSerializer(serializers.Serializer):
+    """
+    Validate a list of offer detail ids and create one order per id
+    in a single transaction.
+    """
+
+    offer_detail_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=MAX_ORDER_BATCH_SIZE,
+        write_only=True,
+    )
+
+    def validate_offer_detail_ids(self, value):
+        """
+        Load all referenced offer details with one query.
+        """
+        self.offer_details = get_offer_details_by_id(value)
+        missing = sorted(set(value) - self.offer_details.keys())
+        if missing:
+            raise serializers.ValidationError(
+                f"OfferDetail not found: {', '.join(str(pk) for pk in missing)}."
+            )
+        return value
+
+    def create(self, validated_data):
+        """
+        Create the orders in the order of the submitted ids.
+        """
+        request = self.context["request"]
+        offer_details = [
+            self.offer_details[pk] for pk in validated_data["offer_detail_ids"]
+        ]
+
+        try:
+            return create_orders_from_offer_details(offer_details, request.user)
         except IntegrityError:
             raise serializers.ValidationError(
                 {"detail": "Invalid order data."}
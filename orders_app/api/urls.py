@@ -1,13 +1,27 @@
 from django.urls import path
 from orders_app.api.views import (
+    OrderBatchCreateView,
     OrderListCreateView,
     OrderPatchDeleteView,
     OrderCountView,
     CompletedOrderCountView,
+    OrderAnalyticsView,
+    OrderCountBatchView,
+    OrderEventStreamTokenView,
+    OrderEventStreamView,
+    OrderHistoryView,
 )
 
 urlpatterns = [
     path("orders/", OrderListCreateView.as_view(), name="orders-list-create"),
+    path("orders/batch/", OrderBatchCreateView.as_view(), name="orders-batch-create"),
+    path("orders/history/", OrderHistoryView.as_view(), name="orders-history"),
+    path("orders/events/", OrderEventStreamView.as_view(), name="orders-events"),
+    path(
+        "orders/events/token/",
+        OrderEventStreamTokenView.as_view(),
+        name="orders-events-token",
+    ),
     path("orders/<int:pk>/", OrderPatchDeleteView.as_view(), name="orders-patch-delete"),
     path("order-count/<int:business_user_id>/", OrderCountView.as_view(), name="order-count"),
     path(
@@ -15,4 +29,6 @@ urlpatterns = [
         CompletedOrderCountView.as_view(),
         name="completed-order-count",
     ),
+    path("order-counts/", OrderCountBatchView.as_view(), name="order-counts"),
+    path("analytics/orders/", OrderAnalyticsView.as_view(), name="order-analytics"),
 ]
\ No newline at end of file
@@ -1,29 +1,94 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from django.views import View
 from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 
+from core.api.pagination import CursorPaginationOptInMixin, KeysetPagination
+from orders_app.api.events import (
+    create_stream_token,
+    get_resume_position,
+    get_stream_user,
+    record_order_events,
+    stream_order_events,
+)
 from orders_app.api.filters import (
-    business_user_exists,
-    get_in_progress_order_count,
-    get_completed_order_count,
+    get_business_order_counter,
+    get_business_order_counts,
+    get_order_analytics,
+    get_user_order_history,
     get_user_orders,
+    update_order_status,
 )
 from orders_app.api.permissions import IsBusinessUser, IsCustomerUser
 from orders_app.api.serializers import (
+    OrderBatchCreateSerializer,
     OrderCreateSerializer,
     OrderSerializer,
     OrderStatusUpdateSerializer,
 )
-from orders_app.models import Order
+from orders_app.models import (
+    BusinessDailyOrderStats,
+    BusinessOrderCounter,
+    Order,
+    OrderEvent,
+)
+
+# Upper limit for business_user_ids in one order-counts request.
+MAX_ORDER_COUNT_BATCH_SIZE = 100
+
+# Longest date range, in days, accepted by the order analytics endpoint.
+MAX_ANALYTICS_RANGE_DAYS = 731
+ANALYTICS_DEFAULT_DAYS = 30
+
+
+class OrderCursorPagination(KeysetPagination):
+    """
+    Keyset pagination over the user's orders, newest first.
+    Requested with ?pagination=cursor; without it the list stays
+    unpaginated for existing clients.
+    """
+
+    page_size = 20
+    max_page_size = 100
+    ordering = ("-created_at",)
+    get_orders = staticmethod(get_user_orders)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.user = request.user
+        return super().paginate_queryset(queryset, request, view)
+
+    def apply_position(self, queryset, condition):
+        """
+        Push the cursor condition into every branch of the union,
+        because a combined queryset cannot be filtered afterwards.
+        """
+        return self.get_orders(self.user, condition)
+
+
+class OrderHistoryCursorPagination(OrderCursorPagination):
+    """
+    Keyset pagination over live and archived orders.
+    """
+
+    get_orders = staticmethod(get_user_order_history)
 
 
-class OrderListCreateView(generics.ListCreateAPIView):
+class OrderListCreateView(CursorPaginationOptInMixin, generics.ListCreateAPIView):
     """
     List all orders related to the authenticated user
     or create a new order as a customer.
     """
 
     permission_classes = [IsAuthenticated]
+    pagination_class = None
+    cursor_pagination_class = OrderCursorPagination
 
     def get_queryset(self):
         """
@@ -61,6 +126,54 @@ class OrderListCreateView(generics.ListCreateAPIView):
         )
 
 
+class OrderHistoryView(generics.ListAPIView):
+    """
+    List all orders of the authenticated user including archived ones.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = OrderSerializer
+    pagination_class = OrderHistoryCursorPagination
+
+    def get_queryset(self):
+        """
+        Return live and archived orders where the current user is
+        either the customer or the business user.
+        """
+        return get_user_order_history(self.request.user)
+
+
+class OrderBatchCreateView(generics.GenericAPIView):
+    """
+    Create several orders at once as a customer.
+    """
+
+    permission_classes = [IsAuthenticated]
+    serializer_class = OrderBatchCreateSerializer
+
+    def post(self, request, *args, **kwargs):
+        """
+        Create one order per offer detail id, all or nothing.
+        """
+        permission = IsCustomerUser()
+        if not permission.has_permission(request, self):
+            return Response(
+                {"detail": "Not allowed."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            orders = serializer.save()
+            record_order_events(orders, OrderEvent.TYPE_CREATED)
+
+        return Response(
+            OrderSerializer(orders, many=True).data,
+            status=status.HTTP_201_CREATED,
+        )
+
+
 class OrderPatchDeleteView(generics.GenericAPIView):
     """
     Update the status of an order as the assigned business user
@@ -74,6 +187,56 @@ class OrderPatchDeleteView(generics.GenericAPIView):
         """
         Update the status of an order.
         Only the assigned business user is allowed to perform this action.
+
+        The transition is one conditional UPDATE on the order id, the
+        business user and the role, so the usual case needs no separate
+        reads. The 404 and 403 checks only run when it does not match.
+        """
+        serializer = OrderStatusUpdateSerializer(data=request.data)
+        if "status" not in request.data or not serializer.is_valid():
+            denied = self.get_denied_response(request)
+            if denied is not None:
+                return denied
+            if "status" not in request.data:
+                return Response(
+                    {"status": ["This field is required."]},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            serializer.is_valid(raise_exception=True)
+
+        new_status = serializer.validated_data["status"]
+        with transaction.atomic():
+            result = update_order_status(kwargs["pk"], request.user, new_status)
+            if result is not None:
+                order, old_status = result
+                BusinessOrderCounter.apply_status_change(
+                    order.business_user_id, old_status=old_status, new_status=new_status
+                )
+                BusinessDailyOrderStats.apply_status_change(
+                    order.business_user_id,
+                    BusinessDailyOrderStats.order_date(order),
+                    old_status=old_status,
+                    new_status=new_status,
+                    revenue=order.price,
+                )
+                if old_status != new_status:
+                    record_order_events(
+                        [order],
+                        OrderEvent.TYPE_STATUS_CHANGED,
+                        previous_statuses={order.pk: old_status},
+                    )
+
+        if result is None:
+            return self.get_denied_response(request) or Response(
+                {"detail": "Not allowed."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return Response(OrderSerializer(order).data, status=status.HTTP_200_OK)
+
+    def get_denied_response(self, request):
+        """
+        Return the 404 or 403 response for a status update, or None
+        if the user may change the order.
         """
         order = self.get_object()
         permission = IsBusinessUser()
@@ -84,24 +247,12 @@ class OrderPatchDeleteView(generics.GenericAPIView):
                 status=status.HTTP_403_FORBIDDEN,
             )
 
-        if order.business_user != request.user:
+        if order.business_user_id != request.user.id:
             return Response(
                 {"detail": "Not allowed."},
                 status=status.HTTP_403_FORBIDDEN,
             )
-
-        if "status" not in request.data:
-            return Response(
-                {"status": ["This field is required."]},
-                status=status.HTTP_400_BAD_REQUEST,
-            )
-
-        serializer = OrderStatusUpdateSerializer(order, data=request.data)
-        serializer.is_valid(raise_exception=True)
-        serializer.save()
-
-        order.refresh_from_db()
-        return Response(OrderSerializer(order).data, status=status.HTTP_200_OK)
+        return None
 
     def delete(self, request, *args, **kwargs):
         """
@@ -130,16 +281,15 @@ class OrderCountView(generics.GenericAPIView):
         """
         Return the count of active orders for the given business user.
         """
-        if not business_user_exists(business_user_id):
+        counter = get_business_order_counter(business_user_id)
+        if counter is None:
             return Response(
                 {"detail": "Business user not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        order_count = get_in_progress_order_count(business_user_id)
-
         return Response(
-            {"order_count": order_count},
+            {"order_count": counter.in_progress_count},
             status=status.HTTP_200_OK,
         )
 
@@ -155,15 +305,177 @@ class CompletedOrderCountView(generics.GenericAPIView):
         """
         Return the count of completed orders for the given business user.
         """
-        if not business_user_exists(business_user_id):
+        counter = get_business_order_counter(business_user_id)
+        if counter is None:
             return Response(
                 {"detail": "Business user not found."},
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        completed_order_count = get_completed_order_count(business_user_id)
+        return Response(
+            {"completed_order_count": counter.completed_count},
+            status=status.HTTP_200_OK,
+        )
+
+
+class OrderCountBatchView(generics.GenericAPIView):
+    """
+    Return in-progress and completed order counts for several
+    business users at once.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Return the counts for a comma separated business_user_ids list
+        of at most MAX_ORDER_COUNT_BATCH_SIZE ids. Unknown ids are omitted.
+        """
+        business_user_ids, error = self.parse_business_user_ids(request)
+        if error:
+            return Response(
+                {"business_user_ids": [error]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        counts = get_business_order_counts(business_user_ids)
+        data = {
+            str(user_id): counts[user_id]
+            for user_id in business_user_ids
+            if user_id in counts
+        }
+        return Response(data, status=status.HTTP_200_OK)
+
+    def parse_business_user_ids(self, request):
+        """
+        Return the unique requested ids in order and an error message.
+        """
+        raw = ",".join(request.query_params.getlist("business_user_ids"))
+        parts = [part.strip() for part in raw.split(",") if part.strip()]
+        if not parts:
+            return [], "This field is required."
+        if not all(part.isdigit() for part in parts):
+            return [], "Expected a comma separated list of ids."
+
+        business_user_ids = list(dict.fromkeys(int(part) for part in parts))
+        if len(business_user_ids) > MAX_ORDER_COUNT_BATCH_SIZE:
+            return [], f"Ensure there are no more than {MAX_ORDER_COUNT_BATCH_SIZE} ids."
+        return business_user_ids, None
+
 
+class OrderAnalyticsView(generics.GenericAPIView):
+    """
+    Return order volume and revenue per day or month for the
+    authenticated business user, read from the daily rollups.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        """
+        Accept from and to (YYYY-MM-DD, inclusive, default the last
+        30 days) and granularity (day or month). Periods without
+        orders are left out.
+        """
+        permission = IsBusinessUser()
+        if not permission.has_permission(request, self):
+            return Response(
+                {"detail": "Not allowed."},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+
+        params, errors = self.parse_params(request)
+        if errors:
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        results = get_order_analytics(request.user, **params)
         return Response(
-            {"completed_order_count": completed_order_count},
+            {
+                "from": params["start"].isoformat(),
+                "to": params["end"].isoformat(),
+                "granularity": params["granularity"],
+                "results": results,
+            },
             status=status.HTTP_200_OK,
-        )
\ No newline at end of file
+        )
+
+    def parse_params(self, request):
+        """
+        Return the validated date range and granularity and any errors.
+        """
+        errors = {}
+        dates = {}
+        for name in ("from", "to"):
+            raw = request.query_params.get(name)
+            if raw is None:
+                continue
+            try:
+                dates[name] = parse_date(raw)
+            except ValueError:
+                dates[name] = None
+            if dates[name] is None:
+                errors[name] = ["Enter a valid date (YYYY-MM-DD)."]
+
+        granularity = request.query_params.get("granularity", "day")
+        if granularity not in ("day", "month"):
+            errors["granularity"] = ["Expected day or month."]
+        if errors:
+            return None, errors
+
+        end = dates.get("to") or timezone.localdate()
+        start = dates.get("from") or end - timedelta(days=ANALYTICS_DEFAULT_DAYS - 1)
+        if start > end:
+            return None, {"from": ["Must not be after to."]}
+        if (end - start).days >= MAX_ANALYTICS_RANGE_DAYS:
+            return None, {
+                "from": [f"Ensure the range is at most {MAX_ANALYTICS_RANGE_DAYS} days."]
+            }
+        return {"start": start, "end": end, "granularity": granularity}, None
+
+
+class OrderEventStreamTokenView(generics.GenericAPIView):
+    """
+    Issue a short-lived token that only opens the order event stream.
+    """
+
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        """
+        Return a stream token for ?stream_token=, so EventSource clients
+        do not have to put their auth token in the URL.
+        """
+        return Response(
+            {
+                "stream_token": create_stream_token(request.user),
+                "expires_in": settings.ORDER_EVENTS_STREAM_TOKEN_MAX_AGE,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+
+class OrderEventStreamView(View):
+    """
+    Stream order create and status change events of the authenticated
+    user as Server-Sent Events. Needs an ASGI server (core/asgi.py).
+    """
+
+    async def get(self, request):
+        """
+        Authenticate with the Authorization header or ?stream_token= and
+        resume after the Last-Event-ID header or ?last_event_id= when given.
+        """
+        user = await get_stream_user(request)
+        if user is None:
+            return JsonResponse(
+                {"detail": "Authentication credentials were not provided."},
+                status=status.HTTP_401_UNAUTHORIZED,
+            )
+
+        response = StreamingHttpResponse(
+            stream_order_events(user, get_resume_position(request)),
+            content_type="text/event-stream",
+        )
+        response["Cache-Control"] = "no-cache"
+        response["X-Accel-Buffering"] = "no"
+        return response
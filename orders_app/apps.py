@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class OrdersAppConfig(AppConfig):
     name = 'orders_app'
+
+    def ready(self):
+        from orders_app import signals  # noqa: F401
@@ -0,0 +1,81 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from orders_app.models import ArchivedOrder, Order, OrderEvent
+from orders_app.signals import archiving_orders
+
+
+class Command(BaseCommand):
+    help = (
+        "Move completed and cancelled orders that have not changed for a "
+        "while from the order table to the archive, in batches."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            default=settings.ORDER_ARCHIVE_AFTER_DAYS,
+            help="Archive orders whose last change is older than this.",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only count the orders that would be archived.",
+        )
+
+    def handle(self, *args, **options):
+        if options["older_than_days"] < 0:
+            raise CommandError("--older-than-days must not be negative.")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        cutoff = timezone.now() - timedelta(days=options["older_than_days"])
+        candidates = Order.objects.filter(
+            status__in=ArchivedOrder.ARCHIVABLE_STATUSES,
+            updated_at__lt=cutoff,
+        )
+
+        if options["dry_run"]:
+            self.stdout.write(f"{candidates.count()} orders would be archived.")
+            return
+
+        archived = batches = 0
+        while True:
+            moved = self.archive_batch(candidates, options["batch_size"])
+            if not moved:
+                break
+            archived += moved
+            batches += 1
+            self.stdout.write(f"Archived {archived} orders...")
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Archived {archived} orders in {batches} batches.")
+        )
+
+    def archive_batch(self, candidates, batch_size):
+        """
+        Copy one batch of orders to the archive and delete them in a
+        single transaction. Return the number of moved orders.
+        """
+        with transaction.atomic():
+            orders = list(
+                candidates.select_for_update().order_by("id")[:batch_size]
+            )
+            if not orders:
+                return 0
+            ids = [order.id for order in orders]
+
+            ArchivedOrder.objects.bulk_create(
+                [ArchivedOrder.from_order(order) for order in orders]
+            )
+            # Stream events of archived orders are long past their use.
+            OrderEvent.objects.filter(order_id__in=ids).delete()
+            with archiving_orders():
+                Order.objects.filter(id__in=ids).delete()
+        return len(orders)
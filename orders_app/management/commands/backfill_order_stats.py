@@ -0,0 +1,104 @@
+from datetime import datetime, time, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import Count, Max, Min, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from orders_app.models import ArchivedOrder, BusinessDailyOrderStats, Order
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the daily order rollups from the live and archived orders, "
+        "one chunk of days per transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-days", type=int, default=30)
+        parser.add_argument("--from", dest="start", help="First day (YYYY-MM-DD).")
+        parser.add_argument("--to", dest="end", help="Last day (YYYY-MM-DD).")
+
+    def handle(self, *args, **options):
+        if options["chunk_days"] < 1:
+            raise CommandError("--chunk-days must be at least 1.")
+
+        start, end = self.get_range(options)
+        if start is None:
+            self.stdout.write(self.style.SUCCESS("No orders to aggregate."))
+            return
+
+        chunk = timedelta(days=options["chunk_days"])
+        rows = 0
+        day = start
+        while day <= end:
+            last = min(day + chunk - timedelta(days=1), end)
+            rows += self.rebuild_chunk(day, last)
+            self.stdout.write(f"Rebuilt {day} to {last}.")
+            day = last + timedelta(days=1)
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Rebuilt daily order stats from {start} to {end}: {rows} rows.")
+        )
+
+    def get_range(self, options):
+        """
+        Return the first and last day to rebuild, by default all days with orders.
+        """
+        dates = {}
+        for name in ("start", "end"):
+            if options[name]:
+                dates[name] = parse_date(options[name])
+                if dates[name] is None:
+                    raise CommandError(f"Invalid date: {options[name]}")
+
+        if len(dates) < 2:
+            bounds = [
+                model.objects.aggregate(first=Min("created_at"), last=Max("created_at"))
+                for model in (Order, ArchivedOrder)
+            ]
+            firsts = [bound["first"] for bound in bounds if bound["first"]]
+            lasts = [bound["last"] for bound in bounds if bound["last"]]
+            if not firsts:
+                return None, None
+            dates.setdefault("start", timezone.localdate(min(firsts)))
+            dates.setdefault("end", timezone.localdate(max(lasts)))
+        return dates["start"], dates["end"]
+
+    def rebuild_chunk(self, first, last):
+        """
+        Replace the rollups of the days first to last in one transaction.
+        """
+        begin = timezone.make_aware(datetime.combine(first, time.min))
+        stop = timezone.make_aware(datetime.combine(last + timedelta(days=1), time.min))
+
+        with transaction.atomic():
+            totals = {}
+            for model in (Order, ArchivedOrder):
+                rows = (
+                    model.objects.filter(created_at__gte=begin, created_at__lt=stop)
+                    .order_by()
+                    .values("business_user_id", "status", day=TruncDate("created_at"))
+                    .annotate(order_count=Count("id"), revenue=Sum("price"))
+                )
+                for row in rows:
+                    key = (row["business_user_id"], row["day"], row["status"])
+                    count, revenue = totals.get(key, (0, 0))
+                    totals[key] = (count + row["order_count"], revenue + row["revenue"])
+
+            BusinessDailyOrderStats.objects.filter(date__range=(first, last)).delete()
+            BusinessDailyOrderStats.objects.bulk_create(
+                [
+                    BusinessDailyOrderStats(
+                        business_user_id=business_user_id,
+                        date=day,
+                        status=status,
+                        order_count=count,
+                        revenue=revenue,
+                    )
+                    for (business_user_id, day, status), (count, revenue) in totals.items()
+                ]
+            )
+        return len(totals)
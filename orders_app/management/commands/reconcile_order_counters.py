@@ -0,0 +1,17 @@
+from core.management.base import ReconcileCommand
+from orders_app.models import BusinessOrderCounter
+
+
+class Command(ReconcileCommand):
+    help = (
+        "Compare the per-business order counters with the orders table "
+        "and fix every counter that has drifted."
+    )
+    model = BusinessOrderCounter
+    item_name = "counters"
+
+    def count_expected(self):
+        return BusinessOrderCounter.count_orders()
+
+    def get_empty_values(self):
+        return {field: 0 for field in BusinessOrderCounter.STATUS_FIELDS.values()}
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.2 on 2026-10-18 19:44
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q
+
+
+def backfill_order_counters(apps, schema_editor):
+    """
+    Create a counter row for every business user with orders.
+    """
+    Order = apps.get_model("orders_app", "Order")
+    BusinessOrderCounter = apps.get_model("orders_app", "BusinessOrderCounter")
+
+    rows = (
+        Order.objects.order_by()
+        .values("business_user_id")
+        .annotate(
+            in_progress_count=Count("id", filter=Q(status="in_progress")),
+            completed_count=Count("id", filter=Q(status="completed")),
+            cancelled_count=Count("id", filter=Q(status="cancelled")),
+        )
+    )
+    BusinessOrderCounter.objects.bulk_create(
+        [BusinessOrderCounter(**row) for row in rows]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('orders_app', '0003_alter_order_status'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessOrderCounter',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='order_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('in_progress_count', models.IntegerField(default=0)),
+                ('completed_count', models.IntegerField(default=0)),
+                ('cancelled_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_order_counters, migrations.RunPython.noop),
+    ]
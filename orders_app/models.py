@@ -1,8 +1,25 @@
+from decimal import Decimal
+
 from django.conf import settings
-from django.db import models
+from django.db import IntegrityError, connection, models, transaction
+from django.db.models import Count, F, Q
+from django.utils import timezone
+
+from core.models import LoadedValuesMixin
+from profiles_app.models import Profile
+
+# Adds to a daily rollup row in one statement, creating it if needed.
+DAILY_ORDER_STATS_UPSERT_SQL = """
+    INSERT INTO orders_app_businessdailyorderstats
+        (business_user_id, date, status, order_count, revenue)
+    VALUES (%s, %s, %s, %s, %s)
+    ON CONFLICT (business_user_id, date, status) DO UPDATE SET
+        order_count = orders_app_businessdailyorderstats.order_count + excluded.order_count,
+        revenue = orders_app_businessdailyorderstats.revenue + excluded.revenue
+"""
 
 
-class Order(models.Model):
+class Order(LoadedValuesMixin, models.Model):
     """
     Store a customer order created from an offer detail.
     """
@@ -50,9 +67,406 @@ class Order(models.Model):
 
     class Meta:
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["customer_user", "-created_at"],
+                name="order_customer_created_idx",
+            ),
+            models.Index(
+                fields=["business_user", "-created_at"],
+                name="order_business_created_idx",
+            ),
+            models.Index(
+                fields=["business_user", "status"],
+                name="order_business_status_idx",
+            ),
+        ]
 
     def __str__(self) -> str:
         """
         Return a readable label for the order.
         """
-        return f"Order #{self.pk} ({self.status})"
\ No newline at end of file
+        return f"Order #{self.pk} ({self.status})"
+
+    def save(self, *args, **kwargs):
+        """
+        Save the order and remember the status the row had before.
+
+        The status is moved in the database first, so the counters follow
+        the real row transition even when two saves start from the same
+        loaded state.
+        """
+        update_fields = kwargs.get("update_fields")
+        self.previous_status = None
+        if self._state.adding or (update_fields is not None and "status" not in update_fields):
+            super().save(*args, **kwargs)
+            return
+        with transaction.atomic():
+            self.previous_status = self.move_status()
+            super().save(*args, **kwargs)
+
+    def move_status(self):
+        """
+        Write the current status to the row and return the status it replaced.
+
+        The common case is one conditional UPDATE from the loaded status.
+        If the row changed since it was loaded, it is locked and re-read.
+        """
+        orders = Order.objects.filter(pk=self.pk)
+        old_status = self.get_loaded_value("status")
+        if old_status is not None and orders.filter(status=old_status).update(status=self.status):
+            return old_status
+
+        old_status = orders.select_for_update().values_list("status", flat=True).first()
+        orders.update(status=self.status)
+        return old_status
+
+
+class ArchivedOrder(models.Model):
+    """
+    Store a completed or cancelled order moved out of the hot order table.
+
+    The columns mirror Order in the same order and keep the original id,
+    so history queries can combine both tables with UNION ALL.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+    customer_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_customer_orders",
+    )
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="archived_business_orders",
+    )
+    offer_detail = models.ForeignKey(
+        "offers_app.OfferDetail",
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name="archived_orders",
+    )
+
+    title = models.CharField(max_length=255)
+    revisions = models.PositiveIntegerField(default=0)
+    delivery_time_in_days = models.PositiveIntegerField(default=0)
+    price = models.DecimalField(max_digits=10, decimal_places=2, default=0)
+    features = models.JSONField(default=list, blank=True)
+    offer_type = models.CharField(max_length=50, default="basic")
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    ARCHIVABLE_STATUSES = (Order.STATUS_COMPLETED, Order.STATUS_CANCELLED)
+
+    class Meta:
+        ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["customer_user", "-created_at"],
+                name="archived_customer_created_idx",
+            ),
+            models.Index(
+                fields=["business_user", "-created_at"],
+                name="archived_business_created_idx",
+            ),
+            models.Index(
+                fields=["business_user", "status"],
+                name="archived_business_status_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a readable label for the archived order.
+        """
+        return f"Archived order #{self.pk} ({self.status})"
+
+    @classmethod
+    def from_order(cls, order):
+        """
+        Return an unsaved archive row with the data of the order.
+        """
+        return cls(
+            **{
+                field.attname: getattr(order, field.attname)
+                for field in Order._meta.concrete_fields
+            }
+        )
+
+
+class BusinessOrderCounter(models.Model):
+    """
+    Store the number of orders per status for a business user.
+
+    The counters are updated with F() expressions on every order
+    write and can be rebuilt from the orders table at any time.
+    """
+
+    STATUS_FIELDS = {
+        Order.STATUS_IN_PROGRESS: "in_progress_count",
+        Order.STATUS_COMPLETED: "completed_count",
+        Order.STATUS_CANCELLED: "cancelled_count",
+    }
+
+    business_user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="order_counter",
+    )
+    in_progress_count = models.IntegerField(default=0)
+    completed_count = models.IntegerField(default=0)
+    cancelled_count = models.IntegerField(default=0)
+
+    def __str__(self) -> str:
+        """
+        Return a readable label for the counter.
+        """
+        return f"Order counter for user {self.business_user_id}"
+
+    @classmethod
+    def apply_status_change(
+        cls,
+        business_user_id,
+        old_status=None,
+        new_status=None,
+        count=1,
+        create_missing=True,
+    ):
+        """
+        Move count orders from old_status to new_status in a single UPDATE.
+
+        A missing counter row is rebuilt from the orders table unless
+        create_missing is False. Rows are only created for business users.
+        """
+        deltas = {}
+        if old_status in cls.STATUS_FIELDS:
+            field = cls.STATUS_FIELDS[old_status]
+            deltas[field] = deltas.get(field, 0) - count
+        if new_status in cls.STATUS_FIELDS:
+            field = cls.STATUS_FIELDS[new_status]
+            deltas[field] = deltas.get(field, 0) + count
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        updated = cls.objects.filter(pk=business_user_id).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+        if not updated and create_missing and cls.is_business_user(business_user_id):
+            cls.rebuild(business_user_ids=[business_user_id])
+
+    @staticmethod
+    def is_business_user(user_id):
+        """
+        Check whether the user has a business profile.
+        """
+        return Profile.objects.filter(user_id=user_id, role=Profile.ROLE_BUSINESS).exists()
+
+    @classmethod
+    def count_orders(cls, business_user_ids=None):
+        """
+        Return {business_user_id: {field: count}} computed from the live
+        and the archived orders.
+        """
+        totals = {}
+        for model in (Order, ArchivedOrder):
+            orders = model.objects.all()
+            if business_user_ids is not None:
+                orders = orders.filter(business_user_id__in=business_user_ids)
+            rows = (
+                orders.order_by()
+                .values("business_user_id")
+                .annotate(
+                    **{
+                        field: Count("id", filter=Q(status=status))
+                        for status, field in cls.STATUS_FIELDS.items()
+                    }
+                )
+            )
+            for row in rows:
+                counts = totals.setdefault(
+                    row.pop("business_user_id"),
+                    {field: 0 for field in cls.STATUS_FIELDS.values()},
+                )
+                for field, value in row.items():
+                    counts[field] += value
+        return totals
+
+    @classmethod
+    def rebuild(cls, business_user_ids):
+        """
+        Recalculate the counters of the given business users.
+
+        Returns the counter objects keyed by business user id.
+        """
+        counts = cls.count_orders(business_user_ids)
+        empty = {field: 0 for field in cls.STATUS_FIELDS.values()}
+        counters = {}
+        for business_user_id in business_user_ids:
+            counters[business_user_id], _ = cls.objects.update_or_create(
+                business_user_id=business_user_id,
+                defaults=counts.get(business_user_id, empty),
+            )
+        return counters
+
+
+class BusinessDailyOrderStats(models.Model):
+    """
+    Store the number of orders and their revenue per business user,
+    creation day and current status.
+
+    Rows are moved between statuses incrementally on every order write,
+    so analytics never have to scan the order tables.
+    """
+
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="daily_order_stats",
+    )
+    date = models.DateField()
+    status = models.CharField(max_length=20, choices=Order.STATUS_CHOICES)
+    order_count = models.IntegerField(default=0)
+    revenue = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+
+    class Meta:
+        ordering = ["date", "status"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["business_user", "date", "status"],
+                name="unique_daily_order_stats",
+            )
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a readable label for the rollup row.
+        """
+        return f"{self.business_user_id} {self.date} {self.status}: {self.order_count}"
+
+    @staticmethod
+    def order_date(order):
+        """
+        Return the local creation day used as rollup key for the order.
+        """
+        return timezone.localdate(order.created_at)
+
+    @classmethod
+    def apply_status_change(
+        cls, business_user_id, date, old_status=None, new_status=None, count=1, revenue=0
+    ):
+        """
+        Move count orders with the given total revenue from old_status
+        to new_status on the given day.
+        """
+        if old_status == new_status:
+            return
+        # Prices of unsaved orders may still be floats copied from the offer.
+        revenue = Decimal(str(revenue)).quantize(Decimal("0.01"))
+        if old_status is not None:
+            cls.add(business_user_id, date, old_status, -count, -revenue)
+        if new_status is not None:
+            cls.add(business_user_id, date, new_status, count, revenue)
+
+    @classmethod
+    def add(cls, business_user_id, date, status, count, revenue):
+        """
+        Add to one rollup row, creating it when it does not exist yet.
+
+        Missing rows are not created for removals, e.g. while the
+        business user is deleted in the same cascade.
+        """
+        rows = cls.objects.filter(business_user_id=business_user_id, date=date, status=status)
+        changes = {"order_count": F("order_count") + count, "revenue": F("revenue") + revenue}
+        if count < 0:
+            rows.update(**changes)
+            return
+
+        if connection.vendor in ("sqlite", "postgresql"):
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    DAILY_ORDER_STATS_UPSERT_SQL,
+                    [
+                        business_user_id,
+                        connection.ops.adapt_datefield_value(date),
+                        status,
+                        count,
+                        connection.ops.adapt_decimalfield_value(revenue, 14, 2),
+                    ],
+                )
+            return
+
+        if rows.update(**changes):
+            return
+        try:
+            with transaction.atomic():
+                cls.objects.create(
+                    business_user_id=business_user_id,
+                    date=date,
+                    status=status,
+                    order_count=count,
+                    revenue=revenue,
+                )
+        except IntegrityError:
+            # Created concurrently since the UPDATE above.
+            rows.update(**changes)
+
+
+class OrderEvent(models.Model):
+    """
+    Store an order change for the live order event stream.
+
+    Ids are not assigned in commit order, so the streams track their
+    position with an OrderEventPosition instead of the last sent id.
+    """
+
+    TYPE_CREATED = "order.created"
+    TYPE_STATUS_CHANGED = "order.status_changed"
+
+    TYPE_CHOICES = [
+        (TYPE_CREATED, "Order created"),
+        (TYPE_STATUS_CHANGED, "Order status changed"),
+    ]
+
+    order = models.ForeignKey(
+        Order,
+        on_delete=models.CASCADE,
+        related_name="events",
+    )
+    customer_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="customer_order_events",
+    )
+    business_user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="business_order_events",
+    )
+    event_type = models.CharField(max_length=32, choices=TYPE_CHOICES)
+    payload = models.JSONField(default=dict)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["id"]
+        indexes = [
+            models.Index(
+                fields=["customer_user", "id"],
+                name="orderevent_customer_id_idx",
+            ),
+            models.Index(
+                fields=["business_user", "id"],
+                name="orderevent_business_id_idx",
+            ),
+        ]
+
+    def __str__(self) -> str:
+        """
+        Return a readable label for the event.
+        """
+        return f"{self.event_type} #{self.pk} for order {self.order_id}"
@@ -0,0 +1,81 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from orders_app.api.events import record_order_events
+from orders_app.models import BusinessDailyOrderStats, BusinessOrderCounter, Order, OrderEvent
+
+# Set while orders are moved to the archive. They leave the hot table
+# but still count as completed or cancelled orders of the business.
+_archiving = ContextVar("archiving_orders", default=False)
+
+
+@contextmanager
+def archiving_orders():
+    """
+    Keep the order counters unchanged for orders deleted in this block.
+    """
+    token = _archiving.set(True)
+    try:
+        yield
+    finally:
+        _archiving.reset(token)
+
+
+@receiver(post_save, sender=Order)
+def order_saved(sender, instance, created, **kwargs):
+    """
+    Count new orders, move status changes between counters and
+    daily rollups, and record the matching order events.
+
+    The old status is the one Order.save replaced in the row, not the
+    loaded value, so concurrent saves cannot count a transition twice.
+    """
+    old_status = None if created else getattr(instance, "previous_status", None)
+    if created or old_status is not None:
+        BusinessOrderCounter.apply_status_change(
+            instance.business_user_id,
+            old_status=old_status,
+            new_status=instance.status,
+        )
+        BusinessDailyOrderStats.apply_status_change(
+            instance.business_user_id,
+            BusinessDailyOrderStats.order_date(instance),
+            old_status=old_status,
+            new_status=instance.status,
+            revenue=instance.price,
+        )
+    if created:
+        record_order_events([instance], OrderEvent.TYPE_CREATED)
+    elif old_status is not None and old_status != instance.status:
+        record_order_events(
+            [instance],
+            OrderEvent.TYPE_STATUS_CHANGED,
+            previous_statuses={instance.pk: old_status},
+        )
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=Order)
+def order_deleted(sender, instance, **kwargs):
+    """
+    Uncount deleted orders, except when they are archived.
+
+    Missing counters are not recreated here, because the business
+    user may be deleted in the same cascade.
+    """
+    if _archiving.get():
+        return
+    BusinessOrderCounter.apply_status_change(
+        instance.business_user_id,
+        old_status=instance.status,
+        create_missing=False,
+    )
+    BusinessDailyOrderStats.apply_status_change(
+        instance.business_user_id,
+        BusinessDailyOrderStats.order_date(instance),
+        old_status=instance.status,
+        revenue=instance.price,
+    )
@@ -1,9 +1,32 @@
+import asyncio
+import json
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
 import pytest
+from asgiref.sync import async_to_sync, sync_to_async
 from django.contrib.auth.models import User
-from rest_framework.test import APIClient
+from django.core.management import call_command
+from django.db import connection
+from django.test import AsyncClient
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
 
 from offers_app.models import Offer, OfferDetail
-from orders_app.models import Order
+from orders_app.api.events import OrderEventPosition, broker, create_stream_token
+from orders_app.api.filters import get_user_orders
+from orders_app.api.serializers import OrderSerializer
+from orders_app.api.views import OrderCursorPagination
+from orders_app.models import (
+    ArchivedOrder,
+    BusinessDailyOrderStats,
+    BusinessOrderCounter,
+    Order,
+    OrderEvent,
+)
 from profiles_app.models import Profile
 
 
@@ -289,4 +312,914 @@ def test_order_count_endpoints(
 
     res = api_client.get(f"/api/completed-order-count/{business_user.id}/")
     assert res.status_code == 200
-    assert res.data["completed_order_count"] == 1
\ No newline at end of file
+    assert res.data["completed_order_count"] == 1
+
+
+def _create_order(customer_user, business_user, offer_detail, status=Order.STATUS_IN_PROGRESS):
+    return Order.objects.create(
+        customer_user=customer_user,
+        business_user=business_user,
+        offer_detail=offer_detail,
+        title="Logo Design",
+        revisions=3,
+        delivery_time_in_days=5,
+        price=150,
+        features=["Logo Design"],
+        offer_type="basic",
+        status=status,
+    )
+
+
+def _counts(business_user):
+    counter = BusinessOrderCounter.objects.get(pk=business_user.pk)
+    return counter.in_progress_count, counter.completed_count, counter.cancelled_count
+
+
+@pytest.mark.django_db
+def test_order_counters_follow_create_status_update_and_delete(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    order = _create_order(customer_user, business_user, offer_detail)
+    _create_order(customer_user, business_user, offer_detail)
+    assert _counts(business_user) == (2, 0, 0)
+
+    api_client.force_authenticate(user=business_user)
+    res = api_client.patch(
+        f"/api/orders/{order.id}/", {"status": "completed"}, format="json"
+    )
+    assert res.status_code == 200
+    assert _counts(business_user) == (1, 1, 0)
+
+    res = api_client.patch(
+        f"/api/orders/{order.id}/", {"status": "cancelled"}, format="json"
+    )
+    assert res.status_code == 200
+    assert _counts(business_user) == (1, 0, 1)
+
+    order.refresh_from_db()
+    order.delete()
+    assert _counts(business_user) == (1, 0, 0)
+
+
+@pytest.mark.django_db
+def test_order_count_endpoints_use_one_query(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+    django_assert_num_queries,
+):
+    _create_order(customer_user, business_user, offer_detail)
+    _create_order(customer_user, business_user, offer_detail, Order.STATUS_COMPLETED)
+    api_client.force_authenticate(user=customer_user)
+
+    with django_assert_num_queries(1):
+        res = api_client.get(f"/api/order-count/{business_user.id}/")
+    assert res.data["order_count"] == 1
+
+    with django_assert_num_queries(1):
+        res = api_client.get(f"/api/completed-order-count/{business_user.id}/")
+    assert res.data["completed_order_count"] == 1
+
+
+@pytest.mark.django_db
+def test_order_count_endpoints_without_counter_row(api_client, customer_user, business_user):
+    api_client.force_authenticate(user=customer_user)
+
+    res = api_client.get(f"/api/order-count/{business_user.id}/")
+    assert res.status_code == 200
+    assert res.data["order_count"] == 0
+
+    res = api_client.get(f"/api/completed-order-count/{customer_user.id}/")
+    assert res.status_code == 200
+    assert res.data["completed_order_count"] == 0
+
+    # Read-only endpoints do not create counter rows.
+    assert not BusinessOrderCounter.objects.exists()
+
+    res = api_client.get("/api/completed-order-count/999999/")
+    assert res.status_code == 404
+
+
+@pytest.mark.django_db
+def test_order_counters_follow_the_row_for_saves_from_the_same_state(
+    customer_user, business_user, offer_detail
+):
+    order = _create_order(customer_user, business_user, offer_detail)
+    first = Order.objects.get(pk=order.pk)
+    second = Order.objects.get(pk=order.pk)
+
+    first.status = Order.STATUS_COMPLETED
+    first.save()
+    second.status = Order.STATUS_CANCELLED
+    second.save()
+
+    assert Order.objects.get(pk=order.pk).status == Order.STATUS_CANCELLED
+    assert _counts(business_user) == (0, 0, 1)
+
+    # A save from the stale state without a status change still moves it back.
+    first.title = "Renamed"
+    first.save()
+    assert _counts(business_user) == (0, 1, 0)
+
+
+@pytest.mark.django_db
+def test_reconcile_order_counters_fixes_drift(
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    _create_order(customer_user, business_user, offer_detail)
+    _create_order(customer_user, business_user, offer_detail, Order.STATUS_COMPLETED)
+    BusinessOrderCounter.objects.filter(pk=business_user.pk).update(
+        in_progress_count=7, completed_count=0
+    )
+
+    out = StringIO()
+    call_command("reconcile_order_counters", "--dry-run", stdout=out)
+    assert "found 1 drifted counters" in out.getvalue()
+    assert _counts(business_user) == (7, 0, 0)
+
+    out = StringIO()
+    call_command("reconcile_order_counters", stdout=out)
+    assert "fixed 1 drifted counters" in out.getvalue()
+    assert _counts(business_user) == (1, 1, 0)
+
+
+@pytest.mark.django_db
+def test_deleting_customer_uncounts_cascaded_orders(
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    _create_order(customer_user, business_user, offer_detail)
+    _create_order(customer_user, business_user, offer_detail, Order.STATUS_COMPLETED)
+
+    customer_user.delete()
+
+    assert _counts(business_user) == (0, 0, 0)
+
+
+@pytest.mark.django_db
+def test_order_counts_batch_endpoint(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+    django_assert_num_queries,
+):
+    other_business = User.objects.create_user(username="business_2", password="x")
+    Profile.objects.create(user=other_business, role=Profile.ROLE_BUSINESS)
+    _create_order(customer_user, business_user, offer_detail)
+    _create_order(customer_user, business_user, offer_detail)
+    _create_order(customer_user, business_user, offer_detail, Order.STATUS_COMPLETED)
+    api_client.force_authenticate(user=customer_user)
+
+    ids = f"{business_user.id},{other_business.id},999999"
+    with django_assert_num_queries(1):
+        res = api_client.get(f"/api/order-counts/?business_user_ids={ids}")
+
+    assert res.status_code == 200
+    assert res.data == {
+        str(business_user.id): {"order_count": 2, "completed_order_count": 1},
+        str(other_business.id): {"order_count": 0, "completed_order_count": 0},
+    }
+
+
+@pytest.mark.django_db
+def test_order_counts_batch_endpoint_validates_ids(api_client, customer_user):
+    api_client.force_authenticate(user=customer_user)
+
+    assert api_client.get("/api/order-counts/").status_code == 400
+    assert api_client.get("/api/order-counts/?business_user_ids=1,x").status_code == 400
+
+    too_many = ",".join(str(i) for i in range(1, 102))
+    res = api_client.get(f"/api/order-counts/?business_user_ids={too_many}")
+    assert res.status_code == 400
+    assert "100" in res.data["business_user_ids"][0]
+
+
+@pytest.mark.django_db
+def test_get_user_orders_returns_both_roles_once_newest_first(
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    as_customer = _create_order(customer_user, business_user, offer_detail)
+    self_order = _create_order(business_user, business_user, offer_detail)
+    as_business = _create_order(customer_user, business_user, offer_detail)
+
+    assert [order.id for order in get_user_orders(business_user)] == [
+        as_business.id,
+        self_order.id,
+        as_customer.id,
+    ]
+    assert [order.id for order in get_user_orders(customer_user)] == [
+        as_business.id,
+        as_customer.id,
+    ]
+
+
+@pytest.mark.django_db
+def test_get_user_orders_plan_uses_composite_indexes(business_user):
+    if connection.vendor != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN output is SQLite specific.")
+
+    plan = get_user_orders(business_user).explain()
+
+    assert "order_customer_created_idx" in plan
+    assert "order_business_created_idx" in plan
+    assert "DISTINCT" not in plan
+    # Each branch is read in index order and merged; only the id
+    # tie-breaker needs a temporary b-tree, not the full result.
+    assert "USE TEMP B-TREE FOR ORDER BY" not in plan
+
+    # Cursor pages seek into both indexes at the cursor position.
+    paginator = OrderCursorPagination()
+    paginator.model = Order
+    paginator.keys = paginator.get_keys(get_user_orders(business_user))
+    after_cursor = paginator.get_position_filter([timezone.now(), 10], reverse=False)
+    plan = get_user_orders(business_user, after_cursor).explain()
+
+    assert "(customer_user_id=? AND created_at<?)" in plan
+    assert "(business_user_id=? AND created_at<?)" in plan
+
+
+@pytest.mark.django_db
+def test_business_status_lookup_plan_uses_composite_index(business_user):
+    if connection.vendor != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN output is SQLite specific.")
+
+    # The counter rebuild counts per status; the index covers that query.
+    plan = (
+        Order.objects.filter(business_user=business_user, status=Order.STATUS_COMPLETED)
+        .order_by()
+        .values("id")
+        .explain()
+    )
+
+    assert "COVERING INDEX order_business_status_idx" in plan
+
+
+@pytest.mark.django_db
+def test_orders_cursor_pagination_walks_union_with_ties(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+    django_assert_num_queries,
+):
+    orders = [_create_order(customer_user, business_user, offer_detail) for _ in range(3)]
+    orders.append(_create_order(business_user, business_user, offer_detail))
+    orders.append(_create_order(customer_user, business_user, offer_detail))
+    tied = orders[0].created_at
+    Order.objects.filter(id__in=[orders[1].id, orders[2].id]).update(created_at=tied)
+    expected = [
+        order.id
+        for order in sorted(
+            Order.objects.all(), key=lambda o: (o.created_at, o.id), reverse=True
+        )
+    ]
+    api_client.force_authenticate(user=business_user)
+
+    seen = []
+    url = "/api/orders/?pagination=cursor&page_size=2"
+    while url:
+        with django_assert_num_queries(1):
+            res = api_client.get(url)
+        assert res.status_code == 200
+        seen.extend(order["id"] for order in res.data["results"])
+        last, url = res.data, res.data["next"]
+    assert seen == expected
+
+    res = api_client.get(last["previous"])
+    assert [order["id"] for order in res.data["results"]] == expected[2:4]
+
+
+@pytest.mark.django_db
+def test_orders_list_stays_unpaginated_without_opt_in(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    _create_order(customer_user, business_user, offer_detail)
+    api_client.force_authenticate(user=customer_user)
+
+    res = api_client.get("/api/orders/")
+
+    assert isinstance(res.data, list)
+    assert len(res.data) == 1
+
+
+def test_orders_cursor_page_size_is_capped():
+    request = Request(APIRequestFactory().get("/api/orders/", {"page_size": 1000}))
+
+    assert OrderCursorPagination().get_page_size(request) == 100
+
+
+@pytest.mark.django_db
+def test_customer_can_create_orders_in_batch(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+    django_assert_num_queries,
+):
+    premium = OfferDetail.objects.create(
+        offer=offer_detail.offer,
+        title="Premium",
+        offer_type="premium",
+        revisions=9,
+        delivery_time_in_days=2,
+        price=500,
+        features=["All"],
+    )
+    _create_order(customer_user, business_user, offer_detail)
+    api_client.force_authenticate(user=customer_user)
+
+    # offer details, savepoint, insert, counter update, rollup upsert,
+    # event insert, release
+    with django_assert_num_queries(7):
+        res = api_client.post(
+            "/api/orders/batch/",
+            {"offer_detail_ids": [premium.id, offer_detail.id, premium.id]},
+            format="json",
+        )
+
+    assert res.status_code == 201
+    assert [order["title"] for order in res.data] == ["Premium", "Logo Design", "Premium"]
+    assert all(order["business_user"] == business_user.id for order in res.data)
+    assert all(order["status"] == "in_progress" for order in res.data)
+    assert Order.objects.filter(customer_user=customer_user).count() == 4
+    assert _counts(business_user) == (4, 0, 0)
+
+
+@pytest.mark.django_db
+def test_batch_order_rejects_unknown_ids_without_creating_orders(
+    api_client,
+    customer_user,
+    offer_detail,
+):
+    api_client.force_authenticate(user=customer_user)
+
+    res = api_client.post(
+        "/api/orders/batch/",
+        {"offer_detail_ids": [offer_detail.id, 99998, 99999]},
+        format="json",
+    )
+
+    assert res.status_code == 400
+    assert res.data["offer_detail_ids"] == ["OfferDetail not found: 99998, 99999."]
+    assert not Order.objects.exists()
+
+    res = api_client.post("/api/orders/batch/", {"offer_detail_ids": []}, format="json")
+    assert res.status_code == 400
+
+
+@pytest.mark.django_db
+def test_business_cannot_create_orders_in_batch(api_client, business_user, offer_detail):
+    api_client.force_authenticate(user=business_user)
+
+    res = api_client.post(
+        "/api/orders/batch/",
+        {"offer_detail_ids": [offer_detail.id]},
+        format="json",
+    )
+
+    assert res.status_code == 403
+
+
+@pytest.mark.django_db
+def test_single_order_with_unknown_offer_detail(api_client, customer_user):
+    api_client.force_authenticate(user=customer_user)
+
+    res = api_client.post("/api/orders/", {"offer_detail_id": 99999}, format="json")
+
+    assert res.status_code == 400
+    assert res.data == {"offer_detail_id": ["OfferDetail not found."]}
+
+
+@pytest.mark.django_db
+def test_patch_status_is_one_conditional_update(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+    django_assert_num_queries,
+):
+    order = _create_order(customer_user, business_user, offer_detail)
+    api_client.force_authenticate(user=business_user)
+
+    # savepoint, status read, UPDATE ... RETURNING, counter update,
+    # two rollup updates, event insert, release
+    with django_assert_num_queries(8):
+        res = api_client.patch(
+            f"/api/orders/{order.id}/", {"status": "completed"}, format="json"
+        )
+
+    assert res.status_code == 200
+    assert res.data["id"] == order.id
+    assert res.data["status"] == "completed"
+    assert res.data["features"] == ["Logo Design"]
+    order.refresh_from_db()
+    assert order.status == Order.STATUS_COMPLETED
+    assert res.data["updated_at"] == OrderSerializer(order).data["updated_at"]
+    assert _counts(business_user) == (0, 1, 0)
+
+
+@pytest.mark.django_db
+def test_patch_status_error_responses(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    order = _create_order(customer_user, business_user, offer_detail)
+    other_business = User.objects.create_user(username="business_2", password="x")
+    Profile.objects.create(user=other_business, role=Profile.ROLE_BUSINESS)
+
+    api_client.force_authenticate(user=business_user)
+    res = api_client.patch("/api/orders/99999/", {"status": "completed"}, format="json")
+    assert res.status_code == 404
+    res = api_client.patch("/api/orders/99999/", {}, format="json")
+    assert res.status_code == 404
+    res = api_client.patch(f"/api/orders/{order.id}/", {}, format="json")
+    assert res.status_code == 400
+    assert res.data == {"status": ["This field is required."]}
+    res = api_client.patch(f"/api/orders/{order.id}/", {"status": "done"}, format="json")
+    assert res.status_code == 400
+
+    api_client.force_authenticate(user=other_business)
+    res = api_client.patch(f"/api/orders/{order.id}/", {"status": "completed"}, format="json")
+    assert res.status_code == 403
+
+    order.refresh_from_db()
+    assert order.status == Order.STATUS_IN_PROGRESS
+    assert _counts(business_user) == (1, 0, 0)
+
+
+@pytest.mark.django_db
+def test_patch_status_without_update_returning(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+    monkeypatch,
+):
+    if connection.vendor != "sqlite":
+        pytest.skip("Simulates an SQLite version without RETURNING.")
+    monkeypatch.setattr(connection.Database, "sqlite_version_info", (3, 31, 0))
+    order = _create_order(customer_user, business_user, offer_detail)
+    api_client.force_authenticate(user=business_user)
+
+    res = api_client.patch(f"/api/orders/{order.id}/", {"status": "cancelled"}, format="json")
+
+    assert res.status_code == 200
+    assert res.data["status"] == "cancelled"
+    assert _counts(business_user) == (0, 0, 1)
+
+
+def _read_events(path, count, **headers):
+    """Return the response and the first count events of an order stream."""
+
+    async def read():
+        response = await AsyncClient().get(path, headers=headers)
+        if not response.streaming:
+            return response, []
+        stream = response.streaming_content
+        events = []
+        while len(events) < count:
+            chunk = (await asyncio.wait_for(anext(stream), 5)).decode()
+            if chunk.startswith("id:"):
+                events.append(_parse_event(chunk))
+        await stream.aclose()
+        return response, events
+
+    return async_to_sync(read)()
+
+
+def _parse_event(chunk):
+    fields = dict(line.split(": ", 1) for line in chunk.strip().splitlines())
+    return fields["id"], fields["event"], json.loads(fields["data"])
+
+
+@pytest.mark.django_db
+def test_order_event_stream_replays_and_resumes(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    order = _create_order(customer_user, business_user, offer_detail)
+    api_client.force_authenticate(user=business_user)
+    api_client.patch(f"/api/orders/{order.id}/", {"status": "completed"}, format="json")
+    token = Token.objects.create(user=customer_user)
+
+    response, events = _read_events(
+        "/api/orders/events/", 2, authorization=f"Token {token.key}", last_event_id="0"
+    )
+
+    assert response["Content-Type"] == "text/event-stream"
+    (first_id, first_type, first), (second_id, second_type, second) = events
+    assert first_type == OrderEvent.TYPE_CREATED
+    assert first["order"]["id"] == order.id
+    assert second_type == OrderEvent.TYPE_STATUS_CHANGED
+    assert second["order"]["status"] == "completed"
+    assert second["previous_status"] == "in_progress"
+
+    _create_order(customer_user, business_user, offer_detail)
+    api_client.force_authenticate(user=customer_user)
+    stream_token = api_client.post("/api/orders/events/token/").json()["stream_token"]
+    _, events = _read_events(
+        f"/api/orders/events/?stream_token={stream_token}", 1, last_event_id=first_id
+    )
+    assert events[0][0] == second_id
+
+
+@pytest.mark.django_db
+def test_order_event_stream_pushes_new_events(
+    customer_user,
+    business_user,
+    offer_detail,
+    django_capture_on_commit_callbacks,
+):
+    stream_token = create_stream_token(business_user)
+
+    def create_order():
+        with django_capture_on_commit_callbacks(execute=True):
+            return _create_order(customer_user, business_user, offer_detail)
+
+    async def run():
+        response = await AsyncClient().get(f"/api/orders/events/?stream_token={stream_token}")
+        stream = response.streaming_content
+        assert (await anext(stream)).startswith(b"retry:")
+        pending = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.05)
+        order = await sync_to_async(create_order)()
+        chunk = await asyncio.wait_for(pending, 5)
+        await stream.aclose()
+        return order, _parse_event(chunk.decode())
+
+    order, (_, event_type, data) = async_to_sync(run)()
+
+    assert event_type == OrderEvent.TYPE_CREATED
+    assert data["order"]["id"] == order.id
+
+
+@pytest.mark.django_db
+def test_order_event_stream_delivers_events_committed_out_of_id_order(
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    first = _create_order(customer_user, business_user, offer_detail)
+    second = _create_order(customer_user, business_user, offer_detail)
+    # Simulate a transaction that got the lower id but commits later.
+    late = OrderEvent.objects.get(order=first)
+    late_id = late.id
+    late.delete()
+    stream_token = create_stream_token(customer_user)
+
+    def commit_late_event():
+        OrderEvent.objects.create(
+            id=late_id,
+            order_id=late.order_id,
+            customer_user_id=late.customer_user_id,
+            business_user_id=late.business_user_id,
+            event_type=late.event_type,
+            payload=late.payload,
+        )
+        broker.notify()
+
+    async def run():
+        response = await AsyncClient().get(
+            f"/api/orders/events/?stream_token={stream_token}&last_event_id=0"
+        )
+        stream = response.streaming_content
+        assert (await anext(stream)).startswith(b"retry:")
+        chunks = [await asyncio.wait_for(anext(stream), 5)]
+        await sync_to_async(commit_late_event)()
+        chunks.append(await asyncio.wait_for(anext(stream), 5))
+        await stream.aclose()
+        return [_parse_event(chunk.decode()) for chunk in chunks]
+
+    (second_token, _, second_data), (late_token, _, late_data) = async_to_sync(run)()
+
+    assert second_data["order"]["id"] == second.id
+    assert late_data["order"]["id"] == first.id
+    second_id = OrderEvent.objects.get(order=second).id
+    assert second_token == f"0,{second_id}"
+    assert late_id < second_id
+    assert late_token == f"0,{late_id},{second_id}"
+
+    # A client resuming with the token gets neither event again.
+    third = _create_order(customer_user, business_user, offer_detail)
+    _, events = _read_events(
+        f"/api/orders/events/?stream_token={stream_token}", 1, last_event_id=second_token
+    )
+    assert [data["order"]["id"] for _, _, data in events] == [first.id]
+    _, events = _read_events(
+        f"/api/orders/events/?stream_token={stream_token}", 1, last_event_id=late_token
+    )
+    assert [data["order"]["id"] for _, _, data in events] == [third.id]
+
+
+@pytest.mark.django_db
+def test_order_event_position_settles_old_events():
+    now = timezone.now()
+    position = OrderEventPosition.from_token("3,5")
+    position.add(OrderEvent(id=7, created_at=now - timedelta(seconds=30)))
+    position.add(OrderEvent(id=9, created_at=now))
+
+    position.settle(now - timedelta(seconds=10))
+
+    assert position.token() == "7,9"
+    assert OrderEventPosition.from_token("x") is None
+
+
+@pytest.mark.django_db
+def test_order_event_stream_only_shows_own_orders(
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    other_customer = User.objects.create_user(username="customer_2", password="x")
+    Profile.objects.create(user=other_customer, role=Profile.ROLE_CUSTOMER)
+    _create_order(customer_user, business_user, offer_detail)
+    own = _create_order(other_customer, business_user, offer_detail)
+    stream_token = create_stream_token(other_customer)
+
+    _, events = _read_events(
+        f"/api/orders/events/?stream_token={stream_token}&last_event_id=0", 1
+    )
+
+    assert events[0][2]["order"]["id"] == own.id
+
+    # Events of self-orders are only sent once.
+    self_order = _create_order(business_user, business_user, offer_detail)
+    _, events = _read_events(
+        f"/api/orders/events/?stream_token={create_stream_token(business_user)}",
+        3,
+        last_event_id="0",
+    )
+    order_ids = [data["order"]["id"] for _, _, data in events]
+    assert order_ids[-1] == self_order.id
+    assert len(set(order_ids)) == 3
+
+
+@pytest.mark.django_db
+def test_order_event_stream_requires_token(api_client, customer_user, settings):
+    response, _ = _read_events("/api/orders/events/?stream_token=invalid", 0)
+    assert response.status_code == 401
+
+    response, _ = _read_events("/api/orders/events/", 0)
+    assert response.status_code == 401
+
+    # The long-lived auth token is not accepted in the URL.
+    token = Token.objects.create(user=customer_user)
+    response, _ = _read_events(f"/api/orders/events/?token={token.key}", 0)
+    assert response.status_code == 401
+    response, _ = _read_events(f"/api/orders/events/?stream_token={token.key}", 0)
+    assert response.status_code == 401
+
+    assert api_client.post("/api/orders/events/token/").status_code == 401
+    api_client.force_authenticate(user=customer_user)
+    res = api_client.post("/api/orders/events/token/")
+    assert res.status_code == 200
+    assert res.json()["expires_in"] == settings.ORDER_EVENTS_STREAM_TOKEN_MAX_AGE
+
+    settings.ORDER_EVENTS_STREAM_TOKEN_MAX_AGE = -1
+    response, _ = _read_events(
+        f"/api/orders/events/?stream_token={res.json()['stream_token']}", 0
+    )
+    assert response.status_code == 401
+
+
+@pytest.mark.django_db
+def test_prune_order_events_deletes_old_events(customer_user, business_user, offer_detail):
+    old = _create_order(customer_user, business_user, offer_detail)
+    recent = _create_order(customer_user, business_user, offer_detail)
+    OrderEvent.objects.filter(order=old).update(
+        created_at=timezone.now() - timedelta(days=30)
+    )
+
+    out = StringIO()
+    call_command("prune_order_events", "--dry-run", stdout=out)
+    assert "1 order events would be deleted." in out.getvalue()
+    assert OrderEvent.objects.count() == 2
+
+    out = StringIO()
+    call_command("prune_order_events", "--older-than-days", "7", "--batch-size", "1", stdout=out)
+    assert "Deleted 1 order events." in out.getvalue()
+    assert list(OrderEvent.objects.values_list("order_id", flat=True)) == [recent.id]
+
+
+def _create_archivable_orders(customer_user, business_user, offer_detail):
+    old = timezone.now() - timedelta(days=400)
+    orders = {
+        "old_completed": _create_order(
+            customer_user, business_user, offer_detail, Order.STATUS_COMPLETED
+        ),
+        "old_cancelled": _create_order(
+            customer_user, business_user, offer_detail, Order.STATUS_CANCELLED
+        ),
+        "old_in_progress": _create_order(customer_user, business_user, offer_detail),
+        "recent_completed": _create_order(
+            customer_user, business_user, offer_detail, Order.STATUS_COMPLETED
+        ),
+    }
+    Order.objects.exclude(pk=orders["recent_completed"].pk).update(
+        created_at=old, updated_at=old
+    )
+    return orders
+
+
+@pytest.mark.django_db
+def test_archive_orders_moves_old_terminal_orders_in_batches(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    orders = _create_archivable_orders(customer_user, business_user, offer_detail)
+    counts_before = _counts(business_user)
+
+    out = StringIO()
+    call_command("archive_orders", "--older-than-days=180", "--batch-size=1", stdout=out)
+
+    assert "Archived 2 orders in 2 batches." in out.getvalue()
+    assert set(ArchivedOrder.objects.values_list("id", flat=True)) == {
+        orders["old_completed"].id,
+        orders["old_cancelled"].id,
+    }
+    assert set(Order.objects.values_list("id", flat=True)) == {
+        orders["old_in_progress"].id,
+        orders["recent_completed"].id,
+    }
+    archived = ArchivedOrder.objects.get(pk=orders["old_completed"].pk)
+    assert archived.price == orders["old_completed"].price
+    assert archived.features == ["Logo Design"]
+
+    assert _counts(business_user) == counts_before == (1, 2, 1)
+    api_client.force_authenticate(user=customer_user)
+    res = api_client.get(f"/api/completed-order-count/{business_user.id}/")
+    assert res.data["completed_order_count"] == 2
+
+    out = StringIO()
+    call_command("reconcile_order_counters", "--dry-run", stdout=out)
+    assert "found 0 drifted counters" in out.getvalue()
+
+
+@pytest.mark.django_db
+def test_archive_orders_dry_run(customer_user, business_user, offer_detail):
+    _create_archivable_orders(customer_user, business_user, offer_detail)
+
+    out = StringIO()
+    call_command("archive_orders", "--dry-run", stdout=out)
+
+    assert "2 orders would be archived." in out.getvalue()
+    assert not ArchivedOrder.objects.exists()
+
+
+@pytest.mark.django_db
+def test_order_history_includes_archived_orders(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    orders = _create_archivable_orders(customer_user, business_user, offer_detail)
+    call_command("archive_orders", stdout=StringIO())
+    api_client.force_authenticate(user=business_user)
+
+    res = api_client.get("/api/orders/")
+    assert {order["id"] for order in res.data} == {
+        orders["old_in_progress"].id,
+        orders["recent_completed"].id,
+    }
+
+    seen = []
+    url = "/api/orders/history/?page_size=3"
+    while url:
+        res = api_client.get(url)
+        assert res.status_code == 200
+        seen.extend(res.data["results"])
+        url = res.data["next"]
+
+    assert [order["id"] for order in seen] == [
+        orders["recent_completed"].id,
+        orders["old_in_progress"].id,
+        orders["old_cancelled"].id,
+        orders["old_completed"].id,
+    ]
+    assert seen[2]["status"] == "cancelled"
+
+
+def _rollups(business_user):
+    return {
+        (row.date, row.status): (row.order_count, row.revenue)
+        for row in BusinessDailyOrderStats.objects.filter(business_user=business_user)
+        if row.order_count
+    }
+
+
+@pytest.mark.django_db
+def test_daily_rollups_follow_order_writes(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+):
+    today = timezone.localdate()
+    api_client.force_authenticate(user=customer_user)
+    api_client.post("/api/orders/", {"offer_detail_id": offer_detail.id}, format="json")
+    api_client.post(
+        "/api/orders/batch/",
+        {"offer_detail_ids": [offer_detail.id, offer_detail.id]},
+        format="json",
+    )
+    assert _rollups(business_user) == {(today, "in_progress"): (3, Decimal("450.00"))}
+
+    order = Order.objects.first()
+    api_client.force_authenticate(user=business_user)
+    api_client.patch(f"/api/orders/{order.id}/", {"status": "completed"}, format="json")
+    assert _rollups(business_user) == {
+        (today, "in_progress"): (2, Decimal("300.00")),
+        (today, "completed"): (1, Decimal("150.00")),
+    }
+
+    call_command("archive_orders", "--older-than-days=0", stdout=StringIO())
+    assert ArchivedOrder.objects.filter(pk=order.pk).exists()
+    Order.objects.filter(status=Order.STATUS_IN_PROGRESS).first().delete()
+    assert _rollups(business_user) == {
+        (today, "in_progress"): (1, Decimal("150.00")),
+        (today, "completed"): (1, Decimal("150.00")),
+    }
+
+
+@pytest.mark.django_db
+def test_order_analytics_endpoint(
+    api_client,
+    customer_user,
+    business_user,
+    offer_detail,
+    django_assert_num_queries,
+):
+    orders = [_create_order(customer_user, business_user, offer_detail) for _ in range(3)]
+    orders[0].status = Order.STATUS_COMPLETED
+    orders[0].save()
+    orders[1].status = Order.STATUS_CANCELLED
+    orders[1].save()
+    old = timezone.now() - timedelta(days=40)
+    Order.objects.filter(pk=orders[2].pk).update(created_at=old)
+    call_command("backfill_order_stats", "--chunk-days=7", stdout=StringIO())
+
+    today = timezone.localdate()
+    api_client.force_authenticate(user=business_user)
+    with django_assert_num_queries(1):
+        res = api_client.get("/api/analytics/orders/")
+
+    assert res.status_code == 200
+    assert res.data["to"] == today.isoformat()
+    [day] = res.data["results"]
+    assert day["period"] == today.isoformat()
+    assert day["order_count"] == 2
+    assert day["revenue"] == "150.00"
+    assert day["statuses"]["cancelled"] == {"order_count": 1, "revenue": "150.00"}
+
+    start = (today - timedelta(days=60)).isoformat()
+    res = api_client.get(f"/api/analytics/orders/?from={start}&granularity=month")
+    assert sum(period["order_count"] for period in res.data["results"]) == 3
+    assert all(period["period"].endswith("-01") for period in res.data["results"])
+
+
+@pytest.mark.django_db
+def test_order_analytics_validation_and_permissions(api_client, customer_user, business_user):
+    api_client.force_authenticate(user=customer_user)
+    assert api_client.get("/api/analytics/orders/").status_code == 403
+
+    api_client.force_authenticate(user=business_user)
+    assert api_client.get("/api/analytics/orders/?from=2024-13-01").status_code == 400
+    assert api_client.get("/api/analytics/orders/?granularity=week").status_code == 400
+    res = api_client.get("/api/analytics/orders/?from=2026-02-01&to=2026-01-01")
+    assert res.status_code == 400
+    res = api_client.get("/api/analytics/orders/?from=2020-01-01&to=2026-01-01")
+    assert res.status_code == 400
+
+
+@pytest.mark.django_db
+def test_backfill_order_stats_repairs_rollups(customer_user, business_user, offer_detail):
+    _create_order(customer_user, business_user, offer_detail)
+    _create_order(customer_user, business_user, offer_detail, Order.STATUS_COMPLETED)
+    expected = _rollups(business_user)
+    BusinessDailyOrderStats.objects.update(order_count=99, revenue=0)
+
+    out = StringIO()
+    call_command("backfill_order_stats", stdout=out)
+
+    assert "2 rows" in out.getvalue()
+    assert _rollups(business_user) == expected
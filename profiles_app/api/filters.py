@@ -3,23 +3,36 @@ from django.shortcuts import get_object_or_404
 from profiles_app.models import Profile
 
 
-def get_profile_by_user_id(user_id):
+def get_profiles(include_rating=False):
+    """
+    Return profiles with their users and, if requested,
+    the rating summaries joined in the same query.
+    """
+    if include_rating:
+        return Profile.objects.select_related("user", "user__rating_summary")
+    return Profile.objects.select_related("user")
+
+
+def get_profile_by_user_id(user_id, include_rating=False):
     """
     Return a profile by related user id.
     """
     return get_object_or_404(
-        Profile.objects.select_related("user"),
+        get_profiles(include_rating),
         user_id=user_id,
     )
 
 
-def get_business_profiles():
+def get_business_profiles(include_rating=False, ordering=None):
     """
-    Return all business profiles.
+    Return all business profiles, best ranked first for ordering "rating".
     """
-    return Profile.objects.select_related("user").filter(
+    queryset = get_profiles(include_rating).filter(
         role=Profile.ROLE_BUSINESS
     )
+    if ordering == "rating":
+        queryset = queryset.order_by("-ranking_score")
+    return queryset
 
 
 def get_customer_profiles():
@@ -2,6 +2,18 @@ from rest_framework import serializers
 
 from profiles_app.models import Profile
 
+RATING_FIELDS = ["review_count", "average_rating", "ranking_score"]
+
+
+def wants_rating_fields(request):
+    """
+    Return True when the request asks for the rating fields with include=rating.
+    """
+    if request is None:
+        return False
+    include = request.query_params.get("include", "")
+    return "rating" in [part.strip() for part in include.split(",")]
+
 
 class ProfileSerializer(serializers.ModelSerializer):
     """
@@ -13,6 +25,8 @@ class ProfileSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(source="user.email", required=False)
     type = serializers.CharField(source="role", read_only=True)
     file = serializers.SerializerMethodField()
+    review_count = serializers.SerializerMethodField()
+    average_rating = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
@@ -29,8 +43,25 @@ class ProfileSerializer(serializers.ModelSerializer):
             "type",
             "email",
             "created_at",
+            *RATING_FIELDS,
+        ]
+        read_only_fields = [
+            "user",
+            "username",
+            "type",
+            "file",
+            "created_at",
+            *RATING_FIELDS,
         ]
-        read_only_fields = ["user", "username", "type", "file", "created_at"]
+
+    def __init__(self, *args, **kwargs):
+        """
+        Drop the rating fields unless the request includes them.
+        """
+        super().__init__(*args, **kwargs)
+        if not wants_rating_fields(self.context.get("request")):
+            for name in RATING_FIELDS:
+                self.fields.pop(name)
 
     def get_file(self, obj):
         """
@@ -40,6 +71,20 @@ class ProfileSerializer(serializers.ModelSerializer):
             return obj.file.url
         return ""
 
+    def get_rating_summary(self, obj):
+        """
+        Return the rating summary of the profile user or None.
+        """
+        return getattr(obj.user, "rating_summary", None)
+
+    def get_review_count(self, obj):
+        summary = self.get_rating_summary(obj)
+        return summary.review_count if summary else 0
+
+    def get_average_rating(self, obj):
+        summary = self.get_rating_summary(obj)
+        return summary.average_rating if summary else 0.0
+
     def update(self, instance, validated_data):
         """
         Update profile data and synchronize the related user email.
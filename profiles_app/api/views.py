@@ -1,13 +1,15 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
 
+from core.api.pagination import CursorPaginationOptInMixin, KeysetPagination
+
 from .filters import (
     get_business_profiles,
     get_customer_profiles,
     get_profile_by_user_id,
 )
 from .permissions import IsProfileOwner
-from .serializers import ProfileSerializer
+from .serializers import ProfileSerializer, wants_rating_fields
 
 
 class ProfileDetailView(generics.RetrieveUpdateAPIView):
@@ -24,24 +26,57 @@ class ProfileDetailView(generics.RetrieveUpdateAPIView):
         """
         Return the profile associated with the provided user_id.
         """
-        obj = get_profile_by_user_id(self.kwargs["pk"])
+        obj = get_profile_by_user_id(
+            self.kwargs["pk"],
+            include_rating=wants_rating_fields(self.request),
+        )
         self.check_object_permissions(self.request, obj)
         return obj
 
 
-class BusinessProfilesListView(generics.ListAPIView):
+class BusinessProfileCursorPagination(KeysetPagination):
+    """
+    Keyset pagination over the business profiles, which pages the
+    ordering=rating listing along profile_role_ranking_idx.
+    Always used for ordering=rating; otherwise requested with
+    ?pagination=cursor and the list stays unpaginated for existing clients.
+    """
+
+    page_size = 20
+    max_page_size = 100
+
+
+class BusinessProfilesListView(CursorPaginationOptInMixin, generics.ListAPIView):
     """
     List all profiles that belong to business users.
+
+    With ordering=rating the profiles are sorted by their precomputed
+    ranking score and always paged with a cursor.
     """
 
     serializer_class = ProfileSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = None
+    cursor_pagination_class = BusinessProfileCursorPagination
 
     def get_queryset(self):
         """
         Return profiles with the business role.
         """
-        return get_business_profiles()
+        return get_business_profiles(
+            include_rating=wants_rating_fields(self.request),
+            ordering=self.request.query_params.get("ordering"),
+        )
+
+    def wants_cursor_pagination(self):
+        """
+        Page the rating ordering with a cursor, since it is a new listing
+        without existing clients that expect the full list.
+        """
+        return (
+            self.request.query_params.get("ordering") == "rating"
+            or super().wants_cursor_pagination()
+        )
 
 
 class CustomerProfilesListView(generics.ListAPIView):
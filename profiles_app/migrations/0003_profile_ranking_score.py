@@ -0,0 +1,24 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:28
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles_app', '0002_profile_created_at_profile_description_profile_file_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='ranking_score',
+            field=models.FloatField(default=0),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['role', '-ranking_score', '-id'], name='profile_role_ranking_idx'),
+        ),
+    ]
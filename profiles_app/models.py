@@ -1,8 +1,10 @@
 from django.conf import settings
 from django.db import models
 
+from core.models import LoadedValuesMixin
 
-class Profile(models.Model):
+
+class Profile(LoadedValuesMixin, models.Model):
     """
     Store additional profile data for a user.
     """
@@ -29,9 +31,18 @@ class Profile(models.Model):
     description = models.TextField(blank=True, default="")
     working_hours = models.CharField(max_length=50, blank=True, default="")
     file = models.ImageField(upload_to="profile_pics/", blank=True, null=True)
+    ranking_score = models.FloatField(default=0)
 
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["role", "-ranking_score", "-id"],
+                name="profile_role_ranking_idx",
+            ),
+        ]
+
     def __str__(self):
         """
         Return a readable label for the profile.
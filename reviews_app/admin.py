@@ -1,9 +1,14 @@
 from django.contrib import admin
-from reviews_app.models import Review
+from reviews_app.models import BusinessRatingSummary, Review
 
 
 @admin.register(Review)
 class ReviewAdmin(admin.ModelAdmin):
     list_display = ("id", "business_user", "reviewer", "rating", "updated_at")
     list_filter = ("rating", "updated_at")
-    search_fields = ("business_user__username", "reviewer__username")
\ No newline at end of file
+    search_fields = ("business_user__username", "reviewer__username")
+
+
+@admin.register(BusinessRatingSummary)
+class BusinessRatingSummaryAdmin(admin.ModelAdmin):
+    list_display = ("business_user", "review_count", "rating_sum")
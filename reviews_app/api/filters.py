@@ -1,4 +1,7 @@
-from reviews_app.models import Review
+from django.contrib.auth.models import User
+
+from profiles_app.models import Profile
+from reviews_app.models import BusinessRatingSummary, Review
 
 
 def get_filtered_reviews(request):
@@ -19,4 +22,21 @@ def get_filtered_reviews(request):
     elif ordering == "updated_at":
         queryset = queryset.order_by("-updated_at")
 
-    return queryset
\ No newline at end of file
+    return queryset
+
+
+def get_business_rating_summary(business_user_id):
+    """ Return the rating summary of a business user in one read-only query, or None if the business user does not exist."""
+    fields = list(BusinessRatingSummary.empty_values())
+    row = (
+        User.objects.filter(id=business_user_id, profile__role=Profile.ROLE_BUSINESS)
+        .values_list(*(f"rating_summary__{field}" for field in fields))
+        .first()
+    )
+    if row is None:
+        return None
+    # Business users without a summary row have no reviews yet.
+    return BusinessRatingSummary(
+        business_user_id=business_user_id,
+        **{field: value or 0 for field, value in zip(fields, row)},
+    )
@@ -1,7 +1,7 @@
-from django.db import IntegrityError
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
 
-from reviews_app.models import Review
+from reviews_app.models import BusinessRatingSummary, Review
 
 
 class ReviewSerializer(serializers.ModelSerializer):
@@ -31,58 +31,56 @@ class ReviewSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError("You cannot review yourself.")
         return business_user
 
-    def validate(self, attrs):
-        """
-        Ensure that a user can submit only one review
-        per business user.
-        """
-        request = self.context["request"]
-        reviewer = request.user
-        business_user = attrs.get("business_user")
-
-        if self.instance is None and business_user:
-            if Review.objects.filter(
-                reviewer=reviewer,
-                business_user=business_user,
-            ).exists():
-                raise serializers.ValidationError(
-                    {
-                        "business_user": (
-                            "You already submitted a review "
-                            "for this business user."
-                        )
-                    }
-                )
-
-        return attrs
-
     def create(self, validated_data):
         """
         Create a new review for the authenticated user.
+
+        Duplicates are rejected by the unique constraint on
+        (business_user, reviewer) instead of a separate lookup. The
+        insert runs in a savepoint, so a violation leaves an outer
+        transaction usable.
         """
         request = self.context["request"]
         validated_data["reviewer"] = request.user
 
         try:
-            return super().create(validated_data)
+            with transaction.atomic():
+                return super().create(validated_data)
         except IntegrityError:
             raise serializers.ValidationError(
                 {
-                    "business_user": (
+                    "business_user": [
                         "You already submitted a review "
                         "for this business user."
-                    )
+                    ]
                 }
             )
 
     def update(self, instance, validated_data):
         """
-        Update rating and description of an existing review.
+        Update rating and description of an existing review
+        together with the rating summary of the business user.
         """
         instance.rating = validated_data.get("rating", instance.rating)
         instance.description = validated_data.get(
             "description",
             instance.description,
         )
-        instance.save()
-        return instance
\ No newline at end of file
+        with transaction.atomic():
+            instance.save()
+        return instance
+
+
+class BusinessRatingSummarySerializer(serializers.ModelSerializer):
+    """
+    Serialize the review count, average rating and rating histogram
+    of a business user.
+    """
+
+    average_rating = serializers.FloatField(read_only=True)
+    histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+
+    class Meta:
+        model = BusinessRatingSummary
+        fields = ["business_user", "review_count", "average_rating", "histogram"]
+        read_only_fields = fields
@@ -1,7 +1,16 @@
 from django.urls import path
-from reviews_app.api.views import ReviewListCreateView, ReviewDetailView
+from reviews_app.api.views import (
+    BusinessRatingSummaryView,
+    ReviewDetailView,
+    ReviewListCreateView,
+)
 
 urlpatterns = [
     path("reviews/", ReviewListCreateView.as_view(), name="review-list-create"),
     path("reviews/<int:pk>/", ReviewDetailView.as_view(), name="review-detail"),
+    path(
+        "reviews/summary/<int:business_user_id>/",
+        BusinessRatingSummaryView.as_view(),
+        name="review-summary",
+    ),
 ]
\ No newline at end of file
@@ -1,16 +1,31 @@
-from rest_framework import generics
+from django.db import transaction
+from rest_framework import generics, status
 from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
 
-from reviews_app.api.filters import get_filtered_reviews 
+from core.api.pagination import CursorPaginationOptInMixin, KeysetPagination
+from reviews_app.api.filters import get_business_rating_summary, get_filtered_reviews
 from reviews_app.api.permissions import (
     IsAuthenticatedCustomerForCreate,
     IsReviewerOwner,
 )
-from reviews_app.api.serializers import ReviewSerializer
+from reviews_app.api.serializers import BusinessRatingSummarySerializer, ReviewSerializer
 from reviews_app.models import Review
 
 
-class ReviewListCreateView(generics.ListCreateAPIView):
+class ReviewCursorPagination(KeysetPagination):
+    """
+    Keyset pagination over the filtered reviews in the requested ordering.
+    Requested with ?pagination=cursor; without it the list stays
+    unpaginated for existing clients.
+    """
+
+    page_size = 20
+    max_page_size = 100
+    ordering = ("-updated_at",)
+
+
+class ReviewListCreateView(CursorPaginationOptInMixin, generics.ListCreateAPIView):
     """
     List reviews or create a new review.
 
@@ -20,6 +35,8 @@ class ReviewListCreateView(generics.ListCreateAPIView):
 
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated, IsAuthenticatedCustomerForCreate]
+    pagination_class = None
+    cursor_pagination_class = ReviewCursorPagination
 
     def get_queryset(self):
         return get_filtered_reviews(self.request)
@@ -34,4 +51,37 @@ class ReviewDetailView(generics.RetrieveUpdateDestroyAPIView):
 
     queryset = Review.objects.all()
     serializer_class = ReviewSerializer
-    permission_classes = [IsAuthenticated, IsReviewerOwner]
\ No newline at end of file
+    permission_classes = [IsAuthenticated, IsReviewerOwner]
+
+    def perform_destroy(self, instance):
+        """
+        Delete the review and update the rating summary atomically.
+        """
+        with transaction.atomic():
+            instance.delete()
+
+
+class BusinessRatingSummaryView(generics.GenericAPIView):
+    """
+    Return the review count, average rating and rating histogram
+    of a business user.
+    """
+
+    serializer_class = BusinessRatingSummarySerializer
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, business_user_id: int):
+        """
+        Return the rating summary for the given business user.
+        """
+        summary = get_business_rating_summary(business_user_id)
+        if summary is None:
+            return Response(
+                {"detail": "Business user not found."},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(
+            self.get_serializer(summary).data,
+            status=status.HTTP_200_OK,
+        )
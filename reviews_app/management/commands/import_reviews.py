@@ -0,0 +1,81 @@
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from core.management.base import ImportCommand, RowError
+from core.stats import adjust_platform_stats
+from profiles_app.models import Profile
+from reviews_app.models import BusinessRatingSummary, Review
+from reviews_app.ranking import update_ranking_scores
+
+
+class Command(ImportCommand):
+    help = (
+        "Import reviews from a JSONL or CSV file with business_user, reviewer, "
+        "rating and description columns. Rows are streamed and inserted in "
+        "batches; reviews that already exist for the same pair are skipped."
+    )
+    item_name = "reviews"
+    skipped_label = "duplicates skipped"
+    default_batch_size = 1000
+
+    def build_row(self, data):
+        """
+        Validate one row and return an unsaved review.
+        """
+        business_user = self.get_user(data.get("business_user"), Profile.ROLE_BUSINESS)
+        reviewer = self.get_user(data.get("reviewer"), Profile.ROLE_CUSTOMER)
+
+        try:
+            rating = int(data.get("rating"))
+        except (TypeError, ValueError):
+            raise RowError(f"Invalid rating: {data.get('rating')!r}")
+        if not 1 <= rating <= 5:
+            raise RowError(f"Rating must be between 1 and 5, got {rating}.")
+
+        return Review(
+            business_user=business_user,
+            reviewer=reviewer,
+            rating=rating,
+            description=data.get("description") or "",
+        )
+
+    def get_user(self, username, role):
+        """
+        Return the user with the given role, cached for the whole import.
+        """
+        if not username:
+            raise RowError(f"No {role} user given.")
+        key = (username, role)
+        if key not in self.users:
+            self.users[key] = User.objects.filter(
+                username=username,
+                profile__role=role,
+            ).first()
+        user = self.users[key]
+        if user is None:
+            raise RowError(f"{role.capitalize()} user '{username}' not found.")
+        return user
+
+    def write_batch(self, batch):
+        """
+        Insert a batch of reviews in one transaction and return the number
+        of inserted rows.
+
+        bulk_create does not send signals, so the rating summaries and
+        ranking scores of the touched business users are rebuilt and the
+        platform stats adjusted by the difference.
+        """
+        business_user_ids = sorted({review.business_user_id for review in batch})
+        with transaction.atomic():
+            before = BusinessRatingSummary.count_reviews(business_user_ids)
+            Review.objects.bulk_create(batch, ignore_conflicts=True)
+            after = BusinessRatingSummary.rebuild(business_user_ids)
+
+            review_count = rating_sum = 0
+            for business_user_id, summary in after.items():
+                previous = before.get(business_user_id, BusinessRatingSummary.empty_values())
+                review_count += summary.review_count - previous["review_count"]
+                rating_sum += summary.rating_sum - previous["rating_sum"]
+            adjust_platform_stats(review_count=review_count, rating_sum=rating_sum)
+            update_ranking_scores(business_user_ids)
+        return review_count
@@ -0,0 +1,22 @@
+from core.management.base import ReconcileCommand
+from reviews_app.models import BusinessRatingSummary
+from reviews_app.ranking import update_ranking_scores
+
+
+class Command(ReconcileCommand):
+    help = (
+        "Compare the per-business rating summaries with the reviews table "
+        "and rebuild every summary that has drifted."
+    )
+    model = BusinessRatingSummary
+    item_name = "rating summaries"
+
+    def count_expected(self):
+        return BusinessRatingSummary.count_reviews()
+
+    def get_empty_values(self):
+        return BusinessRatingSummary.empty_values()
+
+    def fix(self, business_user_ids):
+        super().fix(business_user_ids)
+        update_ranking_scores(business_user_ids)
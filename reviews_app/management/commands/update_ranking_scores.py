@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from reviews_app.ranking import update_ranking_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalculate the ranking score of every business profile with the "
+        "current platform average. Run periodically, because review writes "
+        "only update the score of the reviewed business."
+    )
+
+    def handle(self, *args, **options):
+        updated = update_ranking_scores()
+        self.stdout.write(
+            self.style.SUCCESS(f"Updated the ranking score of {updated} business profiles.")
+        )
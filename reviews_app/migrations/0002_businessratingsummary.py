@@ -0,0 +1,55 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:17
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_rating_summaries(apps, schema_editor):
+    """
+    Create a rating summary for every business user with reviews.
+    """
+    Review = apps.get_model("reviews_app", "Review")
+    BusinessRatingSummary = apps.get_model("reviews_app", "BusinessRatingSummary")
+
+    rows = (
+        Review.objects.order_by()
+        .values("business_user_id")
+        .annotate(
+            review_count=Count("id"),
+            rating_sum=Sum("rating"),
+            **{
+                f"rating_{rating}_count": Count("id", filter=Q(rating=rating))
+                for rating in range(1, 6)
+            },
+        )
+    )
+    BusinessRatingSummary.objects.bulk_create(
+        [BusinessRatingSummary(**row) for row in rows]
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reviews_app', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRatingSummary',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('rating_1_count', models.IntegerField(default=0)),
+                ('rating_2_count', models.IntegerField(default=0)),
+                ('rating_3_count', models.IntegerField(default=0)),
+                ('rating_4_count', models.IntegerField(default=0)),
+                ('rating_5_count', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(backfill_rating_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 6.0.2 on 2026-10-18 20:30
+
+from django.conf import settings
+from django.db import migrations
+from django.db.models import Sum
+
+
+def backfill_ranking_scores(apps, schema_editor):
+    """
+    Calculate the ranking score of every reviewed business profile.
+    """
+    Review = apps.get_model("reviews_app", "Review")
+    BusinessRatingSummary = apps.get_model("reviews_app", "BusinessRatingSummary")
+    Profile = apps.get_model("profiles_app", "Profile")
+
+    review_count = Review.objects.count()
+    if not review_count:
+        return
+    prior_mean = Review.objects.aggregate(total=Sum("rating"))["total"] / review_count
+    weight = settings.BUSINESS_RANKING_PRIOR_WEIGHT
+
+    profiles = []
+    summaries = BusinessRatingSummary.objects.filter(review_count__gt=0)
+    scores = {
+        summary.business_user_id: (weight * prior_mean + summary.rating_sum)
+        / (weight + summary.review_count)
+        for summary in summaries
+    }
+    for profile in Profile.objects.filter(role="business", user_id__in=scores):
+        profile.ranking_score = scores[profile.user_id]
+        profiles.append(profile)
+    Profile.objects.bulk_update(profiles, ["ranking_score"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles_app', '0003_profile_ranking_score'),
+        ('reviews_app', '0003_review_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_ranking_scores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 6.0.2 on 2026-10-18 21:40
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews_app', '0004_backfill_ranking_scores'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_business_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_business_rating_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='review',
+            name='review_reviewer_updated_idx',
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['business_user', '-updated_at', '-id'], name='review_business_updated_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['business_user', '-rating', '-updated_at', '-id'], name='review_business_rating_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(fields=['reviewer', '-updated_at', '-id'], name='review_reviewer_updated_idx'),
+        ),
+    ]
@@ -1,9 +1,12 @@
 from django.conf import settings
 from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Count, F, Q, Sum
 
+from core.models import LoadedValuesMixin
 
-class Review(models.Model):
+
+class Review(LoadedValuesMixin, models.Model):
     """
     Store a review written by a customer for a business user.
     """
@@ -29,6 +32,20 @@ class Review(models.Model):
 
     class Meta:
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(
+                fields=["business_user", "-updated_at", "-id"],
+                name="review_business_updated_idx",
+            ),
+            models.Index(
+                fields=["business_user", "-rating", "-updated_at", "-id"],
+                name="review_business_rating_idx",
+            ),
+            models.Index(
+                fields=["reviewer", "-updated_at", "-id"],
+                name="review_reviewer_updated_idx",
+            ),
+        ]
         constraints = [
             models.UniqueConstraint(
                 fields=["business_user", "reviewer"],
@@ -40,4 +57,140 @@ class Review(models.Model):
         """
         Return a readable label for the review.
         """
-        return f"Review {self.id} - {self.rating}/5"
\ No newline at end of file
+        return f"Review {self.id} - {self.rating}/5"
+
+
+class BusinessRatingSummary(models.Model):
+    """
+    Store the number of reviews, the rating sum and a rating histogram
+    for a business user.
+
+    The summary is updated with F() expressions on every review write
+    and can be rebuilt from the reviews table at any time.
+    """
+
+    RATING_FIELDS = {
+        1: "rating_1_count",
+        2: "rating_2_count",
+        3: "rating_3_count",
+        4: "rating_4_count",
+        5: "rating_5_count",
+    }
+
+    business_user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_summary",
+    )
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    rating_1_count = models.IntegerField(default=0)
+    rating_2_count = models.IntegerField(default=0)
+    rating_3_count = models.IntegerField(default=0)
+    rating_4_count = models.IntegerField(default=0)
+    rating_5_count = models.IntegerField(default=0)
+
+    def __str__(self):
+        """
+        Return a readable label for the summary.
+        """
+        return f"Rating summary for user {self.business_user_id}"
+
+    @property
+    def average_rating(self):
+        """
+        Return the average review rating rounded to one decimal.
+        """
+        if not self.review_count:
+            return 0.0
+        return round(self.rating_sum / self.review_count, 1)
+
+    @property
+    def histogram(self):
+        return {
+            str(rating): getattr(self, field)
+            for rating, field in self.RATING_FIELDS.items()
+        }
+
+    @classmethod
+    def apply_rating_change(
+        cls,
+        business_user_id,
+        old_rating=None,
+        new_rating=None,
+        create_missing=True,
+    ):
+        """
+        Replace old_rating by new_rating in a single UPDATE. A missing
+        old_rating adds a review, a missing new_rating removes one.
+
+        A missing summary row is rebuilt from the reviews table unless
+        create_missing is False.
+        """
+        deltas = {}
+        if old_rating is not None:
+            deltas["review_count"] = -1
+            deltas["rating_sum"] = -old_rating
+            field = cls.RATING_FIELDS[old_rating]
+            deltas[field] = deltas.get(field, 0) - 1
+        if new_rating is not None:
+            deltas["review_count"] = deltas.get("review_count", 0) + 1
+            deltas["rating_sum"] = deltas.get("rating_sum", 0) + new_rating
+            field = cls.RATING_FIELDS[new_rating]
+            deltas[field] = deltas.get(field, 0) + 1
+        deltas = {field: delta for field, delta in deltas.items() if delta}
+        if not deltas:
+            return
+
+        updated = cls.objects.filter(pk=business_user_id).update(
+            **{field: F(field) + delta for field, delta in deltas.items()}
+        )
+        if not updated and create_missing:
+            cls.rebuild(business_user_ids=[business_user_id])
+
+    @classmethod
+    def count_reviews(cls, business_user_ids=None):
+        """
+        Return {business_user_id: {field: value}} computed from the reviews.
+        """
+        reviews = Review.objects.all()
+        if business_user_ids is not None:
+            reviews = reviews.filter(business_user_id__in=business_user_ids)
+        rows = (
+            reviews.order_by()
+            .values("business_user_id")
+            .annotate(
+                review_count=Count("id"),
+                rating_sum=Sum("rating"),
+                **{
+                    field: Count("id", filter=Q(rating=rating))
+                    for rating, field in cls.RATING_FIELDS.items()
+                },
+            )
+        )
+        return {row.pop("business_user_id"): row for row in rows}
+
+    @classmethod
+    def empty_values(cls):
+        return dict(
+            review_count=0,
+            rating_sum=0,
+            **{field: 0 for field in cls.RATING_FIELDS.values()},
+        )
+
+    @classmethod
+    def rebuild(cls, business_user_ids):
+        """
+        Recalculate the summaries of the given business users.
+
+        Returns the summary objects keyed by business user id.
+        """
+        counts = cls.count_reviews(business_user_ids)
+        summaries = {}
+        for business_user_id in business_user_ids:
+            summaries[business_user_id], _ = cls.objects.update_or_create(
+                business_user_id=business_user_id,
+                defaults=counts.get(business_user_id, cls.empty_values()),
+            )
+        return summaries
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db.models import F, FloatField, OuterRef, Subquery, Value
+from django.db.models.functions import Cast, Coalesce
+
+from core.models import PlatformStats
+from profiles_app.models import Profile
+from reviews_app.models import BusinessRatingSummary
+
+
+def update_ranking_scores(business_user_ids=None):
+    """
+    Recalculate the ranking score of the given or of all business
+    profiles in one UPDATE and return the number of updated profiles.
+
+    The score is a Bayesian average: every business starts with
+    BUSINESS_RANKING_PRIOR_WEIGHT reviews at the platform average, so a
+    single 5-star review does not outrank many slightly lower ones.
+    Businesses without reviews score 0 and are ranked last.
+    """
+    weight = Value(float(settings.BUSINESS_RANKING_PRIOR_WEIGHT))
+
+    platform_mean = PlatformStats.objects.filter(
+        pk=PlatformStats.SINGLETON_ID,
+        review_count__gt=0,
+    ).values(mean=Cast("rating_sum", FloatField()) / F("review_count"))
+
+    score = BusinessRatingSummary.objects.filter(
+        pk=OuterRef("user_id"),
+        review_count__gt=0,
+    ).values(
+        score=(weight * Coalesce(Subquery(platform_mean), Value(0.0)) + F("rating_sum"))
+        / (weight + F("review_count"))
+    )
+
+    profiles = Profile.objects.filter(role=Profile.ROLE_BUSINESS)
+    if business_user_ids is not None:
+        profiles = profiles.filter(user_id__in=business_user_ids)
+    return profiles.update(ranking_score=Coalesce(Subquery(score), Value(0.0)))
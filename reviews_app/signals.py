@@ -0,0 +1,48 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from core.stats import adjust_platform_stats
+from reviews_app.models import BusinessRatingSummary, Review
+from reviews_app.ranking import update_ranking_scores
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    """
+    Count new reviews and apply rating changes to the rating summary
+    and ranking score of the business user and to the platform stats.
+    """
+    previous = None if created else instance.get_loaded_value("rating")
+    if created:
+        BusinessRatingSummary.apply_rating_change(
+            instance.business_user_id,
+            new_rating=instance.rating,
+        )
+        adjust_platform_stats(review_count=1, rating_sum=instance.rating)
+        update_ranking_scores([instance.business_user_id])
+    elif previous is not None and previous != instance.rating:
+        BusinessRatingSummary.apply_rating_change(
+            instance.business_user_id,
+            old_rating=previous,
+            new_rating=instance.rating,
+        )
+        adjust_platform_stats(rating_sum=instance.rating - previous)
+        update_ranking_scores([instance.business_user_id])
+    instance.remember_loaded_values()
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    """
+    Uncount deleted reviews.
+
+    Missing summaries are not recreated here, because the business
+    user may be deleted in the same cascade.
+    """
+    BusinessRatingSummary.apply_rating_change(
+        instance.business_user_id,
+        old_rating=instance.rating,
+        create_missing=False,
+    )
+    adjust_platform_stats(review_count=-1, rating_sum=-instance.rating)
+    update_ranking_scores([instance.business_user_id])
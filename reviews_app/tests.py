@@ -1,9 +1,20 @@
+import json
+from io import StringIO
+
 import pytest
 from django.contrib.auth.models import User
-from rest_framework.test import APIClient
-
+from django.core.management import call_command
+from django.db import connection
+from rest_framework.authtoken.models import Token
+from rest_framework.request import Request
+from rest_framework.test import APIClient, APIRequestFactory
+
+from core.stats import get_platform_stats
+from profiles_app.api.views import BusinessProfileCursorPagination
 from profiles_app.models import Profile
-from reviews_app.models import Review
+from reviews_app.api.filters import get_filtered_reviews
+from reviews_app.models import BusinessRatingSummary, Review
+from reviews_app.ranking import update_ranking_scores
 
 
 @pytest.fixture
@@ -238,4 +249,385 @@ def test_creator_can_delete(api_client, customer_user, business_user):
     api_client.force_authenticate(user=customer_user)
     res = api_client.delete(f"/api/reviews/{review.id}/")
     assert res.status_code == 204
-    assert Review.objects.count() == 0
\ No newline at end of file
+    assert Review.objects.count() == 0
+
+
+def _summary(business_user):
+    return BusinessRatingSummary.objects.get(pk=business_user.pk)
+
+
+@pytest.mark.django_db
+def test_rating_summary_follows_review_writes(
+    api_client,
+    customer_user,
+    other_customer,
+    business_user,
+):
+    api_client.force_authenticate(user=customer_user)
+    res = api_client.post(
+        "/api/reviews/",
+        {"business_user": business_user.id, "rating": 5},
+        format="json",
+    )
+    review_id = res.json()["id"]
+    Review.objects.create(business_user=business_user, reviewer=other_customer, rating=2)
+
+    summary = _summary(business_user)
+    assert (summary.review_count, summary.rating_sum) == (2, 7)
+    assert summary.histogram == {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1}
+
+    api_client.patch(f"/api/reviews/{review_id}/", {"rating": 3}, format="json")
+    summary = _summary(business_user)
+    assert (summary.review_count, summary.rating_sum) == (2, 5)
+    assert summary.histogram == {"1": 0, "2": 1, "3": 1, "4": 0, "5": 0}
+
+    api_client.delete(f"/api/reviews/{review_id}/")
+    summary = _summary(business_user)
+    assert (summary.review_count, summary.rating_sum) == (1, 2)
+    assert summary.histogram == {"1": 0, "2": 1, "3": 0, "4": 0, "5": 0}
+
+
+@pytest.mark.django_db
+def test_rating_summary_endpoint(
+    api_client,
+    customer_user,
+    other_customer,
+    business_user,
+    django_assert_num_queries,
+):
+    Review.objects.create(business_user=business_user, reviewer=customer_user, rating=4)
+    Review.objects.create(business_user=business_user, reviewer=other_customer, rating=5)
+
+    api_client.force_authenticate(user=customer_user)
+    with django_assert_num_queries(1):
+        res = api_client.get(f"/api/reviews/summary/{business_user.id}/")
+
+    assert res.status_code == 200
+    assert res.json() == {
+        "business_user": business_user.id,
+        "review_count": 2,
+        "average_rating": 4.5,
+        "histogram": {"1": 0, "2": 0, "3": 0, "4": 1, "5": 1},
+    }
+
+
+@pytest.mark.django_db
+def test_rating_summary_endpoint_for_unknown_and_unreviewed_users(
+    api_client,
+    customer_user,
+    business_user,
+):
+    api_client.force_authenticate(user=customer_user)
+
+    res = api_client.get(f"/api/reviews/summary/{customer_user.id}/")
+    assert res.status_code == 404
+
+    res = api_client.get(f"/api/reviews/summary/{business_user.id}/")
+    assert res.status_code == 200
+    assert res.json()["review_count"] == 0
+    assert res.json()["average_rating"] == 0.0
+    assert isinstance(res.json()["average_rating"], float)
+    assert not BusinessRatingSummary.objects.filter(pk=business_user.pk).exists()
+
+
+@pytest.mark.django_db
+def test_profiles_include_rating_fields_on_request(
+    api_client,
+    customer_user,
+    business_user,
+    django_assert_num_queries,
+):
+    Review.objects.create(business_user=business_user, reviewer=customer_user, rating=4)
+    other_business = User.objects.create_user(username="biz2", password="pass12345")
+    Profile.objects.create(user=other_business, role=Profile.ROLE_BUSINESS)
+
+    api_client.force_authenticate(user=customer_user)
+    res = api_client.get("/api/profiles/business/")
+    assert "average_rating" not in res.json()[0]
+
+    with django_assert_num_queries(1):
+        res = api_client.get("/api/profiles/business/?include=rating")
+    ratings = {
+        profile["user"]: (profile["review_count"], profile["average_rating"])
+        for profile in res.json()
+    }
+    assert ratings == {business_user.id: (1, 4.0), other_business.id: (0, 0)}
+
+    res = api_client.get(f"/api/profiles/{business_user.id}/?include=rating")
+    assert res.json()["average_rating"] == 4.0
+
+
+@pytest.mark.django_db
+def test_rebuild_rating_summaries_repairs_drift(customer_user, business_user):
+    Review.objects.create(business_user=business_user, reviewer=customer_user, rating=4)
+    BusinessRatingSummary.objects.filter(pk=business_user.pk).update(
+        review_count=7,
+        rating_4_count=0,
+    )
+
+    out = StringIO()
+    call_command("rebuild_rating_summaries", "--dry-run", stdout=out)
+    assert "found 1 drifted rating summaries" in out.getvalue()
+    assert _summary(business_user).review_count == 7
+
+    out = StringIO()
+    call_command("rebuild_rating_summaries", stdout=out)
+    assert "fixed 1 drifted rating summaries" in out.getvalue()
+    summary = _summary(business_user)
+    assert (summary.review_count, summary.rating_4_count) == (1, 1)
+
+
+def _create_reviewers(count):
+    reviewers = []
+    for index in range(count):
+        user = User.objects.create_user(username=f"reviewer{index}", password="pass12345")
+        Profile.objects.create(user=user, role=Profile.ROLE_CUSTOMER)
+        reviewers.append(user)
+    return reviewers
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "ordering, sort_key",
+    [
+        ("updated_at", lambda review: (review.updated_at, review.id)),
+        ("rating", lambda review: (review.rating, review.updated_at, review.id)),
+    ],
+)
+def test_reviews_cursor_pagination_walks_both_orderings(
+    api_client,
+    business_user,
+    ordering,
+    sort_key,
+    django_assert_num_queries,
+):
+    for index, reviewer in enumerate(_create_reviewers(5)):
+        Review.objects.create(
+            business_user=business_user,
+            reviewer=reviewer,
+            rating=index % 2 + 4,
+        )
+    Review.objects.update(updated_at=Review.objects.first().updated_at)
+    expected = [
+        review.id
+        for review in sorted(Review.objects.all(), key=sort_key, reverse=True)
+    ]
+    api_client.force_authenticate(user=business_user)
+
+    seen = []
+    url = (
+        f"/api/reviews/?business_user_id={business_user.id}"
+        f"&ordering={ordering}&pagination=cursor&page_size=2"
+    )
+    while url:
+        with django_assert_num_queries(1):
+            res = api_client.get(url)
+        assert res.status_code == 200
+        seen.extend(review["id"] for review in res.data["results"])
+        last, url = res.data, res.data["next"]
+    assert seen == expected
+
+    res = api_client.get(last["previous"])
+    assert [review["id"] for review in res.data["results"]] == expected[2:4]
+
+
+@pytest.mark.django_db
+def test_reviews_list_stays_unpaginated_without_opt_in(
+    api_client,
+    customer_user,
+    business_user,
+):
+    Review.objects.create(business_user=business_user, reviewer=customer_user, rating=4)
+    api_client.force_authenticate(user=customer_user)
+
+    res = api_client.get("/api/reviews/")
+
+    assert isinstance(res.data, list)
+    assert len(res.data) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "params, index",
+    [
+        ({"business_user_id": 1}, "review_business_updated_idx"),
+        ({"business_user_id": 1, "ordering": "updated_at"}, "review_business_updated_idx"),
+        ({"business_user_id": 1, "ordering": "rating"}, "review_business_rating_idx"),
+        ({"reviewer_id": 1}, "review_reviewer_updated_idx"),
+    ],
+)
+def test_review_orderings_are_served_by_an_index(params, index):
+    if connection.vendor != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN output is SQLite specific.")
+
+    request = Request(APIRequestFactory().get("/api/reviews/", params))
+    queryset = get_filtered_reviews(request)
+    # The cursor pagination adds the id as tie-breaker.
+    plan = queryset.order_by(*queryset.query.order_by or ["-updated_at"], "-id").explain()
+
+    assert f"USING INDEX {index}" in plan
+    # The indexes end with the id, so not even ties need a sort.
+    assert "TEMP B-TREE" not in plan
+
+
+@pytest.mark.django_db
+def test_review_create_relies_on_the_unique_constraint(
+    api_client,
+    customer_user,
+    other_customer,
+    business_user,
+    django_assert_num_queries,
+):
+    Review.objects.create(business_user=business_user, reviewer=other_customer, rating=2)
+    token = Token.objects.create(user=customer_user)
+    api_client.credentials(HTTP_AUTHORIZATION=f"Token {token.key}")
+
+    # Token with user and profile, business user, savepoint, insert,
+    # rating summary, ranking score, platform stats and release.
+    with django_assert_num_queries(8):
+        res = api_client.post(
+            "/api/reviews/",
+            {"business_user": business_user.id, "rating": 5},
+            format="json",
+        )
+    assert res.status_code == 201
+
+    res = api_client.post(
+        "/api/reviews/",
+        {"business_user": business_user.id, "rating": 1},
+        format="json",
+    )
+    assert res.status_code == 400
+    assert res.json() == {
+        "business_user": ["You already submitted a review for this business user."]
+    }
+    assert (_summary(business_user).review_count, _summary(business_user).rating_sum) == (2, 7)
+
+
+@pytest.mark.django_db
+def test_import_reviews_in_batches(customer_user, other_customer, business_user, tmp_path):
+    Review.objects.create(business_user=business_user, reviewer=customer_user, rating=2)
+    rows = [
+        {"business_user": "biz", "reviewer": "cust", "rating": 5},
+        {"business_user": "biz", "reviewer": "cust2", "rating": 4, "description": "Nice"},
+        {"business_user": "biz", "reviewer": "cust2", "rating": 1},
+        {"business_user": "cust", "reviewer": "cust2", "rating": 4},
+        {"business_user": "biz", "reviewer": "cust", "rating": 9},
+    ]
+    path = tmp_path / "reviews.jsonl"
+    path.write_text("\n".join(json.dumps(row) for row in rows) + "\nnot json\n")
+
+    out, err = StringIO(), StringIO()
+    call_command("import_reviews", str(path), batch_size=2, stdout=out, stderr=err)
+
+    assert Review.objects.get(reviewer=other_customer).description == "Nice"
+    assert Review.objects.get(reviewer=customer_user).rating == 2
+    assert "Row 4: Business user 'cust' not found." in err.getvalue()
+    assert "Row 5: Rating must be between 1 and 5" in err.getvalue()
+    assert "Row 6: Invalid JSON" in err.getvalue()
+    assert "Imported 1 reviews, 2 duplicates skipped, 3 rows failed" in out.getvalue()
+
+    summary = _summary(business_user)
+    assert (summary.review_count, summary.rating_sum) == (2, 6)
+    stats = get_platform_stats()
+    assert (stats["review_count"], stats["average_rating"]) == (2, 3.0)
+
+
+def _create_business(username):
+    user = User.objects.create_user(username=username, password="pass12345")
+    Profile.objects.create(user=user, role=Profile.ROLE_BUSINESS)
+    return user
+
+
+@pytest.mark.django_db
+def test_business_ranking_prefers_many_good_reviews_over_one_perfect(
+    api_client,
+    customer_user,
+    settings,
+    django_assert_num_queries,
+):
+    settings.BUSINESS_RANKING_PRIOR_WEIGHT = 5
+    single = _create_business("single")
+    popular = _create_business("popular")
+    poor = _create_business("poor")
+    unrated = _create_business("unrated")
+    reviewers = _create_reviewers(10)
+    Review.objects.create(business_user=single, reviewer=customer_user, rating=5)
+    for index, reviewer in enumerate(reviewers):
+        Review.objects.create(business_user=popular, reviewer=reviewer, rating=4 if index < 2 else 5)
+        if index < 5:
+            Review.objects.create(business_user=poor, reviewer=reviewer, rating=2)
+    update_ranking_scores()
+
+    api_client.force_authenticate(user=customer_user)
+    seen = []
+    url = "/api/profiles/business/?ordering=rating&include=rating&page_size=3"
+    while url:
+        with django_assert_num_queries(1):
+            res = api_client.get(url)
+        seen.extend((profile["user"], profile["ranking_score"]) for profile in res.data["results"])
+        url = res.data["next"]
+
+    # The platform mean is 63 / 16: single scores (5 * 63 / 16 + 5) / 6,
+    # popular with 48 points in 10 reviews (5 * 63 / 16 + 48) / 15.
+    assert [user_id for user_id, _ in seen] == [popular.id, single.id, poor.id, unrated.id]
+    assert seen[0][1] == pytest.approx((5 * 63 / 16 + 48) / 15)
+    assert seen[1][1] == pytest.approx((5 * 63 / 16 + 5) / 6)
+    assert seen[3][1] == 0
+
+
+@pytest.mark.django_db
+def test_ranking_score_follows_review_writes(customer_user, business_user):
+    review = Review.objects.create(business_user=business_user, reviewer=customer_user, rating=2)
+    business_user.profile.refresh_from_db()
+    assert business_user.profile.ranking_score == pytest.approx(2)
+
+    review.delete()
+    business_user.profile.refresh_from_db()
+    assert business_user.profile.ranking_score == 0
+
+
+@pytest.mark.django_db
+def test_update_ranking_scores_command_uses_current_platform_mean(
+    customer_user,
+    other_customer,
+    business_user,
+    settings,
+):
+    settings.BUSINESS_RANKING_PRIOR_WEIGHT = 1
+    other_business = _create_business("biz2")
+    Review.objects.create(business_user=business_user, reviewer=customer_user, rating=5)
+    Review.objects.create(business_user=other_business, reviewer=other_customer, rating=1)
+    # The first review was scored with a platform mean of 5.
+    business_user.profile.refresh_from_db()
+    assert business_user.profile.ranking_score == pytest.approx(5)
+
+    out = StringIO()
+    call_command("update_ranking_scores", stdout=out)
+
+    assert "Updated the ranking score of 2 business profiles." in out.getvalue()
+    business_user.profile.refresh_from_db()
+    assert business_user.profile.ranking_score == pytest.approx(4)
+    assert update_ranking_scores([customer_user.id]) == 0
+
+
+@pytest.mark.django_db
+def test_rating_ordering_is_served_by_the_ranking_index():
+    if connection.vendor != "sqlite":
+        pytest.skip("EXPLAIN QUERY PLAN output is SQLite specific.")
+
+    profiles = Profile.objects.filter(role=Profile.ROLE_BUSINESS).order_by(
+        "-ranking_score", "-id"
+    )
+    paginator = BusinessProfileCursorPagination()
+    paginator.model = Profile
+    paginator.keys = paginator.get_keys(profiles)
+    after_cursor = paginator.get_position_filter([2.5, 10], reverse=False)
+
+    for queryset in (profiles, profiles.filter(after_cursor)):
+        plan = queryset.explain()
+        assert "USING INDEX profile_role_ranking_idx" in plan
+        # Also covers the id tie-breaker, so no part of the ORDER BY is sorted.
+        assert "TEMP B-TREE" not in plan
+    # Cursor pages seek to the position instead of reading the index from its start.
+    assert "(role=? AND ranking_score<?)" in plan